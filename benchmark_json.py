@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Compara as bibliotecas JSON disponíveis para o codec.py, por currículo
+
+Uso:
+    python benchmark_json.py                     # Usa exemplo_json.txt
+    python benchmark_json.py outro_curriculo.json
+    python benchmark_json.py --repeticoes 500
+
+Mede, para cada biblioteca instalada (orjson, msgspec, json), o tempo por
+currículo de:
+    - decodificar data_completa (o que a normalização faz por docente)
+    - codificar data_completa (o que a coleta grava por docente)
+    - codificar a coluna detalhes de cada produção (normalização)
+
+Compara também os modos da coluna detalhes (DETALHES_PRODUCAO): tempo e
+tamanho gravado por currículo.
+
+Com msgspec instalado, compara também a decodificação seletiva
+(esquema_lattes.py) com a decodificação completa: tempo e memória alocada.
+"""
+
+import sys
+import time
+import tracemalloc
+from typing import Callable, List
+
+from codec import BIBLIOTECA, IMPLEMENTACOES, loads
+from esquema_lattes import DECODIFICADOR
+from normalizer_definitivo import MODOS_DETALHES, registros_de_producao
+
+REPETICOES = 200
+ARQUIVO_PADRAO = 'exemplo_json.txt'
+
+
+def medir(funcao: Callable[[], object], repeticoes: int) -> float:
+    """Melhor tempo médio (ms) de 3 rodadas de `repeticoes` chamadas"""
+    melhor = float('inf')
+    for _ in range(3):
+        inicio = time.perf_counter()
+        for _ in range(repeticoes):
+            funcao()
+        melhor = min(melhor, (time.perf_counter() - inicio) / repeticoes)
+    return melhor * 1000
+
+
+def memoria_alocada(funcao: Callable[[], object]) -> float:
+    """Pico de memória (KB) alocada por uma chamada, com o resultado ainda vivo"""
+    tracemalloc.start()
+    resultado = funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del resultado
+    return pico / 1024
+
+
+def comparar_decodificacao_seletiva(texto: str, repeticoes: int):
+    """Decodificação completa (codec) x só as partes do esquema_lattes.py"""
+    print("\n🎯 Decodificação seletiva (esquema_lattes.py):")
+    if DECODIFICADOR is None:
+        print("   msgspec não está instalado (pip install msgspec)")
+        return
+    
+    completo = medir(lambda: loads(texto), repeticoes)
+    seletivo = medir(lambda: DECODIFICADOR.decode(texto), repeticoes)
+    memoria_completo = memoria_alocada(lambda: loads(texto))
+    memoria_seletivo = memoria_alocada(lambda: DECODIFICADOR.decode(texto))
+    
+    print(f"   completa ({BIBLIOTECA}): {completo:.3f}ms, {memoria_completo:,.0f} KB")
+    print(f"   seletiva (msgspec): {seletivo:.3f}ms, {memoria_seletivo:,.0f} KB "
+          f"({completo / seletivo:.1f}x mais rápida, {memoria_completo / memoria_seletivo:.1f}x menos memória)")
+
+
+def comparar_modos_detalhes(producoes: List[dict], repeticoes: int):
+    """Tempo e tamanho da coluna detalhes do currículo em cada DETALHES_PRODUCAO"""
+    print("\n🗃️  Coluna detalhes (DETALHES_PRODUCAO):")
+    resultados = {}
+    for modo, acessor in MODOS_DETALHES.items():
+        tempo = medir(lambda: [acessor(registro, []) for registro in producoes], repeticoes)
+        tamanho = sum(len(acessor(registro, []).encode('utf-8')) for registro in producoes)
+        resultados[modo] = (tempo, tamanho)
+    
+    tempo_completo, tamanho_completo = resultados['completo']
+    for modo, (tempo, tamanho) in resultados.items():
+        linha = f"   {modo:<12} {tempo:8.3f}ms {tamanho / 1024:8.1f} KB"
+        if modo != 'completo':
+            # Comparado ao padrão (completo)
+            razao = tempo_completo / tempo
+            velocidade = f"{razao:.1f}x mais rápido" if razao >= 1 else f"{1 / razao:.1f}x mais lento"
+            linha += f"  ({velocidade}, {tamanho_completo / tamanho:.1f}x menor que completo)"
+        print(linha)
+
+
+def main():
+    """Função principal"""
+    argumentos = sys.argv[1:]
+    repeticoes = REPETICOES
+    
+    if '--repeticoes' in argumentos:
+        indice = argumentos.index('--repeticoes')
+        repeticoes = int(argumentos[indice + 1])
+        del argumentos[indice:indice + 2]
+    
+    arquivo = argumentos[0] if argumentos else ARQUIVO_PADRAO
+    
+    with open(arquivo, 'rb') as f:
+        corpo = f.read()
+    
+    loads_padrao, _ = IMPLEMENTACOES['json']
+    data = loads_padrao(corpo)
+    texto = corpo.decode('utf-8')
+    producoes = [registro for _, registro in registros_de_producao(data)]
+    
+    print("\n" + "="*70)
+    print("⏱️  BENCHMARK JSON POR CURRÍCULO")
+    print("="*70 + "\n")
+    print(f"📄 {arquivo}: {len(corpo) / 1024:.0f} KB, {len(producoes)} produções")
+    print(f"🔁 {repeticoes} repetições (melhor de 3)")
+    print(f"⚙️  Em uso pelo projeto: {BIBLIOTECA}\n")
+    
+    resultados = {}
+    for nome, (loads, dumps_bytes) in IMPLEMENTACOES.items():
+        resultados[nome] = {
+            'decodificar': medir(lambda: loads(texto), repeticoes),
+            'codificar': medir(lambda: dumps_bytes(data), repeticoes),
+            'detalhes': medir(lambda: [dumps_bytes(registro) for registro in producoes], repeticoes),
+        }
+    
+    base = resultados['json']
+    print(f"{'Biblioteca':<12} {'decodificar':>14} {'codificar':>14} {'detalhes':>14} {'total':>14}")
+    for nome, tempos in resultados.items():
+        total = sum(tempos.values())
+        colunas = [f"{tempos[etapa]:.3f}ms" for etapa in ('decodificar', 'codificar', 'detalhes')]
+        print(f"{nome:<12} {colunas[0]:>14} {colunas[1]:>14} {colunas[2]:>14} {total:>12.3f}ms"
+              f"  ({sum(base.values()) / total:.1f}x)")
+    
+    if len(IMPLEMENTACOES) == 1:
+        print("\n💡 Só o json padrão está instalado: pip install orjson (ou msgspec) para comparar")
+    
+    comparar_modos_detalhes(producoes, repeticoes)
+    comparar_decodificacao_seletiva(texto, repeticoes)
+    print("")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ Busca ONDE estão os projetos no JSON
 import json
 import sqlite3
 from config import DB_NAME
+from database import decodificar_data_completa
 
 print("\n" + "="*80)
 print("🔍 BUSCANDO PROJETOS NO JSON")
@@ -21,7 +22,7 @@ if result:
     doc_id, nome, data_json = result
     print(f"📄 Analisando: {nome}\n")
     
-    data = json.loads(data_json)
+    data = decodificar_data_completa(data_json)
     
     def buscar_projetos(obj, caminho="", nivel=0):
         """Busca recursiva por projetos"""
@@ -67,7 +68,7 @@ if result:
         if result2:
             doc_id2, nome2, data_json2 = result2
             print(f"📄 Tentando com: {nome2}\n")
-            data2 = json.loads(data_json2)
+            data2 = decodificar_data_completa(data_json2)
             buscar_projetos(data2)
 
 conn.close()
@@ -0,0 +1,319 @@
+"""
+Cache em disco das respostas de detalhes do Portal Integra
+
+Guarda o corpo bruto de cada /api/portfolio/pessoa/s/{slug} (compactado com zlib)
+junto com ETag, Last-Modified e o carimbo de atualização visto na listagem.
+Com isso o scraper pode pular o download quando a listagem mostra que o
+currículo não mudou, ou fazer uma requisição condicional (304) nos demais casos.
+
+O cache não bloqueia o laço de eventos da coleta. As leituras
+(obter_metadados/obter_corpo) rodam em uma thread de leitura, e o corpo só é
+lido e descompactado quando vai ser usado. put/atualizar_carimbo só acumulam as
+entradas, e cada lote de LOTE_CACHE_HTTP é compactado e gravado (um commit por
+lote) por uma thread de gravação. Cada thread tem sua própria conexão. Entradas sem uso há mais
+de DIAS_CACHE_HTTP dias são removidas ao fim de cada coleta (podar).
+
+Uso (limpeza manual):
+    python cache_http.py        # Remove entradas sem uso há DIAS_CACHE_HTTP dias e compacta o arquivo
+    python cache_http.py 30     # Idem, com outro limite de dias
+"""
+
+import asyncio
+import os
+import sqlite3
+import sys
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from config import ARQUIVO_CACHE_HTTP, DIAS_CACHE_HTTP, LOTE_CACHE_HTTP
+
+
+class CacheHttp:
+    """Cache SQLite de respostas HTTP, indexado por (sigla, slug)"""
+    
+    def __init__(self, db_name: str = ARQUIVO_CACHE_HTTP, tamanho_lote: int = LOTE_CACHE_HTTP):
+        """Inicializa o cache (a conexão é aberta em connect)"""
+        self.db_name = db_name
+        self.tamanho_lote = tamanho_lote
+        self.conn = None
+        self.cursor = None
+        
+        # Ainda não gravados: {(sigla, slug): (corpo, etag, last_modified, carimbo)} e {(sigla, slug): carimbo}
+        self.respostas_pendentes = {}
+        self.carimbos_pendentes = {}
+        
+        # Lotes enviados à thread de gravação e ainda não confirmados (continuam visíveis às leituras)
+        self.lotes_em_gravacao = []
+        
+        # Thread única (grava os lotes em ordem) com a conexão de escrita
+        self.gravador = None
+        self.conn_escrita = None
+        
+        # Thread de leitura, com a sua conexão (as consultas não rodam no laço de eventos)
+        self.leitor = None
+        self.conn_leitura = None
+    
+    def connect(self):
+        """Abre o arquivo de cache, criando a tabela se necessário"""
+        self.conn = sqlite3.connect(self.db_name)
+        self.conn.row_factory = sqlite3.Row
+        self.cursor = self.conn.cursor()
+        
+        # É só um cache: WAL + synchronous=NORMAL deixa cada gravação barata
+        self.cursor.execute("PRAGMA journal_mode=WAL")
+        self.cursor.execute("PRAGMA synchronous=NORMAL")
+        
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS respostas (
+                sigla TEXT NOT NULL,
+                slug TEXT NOT NULL,
+                corpo BLOB NOT NULL,  -- corpo da resposta compactado (zlib)
+                etag TEXT,
+                last_modified TEXT,
+                carimbo TEXT,  -- updatedOn/dataAtualizacao visto na listagem
+                atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (sigla, slug)
+            )
+        """)
+        self.conn.commit()
+        
+        self.conn_escrita = sqlite3.connect(self.db_name, check_same_thread=False)
+        self.conn_escrita.execute("PRAGMA synchronous=NORMAL")
+        self.conn_escrita.execute("PRAGMA busy_timeout=10000")
+        self.gravador = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cache_http')
+        
+        self.conn_leitura = sqlite3.connect(self.db_name, check_same_thread=False)
+        self.conn_leitura.row_factory = sqlite3.Row
+        self.leitor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cache_http_leitura')
+    
+    def close(self):
+        """Grava o que estiver pendente e fecha o cache"""
+        if self.leitor:
+            self.leitor.shutdown(wait=True)
+            self.leitor = None
+        if self.conn_leitura:
+            self.conn_leitura.close()
+            self.conn_leitura = None
+        if self.gravador:
+            self.gravar_pendentes()
+            self.gravador.shutdown(wait=True)
+            self.gravador = None
+        if self.conn_escrita:
+            self.conn_escrita.close()
+            self.conn_escrita = None
+        if self.conn:
+            self.conn.close()
+    
+    def resposta_nao_gravada(self, sigla: str, slug: str) -> Optional[tuple]:
+        """(corpo, etag, last_modified, carimbo) ainda pendente ou em gravação, ou None"""
+        chave = (sigla, slug)
+        if chave in self.respostas_pendentes:
+            return self.respostas_pendentes[chave]
+        for lote in reversed(self.lotes_em_gravacao):
+            if chave in lote:
+                return lote[chave]
+        return None
+    
+    def ler_metadados(self, sigla: str, slug: str) -> Optional[Dict]:
+        """SELECT de etag, last_modified e carimbo, sem o corpo (roda na thread de leitura)"""
+        row = self.conn_leitura.execute("""
+            SELECT etag, last_modified, carimbo
+            FROM respostas
+            WHERE sigla = ? AND slug = ?
+        """, (sigla, slug)).fetchone()
+        return dict(row) if row else None
+    
+    def ler_corpo(self, sigla: str, slug: str) -> Optional[bytes]:
+        """SELECT e descompactação do corpo (roda na thread de leitura)"""
+        row = self.conn_leitura.execute(
+            "SELECT corpo FROM respostas WHERE sigla = ? AND slug = ?", (sigla, slug)
+        ).fetchone()
+        return zlib.decompress(row['corpo']) if row else None
+    
+    async def obter_metadados(self, sigla: str, slug: str) -> Optional[Dict]:
+        """
+        Busca etag, last_modified e carimbo de uma resposta, sem ler o corpo
+        
+        Args:
+            sigla: Sigla da instituição
+            slug: Identificador da pessoa
+        
+        Returns:
+            Dict com etag, last_modified e carimbo, ou None se não estiver no cache
+        """
+        pendente = self.resposta_nao_gravada(sigla, slug)
+        if pendente:
+            _, etag, last_modified, carimbo = pendente
+            return {'etag': etag, 'last_modified': last_modified, 'carimbo': carimbo}
+        
+        loop = asyncio.get_running_loop()
+        metadados = await loop.run_in_executor(self.leitor, self.ler_metadados, sigla, slug)
+        if metadados and (sigla, slug) in self.carimbos_pendentes:
+            metadados['carimbo'] = self.carimbos_pendentes[(sigla, slug)]
+        return metadados
+    
+    async def obter_corpo(self, sigla: str, slug: str) -> Optional[bytes]:
+        """Corpo descompactado de uma resposta (None se não estiver no cache)"""
+        pendente = self.resposta_nao_gravada(sigla, slug)
+        if pendente:
+            return pendente[0]
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.leitor, self.ler_corpo, sigla, slug)
+    
+    def get(self, sigla: str, slug: str) -> Optional[Dict]:
+        """
+        Busca uma resposta no cache, de forma síncrona (fora do laço de eventos)
+        
+        Args:
+            sigla: Sigla da instituição
+            slug: Identificador da pessoa
+        
+        Returns:
+            Dict com corpo (bytes descompactados), etag, last_modified e carimbo, ou None
+        """
+        pendente = self.resposta_nao_gravada(sigla, slug)
+        if pendente:
+            corpo, etag, last_modified, carimbo = pendente
+            return {'corpo': corpo, 'etag': etag, 'last_modified': last_modified, 'carimbo': carimbo}
+        
+        metadados = self.leitor.submit(self.ler_metadados, sigla, slug).result()
+        if not metadados:
+            return None
+        
+        metadados['carimbo'] = self.carimbos_pendentes.get((sigla, slug), metadados['carimbo'])
+        metadados['corpo'] = self.leitor.submit(self.ler_corpo, sigla, slug).result()
+        return metadados
+    
+    def put(self, sigla: str, slug: str, corpo: bytes, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, carimbo: Optional[str] = None):
+        """
+        Grava (ou substitui) uma resposta no cache, no próximo lote
+        
+        Args:
+            sigla: Sigla da instituição
+            slug: Identificador da pessoa
+            corpo: Corpo bruto da resposta
+            etag: Cabeçalho ETag da resposta
+            last_modified: Cabeçalho Last-Modified da resposta
+            carimbo: Carimbo de atualização da listagem
+        """
+        chave = (sigla, slug)
+        self.carimbos_pendentes.pop(chave, None)
+        self.respostas_pendentes[chave] = (corpo, etag, last_modified, carimbo)
+        self.gravar_se_lote_cheio()
+    
+    def atualizar_carimbo(self, sigla: str, slug: str, carimbo: Optional[str]):
+        """
+        Marca uma entrada como válida (304 ou carimbo igual) sem regravar o corpo
+        
+        Atualiza o carimbo e atualizado_em, que conta como uso para podar.
+        """
+        chave = (sigla, slug)
+        if chave in self.respostas_pendentes:
+            corpo, etag, last_modified, _ = self.respostas_pendentes[chave]
+            self.respostas_pendentes[chave] = (corpo, etag, last_modified, carimbo)
+        else:
+            self.carimbos_pendentes[chave] = carimbo
+        self.gravar_se_lote_cheio()
+    
+    def gravar_se_lote_cheio(self):
+        """Envia as pendências para a thread de gravação quando formam um lote"""
+        if len(self.respostas_pendentes) + len(self.carimbos_pendentes) >= self.tamanho_lote:
+            self.gravar_pendentes()
+    
+    def gravar_pendentes(self) -> Optional[Future]:
+        """Envia as pendências para a thread de gravação (sem esperar)"""
+        if not self.respostas_pendentes and not self.carimbos_pendentes:
+            return None
+        
+        respostas, self.respostas_pendentes = self.respostas_pendentes, {}
+        carimbos, self.carimbos_pendentes = self.carimbos_pendentes, {}
+        
+        self.lotes_em_gravacao.append(respostas)
+        futuro = self.gravador.submit(self.gravar_lote, respostas, carimbos)
+        futuro.add_done_callback(avisar_erro_gravacao)
+        return futuro
+    
+    def gravar_lote(self, respostas: Dict[Tuple[str, str], tuple], carimbos: Dict[Tuple[str, str], Optional[str]]):
+        """Compacta e grava um lote em uma transação (roda na thread de gravação)"""
+        try:
+            self.gravar_respostas(respostas, carimbos)
+        finally:
+            # Confirmado (ou perdido): as leituras passam a ir ao arquivo
+            self.lotes_em_gravacao = [lote for lote in self.lotes_em_gravacao if lote is not respostas]
+    
+    def gravar_respostas(self, respostas: Dict[Tuple[str, str], tuple], carimbos: Dict[Tuple[str, str], Optional[str]]):
+        """executemany das respostas e dos carimbos + commit"""
+        self.conn_escrita.executemany("""
+            INSERT OR REPLACE INTO respostas (sigla, slug, corpo, etag, last_modified, carimbo, atualizado_em)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, [
+            (sigla, slug, zlib.compress(corpo), etag, last_modified, carimbo)
+            for (sigla, slug), (corpo, etag, last_modified, carimbo) in respostas.items()
+        ])
+        self.conn_escrita.executemany("""
+            UPDATE respostas
+            SET carimbo = ?, atualizado_em = CURRENT_TIMESTAMP
+            WHERE sigla = ? AND slug = ?
+        """, [(carimbo, sigla, slug) for (sigla, slug), carimbo in carimbos.items()])
+        self.conn_escrita.commit()
+    
+    def podar(self, dias: int = DIAS_CACHE_HTTP) -> int:
+        """
+        Remove as entradas sem uso (gravação ou revalidação) há mais de `dias` dias
+        
+        Espera as gravações pendentes. O espaço liberado é reaproveitado pelas
+        próximas gravações; para diminuir o arquivo, rode VACUUM (python cache_http.py).
+        
+        Returns:
+            Número de entradas removidas
+        """
+        self.gravar_pendentes()
+        return self.gravador.submit(self.remover_antigas, dias).result()
+    
+    def remover_antigas(self, dias: int) -> int:
+        """DELETE das entradas antigas (roda na thread de gravação)"""
+        cursor = self.conn_escrita.execute(
+            "DELETE FROM respostas WHERE atualizado_em < datetime('now', ?)", (f'-{int(dias)} days',)
+        )
+        self.conn_escrita.commit()
+        return cursor.rowcount
+
+
+def avisar_erro_gravacao(futuro: Future):
+    """Callback dos lotes: uma falha no cache não interrompe a coleta, só é avisada"""
+    erro = futuro.exception()
+    if erro is not None:
+        print(f"⚠️  Erro ao gravar no cache HTTP: {erro}")
+
+
+def main():
+    """Poda o cache e compacta o arquivo"""
+    dias = int(sys.argv[1]) if len(sys.argv) > 1 else DIAS_CACHE_HTTP
+    if dias is None:
+        print("❌ DIAS_CACHE_HTTP = None: informe os dias (python cache_http.py 90)")
+        return
+    if not os.path.exists(ARQUIVO_CACHE_HTTP):
+        print(f"❌ {ARQUIVO_CACHE_HTTP} não existe")
+        return
+    
+    tamanho_antes = os.path.getsize(ARQUIVO_CACHE_HTTP)
+    
+    cache = CacheHttp()
+    cache.connect()
+    removidas = cache.podar(dias)
+    cache.cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    cache.close()
+    
+    conn = sqlite3.connect(ARQUIVO_CACHE_HTTP)
+    conn.execute("VACUUM")
+    conn.close()
+    
+    tamanho_depois = os.path.getsize(ARQUIVO_CACHE_HTTP)
+    print(f"🧹 {removidas:,} entradas sem uso há mais de {dias} dias removidas")
+    print(f"💾 {tamanho_antes / 1024 / 1024:.1f} MB -> {tamanho_depois / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Codificação e decodificação JSON usadas por scraper, banco e normalizador
+
+Usa orjson ou msgspec quando instalados (opcionais: `pip install orjson`) e o
+json da biblioteca padrão caso contrário. A escolha vem de BIBLIOTECA_JSON
+(config.py); com None, vale a primeira instalada de BIBLIOTECAS.
+
+Todas as bibliotecas geram o mesmo formato: JSON compacto (sem espaços), com
+acentos como texto (equivalente a ensure_ascii=False).
+"""
+
+import json
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from config import BIBLIOTECA_JSON
+
+try:
+    import orjson
+except ImportError:  # Opcional
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # Opcional
+    msgspec = None
+
+BIBLIOTECAS = ('orjson', 'msgspec', 'json')  # Em ordem de preferência
+
+SEPARADORES = (',', ':')
+
+
+def loads_padrao(dados: Union[str, bytes]) -> Any:
+    """json.loads da biblioteca padrão"""
+    return json.loads(dados)
+
+
+def dumps_bytes_padrao(obj: Any) -> bytes:
+    """json.dumps da biblioteca padrão, em UTF-8"""
+    return json.dumps(obj, ensure_ascii=False, separators=SEPARADORES).encode('utf-8')
+
+
+def montar_implementacoes() -> Dict[str, Tuple[Callable[[Union[str, bytes]], Any], Callable[[Any], bytes]]]:
+    """Retorna {biblioteca: (loads, dumps_bytes)} das bibliotecas instaladas"""
+    implementacoes = {}
+    
+    if orjson is not None:
+        implementacoes['orjson'] = (orjson.loads, orjson.dumps)
+    
+    if msgspec is not None:
+        # Encoder/Decoder reutilizáveis evitam recriar o estado a cada chamada
+        implementacoes['msgspec'] = (msgspec.json.Decoder().decode, msgspec.json.Encoder().encode)
+    
+    implementacoes['json'] = (loads_padrao, dumps_bytes_padrao)
+    return implementacoes
+
+
+IMPLEMENTACOES = montar_implementacoes()
+
+
+def escolher_biblioteca(preferida: Optional[str] = BIBLIOTECA_JSON) -> str:
+    """
+    Escolhe a biblioteca JSON
+    
+    Args:
+        preferida: Nome em BIBLIOTECAS, ou None para a mais rápida instalada
+    
+    Returns:
+        Nome da biblioteca usada
+    """
+    if preferida is None:
+        return next(nome for nome in BIBLIOTECAS if nome in IMPLEMENTACOES)
+    
+    if preferida not in BIBLIOTECAS:
+        raise ValueError(f"Biblioteca JSON desconhecida: {preferida} (use {', '.join(BIBLIOTECAS)})")
+    
+    if preferida not in IMPLEMENTACOES:
+        raise RuntimeError(f"BIBLIOTECA_JSON = {preferida!r}, mas ela não está instalada (pip install {preferida})")
+    
+    return preferida
+
+
+BIBLIOTECA = escolher_biblioteca()
+loads_nativo, dumps_nativo = IMPLEMENTACOES[BIBLIOTECA]
+
+# Exceções de um JSON inválido (o DecodeError do msgspec não herda de ValueError)
+ERROS_DECODIFICACAO = (ValueError, TypeError) + ((msgspec.DecodeError,) if msgspec is not None else ())
+
+
+def loads(dados: Union[str, bytes]) -> Any:
+    """
+    Decodifica JSON (texto ou bytes UTF-8)
+    
+    Compatível com o parâmetro loads de aiohttp: response.json(loads=loads)
+    """
+    return loads_nativo(dados)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Codifica em JSON compacto, em UTF-8 (ex.: para compactar em seguida)"""
+    try:
+        return dumps_nativo(obj)
+    except (TypeError, OverflowError):
+        # orjson/msgspec recusam inteiros acima de 64 bits e chaves não-texto que o json aceita
+        return dumps_bytes_padrao(obj)
+
+
+def dumps(obj: Any) -> str:
+    """Codifica em JSON compacto, como texto (ex.: para colunas TEXT)"""
+    return dumps_bytes(obj).decode('utf-8')
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Converte docentes.data_completa entre texto JSON e BLOB compactado (zlib/zstd)
+
+Uso:
+    python compactar_banco.py                        # Converte para COMPRESSAO_DATA_COMPLETA (ou zlib)
+    python compactar_banco.py zstd                   # Converte para zstd
+    python compactar_banco.py texto                  # Volta para texto JSON
+    python compactar_banco.py --treinar-dicionario   # Treina o dicionário zstd com amostras do banco
+
+A conversão é feita no próprio banco, em lotes (um commit por lote), e pode ser
+interrompida e executada de novo: linhas que já estão no formato pedido são puladas.
+No fim, o VACUUM devolve ao disco o espaço liberado.
+"""
+
+import os
+import sys
+import time
+from typing import Optional
+
+from config import ARQUIVO_DICIONARIO_ZSTD, COMPRESSAO_DATA_COMPLETA, DB_NAME
+from database import (
+    MAGICO_ZSTD,
+    Database,
+    compactar_texto,
+    texto_data_completa,
+    zstandard,
+)
+
+LOTE_CONVERSAO = 500  # Linhas convertidas por transação
+AMOSTRAS_DICIONARIO = 2000  # Currículos usados no treino do dicionário
+TAMANHO_DICIONARIO = 112640  # Tamanho do dicionário zstd (110 KiB)
+
+FORMATOS = {'texto': None, 'zlib': 'zlib', 'zstd': 'zstd'}
+
+
+def formato_do_valor(valor) -> Optional[str]:
+    """Identifica o formato de um valor de data_completa (None = texto)"""
+    if isinstance(valor, str):
+        return None
+    if valor.startswith(MAGICO_ZSTD):
+        return 'zstd'
+    return 'zlib'
+
+
+def tamanho_banco() -> int:
+    """Tamanho em bytes do banco (incluindo o arquivo WAL)"""
+    total = 0
+    for arquivo in (DB_NAME, DB_NAME + '-wal'):
+        if os.path.exists(arquivo):
+            total += os.path.getsize(arquivo)
+    return total
+
+
+def treinar_dicionario(db: Database):
+    """
+    Treina um dicionário zstd com uma amostra dos currículos do banco
+    
+    Os currículos do Lattes repetem as mesmas chaves JSON; com um dicionário
+    compartilhado, cada linha compactada não precisa carregá-las de novo.
+    """
+    if zstandard is None:
+        print("❌ O dicionário é do formato zstd: instale com 'pip install zstandard'")
+        sys.exit(1)
+    
+    # Trocar o dicionário tornaria ilegíveis as linhas já compactadas com o anterior
+    db.cursor.execute("SELECT COUNT(*) FROM docentes WHERE substr(data_completa, 1, 4) = ?", (MAGICO_ZSTD,))
+    if os.path.exists(ARQUIVO_DICIONARIO_ZSTD) and db.cursor.fetchone()[0] > 0:
+        print(f"❌ Já existem linhas em zstd usando {ARQUIVO_DICIONARIO_ZSTD}.")
+        print("   Converta para texto ou zlib antes de treinar um novo dicionário.")
+        sys.exit(1)
+    
+    db.cursor.execute("SELECT data_completa FROM docentes ORDER BY RANDOM() LIMIT ?", (AMOSTRAS_DICIONARIO,))
+    amostras = [texto_data_completa(row[0]).encode('utf-8') for row in db.cursor.fetchall()]
+    
+    if len(amostras) < 10:
+        print("❌ Poucos docentes no banco para treinar um dicionário")
+        sys.exit(1)
+    
+    print(f"🧠 Treinando dicionário com {len(amostras)} currículos...")
+    dicionario = zstandard.train_dictionary(TAMANHO_DICIONARIO, amostras)
+    
+    with open(ARQUIVO_DICIONARIO_ZSTD, 'wb') as f:
+        f.write(dicionario.as_bytes())
+    
+    print(f"✅ Dicionário salvo em {ARQUIVO_DICIONARIO_ZSTD} ({len(dicionario.as_bytes()):,} bytes)")
+    print("⚠️  Guarde este arquivo junto com o banco: sem ele as linhas em zstd não podem ser lidas")
+
+
+def converter(db: Database, formato: Optional[str]):
+    """
+    Regrava data_completa de todos os docentes no formato pedido
+    
+    Args:
+        db: Banco aberto para escrita
+        formato: None (texto), "zlib" ou "zstd"
+    """
+    db.cursor.execute("SELECT COUNT(*) FROM docentes")
+    total = db.cursor.fetchone()[0]
+    
+    print(f"🔄 Convertendo {total:,} docentes para {formato or 'texto'}...")
+    
+    ultimo_id = 0
+    processados = 0
+    convertidos = 0
+    
+    while True:
+        # Paginação pelo id: cada lote é uma consulta curta e indexada
+        db.cursor.execute("""
+            SELECT id, data_completa FROM docentes
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (ultimo_id, LOTE_CONVERSAO))
+        linhas = db.cursor.fetchall()
+        
+        if not linhas:
+            break
+        
+        atualizacoes = []
+        for docente_id, valor in linhas:
+            if formato_do_valor(valor) != formato:
+                atualizacoes.append((compactar_texto(texto_data_completa(valor), formato), docente_id))
+        
+        db.cursor.executemany("UPDATE docentes SET data_completa = ? WHERE id = ?", atualizacoes)
+        db.conn.commit()
+        
+        ultimo_id = linhas[-1][0]
+        processados += len(linhas)
+        convertidos += len(atualizacoes)
+        print(f"   ⏳ {processados:,}/{total:,} ({convertidos:,} convertidos)")
+    
+    print(f"✅ {convertidos:,} docentes convertidos ({processados - convertidos:,} já estavam em {formato or 'texto'})")
+
+
+def main():
+    """Função principal"""
+    print("\n" + "="*70)
+    print("🗜️  COMPACTAÇÃO DE docentes.data_completa")
+    print("="*70 + "\n")
+    
+    argumentos = sys.argv[1:]
+    
+    db = Database()
+    db.connect()
+    
+    try:
+        if argumentos == ['--treinar-dicionario']:
+            treinar_dicionario(db)
+            return
+        
+        if argumentos and argumentos[0] not in FORMATOS:
+            print(f"❌ Formato inválido: {argumentos[0]} (use {', '.join(FORMATOS)} ou --treinar-dicionario)")
+            sys.exit(1)
+        
+        formato = FORMATOS[argumentos[0]] if argumentos else (COMPRESSAO_DATA_COMPLETA or 'zlib')
+        
+        if formato == 'zstd' and zstandard is None:
+            print("❌ Formato zstd requer a biblioteca zstandard (pip install zstandard)")
+            sys.exit(1)
+        
+        antes = tamanho_banco()
+        inicio = time.time()
+        
+        converter(db, formato)
+        
+        print("🧹 Executando VACUUM para liberar o espaço...")
+        db.cursor.execute("VACUUM")
+        db.cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        
+        depois = tamanho_banco()
+        print(f"\n📦 Tamanho do banco: {antes / (1024*1024):.1f} MB -> {depois / (1024*1024):.1f} MB "
+              f"em {time.time() - inicio:.0f}s")
+        
+        if formato != COMPRESSAO_DATA_COMPLETA:
+            print(f"💡 Ajuste COMPRESSAO_DATA_COMPLETA = {formato!r} em config.py para que as "
+                  f"próximas coletas gravem no mesmo formato")
+    finally:
+        db.close()
+    
+    print("")
+
+
+if __name__ == "__main__":
+    main()
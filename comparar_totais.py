@@ -7,7 +7,8 @@ Ajuda a identificar se a coleta está completa
 import asyncio
 from config import INSTITUICOES
 from database import Database
-from diagnostico import diagnosticar_instituicao
+from diagnostico import TIMEOUT_DIAGNOSTICO, diagnosticar_instituicao
+from scraper import criar_sessao
 
 
 async def main():
@@ -17,7 +18,7 @@ async def main():
     print("="*80 + "\n")
     
     # Conecta ao banco
-    db = Database()
+    db = Database(somente_leitura=True)
     db.connect()
     
     # Busca instituições no banco
@@ -31,14 +32,15 @@ async def main():
     print(f"📋 Instituições no banco: {len(siglas_no_banco)}")
     print("⏳ Consultando APIs para comparação...\n")
     
-    # Diagnostica todas as instituições que estão no banco
-    tasks = []
-    for sigla in siglas_no_banco:
-        if sigla in INSTITUICOES:
-            info = INSTITUICOES[sigla]
-            tasks.append(diagnosticar_instituicao(sigla, info['url']))
-    
-    resultados_api = await asyncio.gather(*tasks)
+    # Diagnostica todas as instituições que estão no banco (sessão compartilhada)
+    async with criar_sessao(TIMEOUT_DIAGNOSTICO) as session:
+        tasks = []
+        for sigla in siglas_no_banco:
+            if sigla in INSTITUICOES:
+                info = INSTITUICOES[sigla]
+                tasks.append(diagnosticar_instituicao(sigla, info['url'], session))
+        
+        resultados_api = await asyncio.gather(*tasks)
     
     # Prepara comparação
     print("="*80)
@@ -3,13 +3,30 @@ Configurações do sistema de scraping do Portal Integra
 """
 
 # Configurações de coleta
-PAGE_SIZE = 50  # Tamanho da página na API
-MAX_CONCURRENT_INSTITUTIONS = 5  # Máximo de instituições simultâneas
+PAGE_SIZE = 50  # Tamanho da página na API (padrão, aceito por todos os portais)
+PAGE_SIZE_CANDIDATOS = [100, 200, 500, 1000]  # Tamanhos maiores testados em cada portal
+ARQUIVO_PAGE_SIZES = "page_sizes.json"  # Cache do maior tamanho aceito por instituição
+MAX_CONCURRENT_REQUESTS = 200  # Orçamento global de requisições simultâneas (todas as instituições)
+MAX_REQUESTS_PER_HOST = 50  # Máximo de requisições simultâneas para um mesmo host
 MAX_CONCURRENT_DETAILS = 50  # Máximo de requisições de detalhes simultâneas por instituição
+MAX_CONCURRENT_PAGES = 10  # Máximo de páginas da listagem de pessoas buscadas em paralelo por instituição
 TIMEOUT = 60  # Timeout em segundos
+DNS_CACHE_TTL = 600  # Tempo (s) que o IP de cada host fica em cache no pool de conexões
+KEEPALIVE_TIMEOUT = 60  # Tempo (s) que uma conexão ociosa fica aberta para reuso
 MAX_RETRIES = 3  # Número máximo de tentativas em caso de falha
 RETRY_DELAY = 2  # Delay entre tentativas (segundos)
 
+# Configurações do pipeline coleta -> banco
+TAMANHO_FILA_RESULTADOS = 200  # Máximo de detalhes aguardando gravação (limita o uso de memória)
+TAMANHO_LOTE_BANCO = 100  # Docentes gravados por transação
+LOTE_LEITURA_DOCENTES = 500  # Docentes lidos por consulta nas passadas pelo banco inteiro
+
+# Cache HTTP das respostas de detalhes (evita baixar de novo currículos que não mudaram)
+USAR_CACHE_HTTP = True
+ARQUIVO_CACHE_HTTP = "cache_http.db"
+LOTE_CACHE_HTTP = 50  # Respostas gravadas no cache por transação (em uma thread própria)
+DIAS_CACHE_HTTP = 90  # Entradas sem uso há mais dias são removidas ao fim da coleta (None = nunca)
+
 # Headers HTTP para simular navegador
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
@@ -84,3 +101,50 @@ TERMOS_DOCENTE = [
 
 # Nome do banco de dados
 DB_NAME = "integra.db"
+
+# Perfil de conexão do SQLite (aplicado em Database.connect)
+# WAL: a coleta (única conexão de escrita) não bloqueia os scripts de relatório e vice-versa
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # Com WAL, só perde a última transação numa queda de energia
+    "cache_size": -65536,  # Cache de páginas em KiB (negativo) = 64 MB
+    "mmap_size": 268435456,  # Leitura mapeada em memória (256 MB)
+    "temp_store": "MEMORY",
+    "busy_timeout": 10000,  # Espera (ms) por um lock de escrita antes de falhar
+}
+
+# Armazenamento de docentes.data_completa (opcional: None grava o JSON como texto)
+# "zlib" usa só a biblioteca padrão; "zstd" exige `pip install zstandard`
+# Para converter as linhas já gravadas: python compactar_banco.py
+COMPRESSAO_DATA_COMPLETA = None  # None, "zlib" ou "zstd"
+NIVEL_COMPRESSAO = 6  # zlib: 1-9 / zstd: 1-22
+ARQUIVO_DICIONARIO_ZSTD = "data_completa.zdict"  # Dicionário zstd treinado (usado se existir)
+
+# Biblioteca JSON (codec.py): orjson ou msgspec, se instalados, são bem mais rápidos que o json padrão
+# Para comparar no próprio computador: python benchmark_json.py
+BIBLIOTECA_JSON = None  # None = a mais rápida instalada; ou "orjson", "msgspec", "json"
+
+# Normalização (normalizer_definitivo.py)
+# Os processos decodificam o JSON e fazem a extração; o processo principal é o único que grava no banco
+PROCESSOS_NORMALIZACAO = None  # None = um por núcleo; 1 = tudo no processo principal
+LOTE_NORMALIZACAO = 200  # Docentes por lote enviado aos processos (e por transação)
+DECODIFICACAO_SELETIVA = True  # Com msgspec instalado, decodifica só as partes lidas (esquema_lattes.py)
+EXTRATORES_NORMALIZACAO = []  # Módulos com tabelas extras (ESPECIFICACOES/ESQUEMA), ex.: ['extrator_patentes']
+
+# Coluna producao_bibliografica.detalhes (resolver_detalhes, em normalizer_definitivo.py, lê qualquer modo)
+# "completo": JSON do registro inteiro (padrão)
+# "resumido": JSON só com as chaves de CAMPOS_DETALHES_PRODUCAO, sem valores vazios;
+#             só economiza espaço: filtrar as chaves custa mais CPU que gravar o registro inteiro
+# "referencia": só a referência ao registro dentro de data_completa (ex.: "seq:25"), lido sob demanda;
+#               o único modo que reduz espaço e CPU. A coluna deixa de ser JSON, então quem a lê
+#               direto precisa usar resolver_detalhes
+# Para medir no próprio computador: python benchmark_json.py
+# Ao trocar o modo, renormalize tudo (python normalizer_definitivo.py) para converter as linhas gravadas
+DETALHES_PRODUCAO = "completo"
+CAMPOS_DETALHES_PRODUCAO = [
+    'sequenciaProducao',
+    'dadosBasicosDoArtigo', 'detalhamentoDoArtigo',
+    'dadosBasicosDoTrabalho', 'detalhamentoDoTrabalho',
+    'dadosBasicosDoLivro', 'detalhamentoDoLivro',
+    'dadosBasicosDoCapitulo', 'detalhamentoDoCapitulo',
+]
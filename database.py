@@ -2,27 +2,333 @@
 Gerenciamento do banco de dados SQLite para o scraping do Portal Integra
 """
 
+import hashlib
+import os
 import sqlite3
 import json
+import zlib
 from datetime import datetime
-from typing import Dict, List, Optional, Any
-from config import DB_NAME
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union, Any
+from config import (
+    ARQUIVO_DICIONARIO_ZSTD,
+    COMPRESSAO_DATA_COMPLETA,
+    DB_NAME,
+    LOTE_LEITURA_DOCENTES,
+    NIVEL_COMPRESSAO,
+    SQLITE_PRAGMAS,
+    TAMANHO_LOTE_BANCO,
+)
+from codec import dumps, dumps_bytes, loads
+
+try:
+    import zstandard
+except ImportError:  # Opcional: só é necessário com COMPRESSAO_DATA_COMPLETA = "zstd"
+    zstandard = None
+
+# Todo frame zstd começa com estes bytes (zlib começa com 0x78)
+MAGICO_ZSTD = b'\x28\xb5\x2f\xfd'
+
+
+# Insere um docente ou, se o slug já existir, atualiza a linha mantendo o id.
+# Se nada mudou (mesmo content_hash e mesmos dados da listagem), a linha não é
+# regravada; atualizado_em e normalizacao_pendente só mudam com o conteúdo.
+SQL_UPSERT_DOCENTE = """
+    INSERT INTO docentes (sigla, slug, nome, campus, cargo, email, url, data_completa,
+                          carimbo_fonte, content_hash)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(slug) DO UPDATE SET
+        sigla = excluded.sigla,
+        nome = excluded.nome,
+        campus = excluded.campus,
+        cargo = excluded.cargo,
+        email = excluded.email,
+        url = excluded.url,
+        data_completa = excluded.data_completa,
+        atualizado_em = CASE WHEN docentes.content_hash IS excluded.content_hash
+                             THEN docentes.atualizado_em ELSE CURRENT_TIMESTAMP END,
+        normalizacao_pendente = CASE WHEN docentes.content_hash IS excluded.content_hash
+                                     THEN docentes.normalizacao_pendente ELSE 1 END,
+        content_hash = excluded.content_hash,
+        carimbo_fonte = excluded.carimbo_fonte,
+        removido_em = NULL
+    WHERE docentes.content_hash IS NOT excluded.content_hash
+       OR docentes.carimbo_fonte IS NOT excluded.carimbo_fonte
+       OR docentes.removido_em IS NOT NULL
+       OR docentes.sigla IS NOT excluded.sigla
+       OR docentes.nome IS NOT excluded.nome
+       OR docentes.campus IS NOT excluded.campus
+       OR docentes.cargo IS NOT excluded.cargo
+       OR docentes.url IS NOT excluded.url
+"""
+
+# Campos que mudam a cada coleta sem o currículo mudar (fora do content_hash)
+CAMPOS_VOLATEIS = ('baseUrl',)
+
+# Tabelas preenchidas pela normalização (uma linha por item, ligadas por id_docente)
+TABELAS_NORMALIZADAS = (
+    'dados_gerais', 'formacoes', 'atuacoes',
+    'producao_bibliografica', 'orientacoes_concluidas',
+    'premios_titulos', 'areas_atuacao', 'projetos',
+)
+
+# Índices das tabelas normalizadas {nome: (tabela, colunas)}, mantidos por
+# criar_indices_normalizados; na renormalização completa são criados só depois da carga
+INDICES_NORMALIZADOS = {
+    'idx_dados_gerais_docente': ('dados_gerais', 'id_docente'),
+    'idx_formacoes_docente': ('formacoes', 'id_docente'),
+    'idx_atuacoes_docente': ('atuacoes', 'id_docente'),
+    'idx_producao_docente': ('producao_bibliografica', 'id_docente'),
+    'idx_producao_tipo_ano': ('producao_bibliografica', 'tipo, ano'),
+    'idx_orientacoes_docente': ('orientacoes_concluidas', 'id_docente'),
+    'idx_premios_docente': ('premios_titulos', 'id_docente'),
+    'idx_areas_docente': ('areas_atuacao', 'id_docente'),
+    'idx_areas_grande_area': ('areas_atuacao', 'grande_area'),
+    'idx_areas_area': ('areas_atuacao', 'area'),
+    'idx_projetos_docente': ('projetos', 'id_docente'),
+    'idx_projetos_natureza': ('projetos', 'natureza'),
+    'idx_projetos_situacao': ('projetos', 'situacao'),
+    'idx_projetos_ano': ('projetos', 'ano_inicio'),
+}
+
+# Migrações do esquema, em ordem: (versão, descrição, passos)
+# Cada passo é (tabela, coluna, tipo) para adicionar uma coluna que falte, ou um comando SQL.
+# Os passos precisam ser idempotentes: bancos antigos podem já ter parte das mudanças
+# (aplicadas pelo antigo atualizar_banco.py). Nunca altere uma migração publicada: crie outra.
+MIGRACOES = [
+    (1, "Colunas de detalhamento da normalização", [
+        ('dados_gerais', 'lattes_url', 'TEXT'),
+        ('dados_gerais', 'palavras_chave', 'TEXT'),
+        ('producao_bibliografica', 'revista_evento_editora', 'TEXT'),
+        ('producao_bibliografica', 'num_coautores', 'INTEGER'),
+        ('producao_bibliografica', 'lista_coautores', 'TEXT'),
+        ('orientacoes_concluidas', 'tipo_orientacao', 'TEXT'),
+    ]),
+    (2, "Coleta incremental e normalização incremental", [
+        ('docentes', 'carimbo_fonte', 'TEXT'),
+        ('docentes', 'removido_em', 'TIMESTAMP'),
+        ('docentes', 'content_hash', 'TEXT'),
+        ('docentes', 'normalizacao_pendente', 'INTEGER NOT NULL DEFAULT 1'),
+        ('docentes', 'normalizado_em', 'TIMESTAMP'),
+    ]),
+    (3, "Orientações e projetos extraídos pela normalização", [
+        # A tabela projetos é criada por create_tables; as tabelas derivadas mudaram,
+        # então todos os docentes voltam a ficar pendentes (--incremental as preenche)
+        "UPDATE docentes SET normalizacao_pendente = 1",
+    ]),
+]
+
+VERSAO_ESQUEMA = MIGRACOES[-1][0]  # Versão de um banco com todas as migrações aplicadas
+
+# Máximo de ids por lista IN (o SQLite antigo aceita até 999 parâmetros por comando)
+MAX_IDS_POR_COMANDO = 500
+
+
+def hash_conteudo(data_completa: Dict) -> str:
+    """
+    Calcula o hash do conteúdo de um currículo
+    
+    O JSON é serializado de forma canônica (chaves ordenadas, sem espaços) e
+    sem os CAMPOS_VOLATEIS, então o mesmo currículo gera sempre o mesmo hash.
+    
+    Args:
+        data_completa: JSON completo da API de detalhes
+    
+    Returns:
+        SHA-256 em hexadecimal
+    """
+    conteudo = {k: v for k, v in data_completa.items() if k not in CAMPOS_VOLATEIS}
+    # Sempre com o json padrão: os hashes já gravados dependem deste formato exato
+    # (orjson/msgspec escrevem alguns floats de outro jeito)
+    canonico = json.dumps(conteudo, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonico.encode('utf-8')).hexdigest()
+
+
+def carimbo_atualizacao(pessoa: Dict) -> Optional[str]:
+    """
+    Monta o carimbo de atualização de uma pessoa a partir da listagem da API
+    
+    Args:
+        pessoa: Dados básicos da pessoa (linha da listagem)
+    
+    Returns:
+        String comparável entre execuções, ou None se a listagem não informar a data
+    """
+    atualizacao = pessoa.get('updatedOn')
+    if not atualizacao:
+        atualizacao = [pessoa.get('dataAtualizacao'), pessoa.get('horaAtualizacao')]
+        if not any(atualizacao):
+            return None
+    
+    return json.dumps(atualizacao, separators=(',', ':'))
+
+
+@lru_cache(maxsize=1)
+def carregar_dicionario_zstd() -> Optional['zstandard.ZstdCompressionDict']:
+    """Carrega o dicionário zstd treinado (ARQUIVO_DICIONARIO_ZSTD), se existir"""
+    if zstandard is None or not os.path.exists(ARQUIVO_DICIONARIO_ZSTD):
+        return None
+    
+    with open(ARQUIVO_DICIONARIO_ZSTD, 'rb') as f:
+        return zstandard.ZstdCompressionDict(f.read())
+
+
+@lru_cache(maxsize=1)
+def compressor_zstd() -> 'zstandard.ZstdCompressor':
+    """Compressor zstd reutilizado entre linhas (com o dicionário, se houver)"""
+    if zstandard is None:
+        raise RuntimeError("Formato zstd requer a biblioteca zstandard (pip install zstandard)")
+    return zstandard.ZstdCompressor(level=NIVEL_COMPRESSAO, dict_data=carregar_dicionario_zstd())
+
+
+@lru_cache(maxsize=1)
+def descompressor_zstd() -> 'zstandard.ZstdDecompressor':
+    """Descompressor zstd reutilizado entre linhas (com o dicionário, se houver)"""
+    if zstandard is None:
+        raise RuntimeError("Formato zstd requer a biblioteca zstandard (pip install zstandard)")
+    return zstandard.ZstdDecompressor(dict_data=carregar_dicionario_zstd())
+
+
+def codificar_data_completa(data_completa: Dict,
+                            formato: Optional[str] = COMPRESSAO_DATA_COMPLETA) -> Union[str, bytes]:
+    """
+    Serializa o JSON completo de um docente para a coluna data_completa
+    
+    Args:
+        data_completa: JSON completo da API de detalhes
+        formato: None (texto JSON), "zlib" ou "zstd"
+    
+    Returns:
+        Texto JSON ou BLOB compactado
+    """
+    if formato is None:
+        return dumps(data_completa)
+    return compactar_bytes(dumps_bytes(data_completa), formato)
+
+
+def compactar_texto(texto: str, formato: Optional[str] = COMPRESSAO_DATA_COMPLETA) -> Union[str, bytes]:
+    """Compacta um texto JSON no formato pedido (None devolve o próprio texto)"""
+    if formato is None:
+        return texto
+    return compactar_bytes(texto.encode('utf-8'), formato)
+
+
+def compactar_bytes(dados: bytes, formato: str) -> bytes:
+    """Compacta o JSON já em UTF-8 com zlib ou zstd"""
+    if formato == 'zlib':
+        return zlib.compress(dados, NIVEL_COMPRESSAO)
+    
+    if formato == 'zstd':
+        return compressor_zstd().compress(dados)
+    
+    raise ValueError(f"Formato de compressão desconhecido: {formato}")
+
+
+def texto_data_completa(valor: Union[str, bytes]) -> str:
+    """
+    Devolve o texto JSON de data_completa, descompactando se necessário
+    
+    O formato é reconhecido pelo próprio valor (texto, frame zstd ou zlib),
+    então linhas em formatos diferentes podem conviver no mesmo banco.
+    """
+    if isinstance(valor, str):
+        return valor
+    return descompactar(valor).decode('utf-8')
+
+
+def descompactar(valor: bytes) -> bytes:
+    """Descompacta um BLOB de data_completa (frame zstd ou zlib) para o JSON em UTF-8"""
+    if valor.startswith(MAGICO_ZSTD):
+        return descompressor_zstd().decompress(valor)
+    return zlib.decompress(valor)
+
+
+def decodificar_data_completa(valor: Union[str, bytes]) -> Dict:
+    """Converte o valor da coluna data_completa (texto ou BLOB compactado) em dicionário"""
+    # Os bytes descompactados vão direto ao decodificador, sem virar str antes
+    return loads(valor if isinstance(valor, str) else descompactar(valor))
+
+
+def iterar_docentes(conn: sqlite3.Connection, colunas: str = "id, data_completa", filtro: str = "",
+                    parametros: tuple = (), tamanho_lote: int = LOTE_LEITURA_DOCENTES) -> Iterator[tuple]:
+    """
+    Percorre a tabela docentes em lotes, paginando pelo id
+    
+    Cada lote é uma consulta curta (WHERE id > último ORDER BY id LIMIT n), então
+    só um lote fica em memória e quem chama pode gravar na mesma conexão entre
+    um lote e outro.
+    
+    Args:
+        conn: Conexão SQLite (Database.conn ou sqlite3.connect)
+        colunas: Colunas do SELECT; a primeira precisa ser o id
+        filtro: Condição SQL adicional (sem o WHERE)
+        parametros: Parâmetros da condição
+        tamanho_lote: Linhas lidas por consulta
+    
+    Yields:
+        Uma linha por docente, em ordem de id
+    """
+    condicao = f"AND ({filtro})" if filtro else ""
+    ultimo_id = 0
+    
+    while True:
+        linhas = conn.execute(f"""
+            SELECT {colunas} FROM docentes
+            WHERE id > ? {condicao}
+            ORDER BY id
+            LIMIT ?
+        """, (ultimo_id, *parametros, tamanho_lote)).fetchall()
+        
+        if not linhas:
+            return
+        
+        yield from linhas
+        ultimo_id = linhas[-1][0]
 
 
 class Database:
-    """Classe para gerenciar o banco de dados SQLite"""
+    """
+    Classe para gerenciar o banco de dados SQLite
     
-    def __init__(self, db_name: str = DB_NAME):
-        """Inicializa conexão com o banco de dados"""
+    Modelo de acesso: a coleta (main.py) usa uma única conexão de escrita, e
+    os scripts de relatório abrem conexões somente leitura. Em modo WAL, os
+    leitores veem o último commit sem bloquear a escrita e sem serem
+    bloqueados por ela.
+    """
+    
+    def __init__(self, db_name: str = DB_NAME, somente_leitura: bool = False,
+                 pragmas: Optional[Dict[str, Any]] = None):
+        """
+        Inicializa conexão com o banco de dados
+        
+        Args:
+            db_name: Arquivo do banco
+            somente_leitura: Abre o arquivo em modo leitura (scripts de relatório)
+            pragmas: Perfil de conexão (padrão: SQLITE_PRAGMAS do config)
+        """
         self.db_name = db_name
+        self.somente_leitura = somente_leitura
+        self.pragmas = SQLITE_PRAGMAS if pragmas is None else pragmas
         self.conn = None
         self.cursor = None
     
     def connect(self):
-        """Conecta ao banco de dados"""
-        self.conn = sqlite3.connect(self.db_name)
+        """Conecta ao banco de dados e aplica o perfil de pragmas"""
+        if self.somente_leitura:
+            self.conn = sqlite3.connect(f"file:{self.db_name}?mode=ro", uri=True)
+        else:
+            self.conn = sqlite3.connect(self.db_name)
         self.conn.row_factory = sqlite3.Row  # Permite acessar colunas por nome
         self.cursor = self.conn.cursor()
+        
+        for pragma, valor in self.pragmas.items():
+            # journal_mode fica gravado no arquivo: só quem escreve precisa ajustar
+            if self.somente_leitura and pragma == 'journal_mode':
+                continue
+            self.cursor.execute(f"PRAGMA {pragma} = {valor}")
+        
+        if self.somente_leitura:
+            self.cursor.execute("PRAGMA query_only = ON")
     
     def close(self):
         """Fecha conexão com o banco"""
@@ -43,8 +349,13 @@ class Database:
                 cargo TEXT,
                 email TEXT,
                 url TEXT,
-                data_completa TEXT NOT NULL,  -- JSON completo da API
-                atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                data_completa TEXT NOT NULL,  -- JSON completo da API (texto ou BLOB zlib/zstd)
+                atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                carimbo_fonte TEXT,  -- updatedOn/dataAtualizacao da listagem na última coleta
+                removido_em TIMESTAMP,  -- quando o docente sumiu da listagem (NULL = ativo)
+                content_hash TEXT,  -- hash do JSON canônico (ver hash_conteudo)
+                normalizacao_pendente INTEGER NOT NULL DEFAULT 1,  -- 1 = conteúdo mudou desde a última normalização
+                normalizado_em TIMESTAMP  -- última normalização concluída
             )
         """)
         
@@ -68,6 +379,8 @@ class Database:
                 nome_citacao TEXT,
                 orcid TEXT,
                 resumo_cv TEXT,
+                lattes_url TEXT,
+                palavras_chave TEXT,
                 FOREIGN KEY (id_docente) REFERENCES docentes(id) ON DELETE CASCADE
             )
         """)
@@ -110,7 +423,10 @@ class Database:
                 tipo TEXT,  -- artigo, livro, capítulo, etc
                 titulo TEXT,
                 ano INTEGER,
-                detalhes TEXT,  -- JSON com informações adicionais
+                revista_evento_editora TEXT,
+                num_coautores INTEGER,
+                lista_coautores TEXT,
+                detalhes TEXT,  -- JSON ou referência ao registro em data_completa (DETALHES_PRODUCAO)
                 FOREIGN KEY (id_docente) REFERENCES docentes(id) ON DELETE CASCADE
             )
         """)
@@ -121,6 +437,7 @@ class Database:
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 id_docente INTEGER NOT NULL,
                 nome_orientado TEXT,
+                tipo_orientacao TEXT,
                 curso TEXT,
                 instituicao TEXT,
                 titulo TEXT,
@@ -154,68 +471,334 @@ class Database:
             )
         """)
         
+        # Tabela de projetos de pesquisa/ensino/extensão
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS projetos (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                id_docente INTEGER NOT NULL,
+                nome TEXT NOT NULL,
+                natureza TEXT,
+                situacao TEXT,
+                ano_inicio INTEGER,
+                ano_fim INTEGER,
+                descricao TEXT,
+                instituicao TEXT,
+                orgao TEXT,
+                flag_coordenador TEXT,
+                num_integrantes INTEGER,
+                num_alunos_graduacao INTEGER,
+                num_alunos_mestrado INTEGER,
+                num_alunos_doutorado INTEGER,
+                FOREIGN KEY (id_docente) REFERENCES docentes(id) ON DELETE CASCADE
+            )
+        """)
+        
+        self.criar_indices_normalizados(commit=False)
+        
+        # Checkpoints da coleta (para retomar com --resume)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoint_instituicoes (
+                sigla TEXT PRIMARY KEY,
+                page_size INTEGER,
+                total INTEGER,
+                concluida_em TIMESTAMP,  -- NULL enquanto houver trabalho pendente
+                atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoint_paginas (
+                sigla TEXT NOT NULL,
+                inicio INTEGER NOT NULL,
+                pessoas TEXT NOT NULL,  -- JSON das linhas da listagem
+                PRIMARY KEY (sigla, inicio)
+            )
+        """)
+        
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoint_slugs (
+                sigla TEXT NOT NULL,
+                slug TEXT NOT NULL,
+                PRIMARY KEY (sigla, slug)
+            )
+        """)
+        
         self.conn.commit()
+        
+        # Bancos criados por versões anteriores: leva o esquema até VERSAO_ESQUEMA
+        self.aplicar_migracoes()
         print("✅ Tabelas criadas com sucesso!")
     
-    def insert_docente(self, sigla: str, pessoa: Dict, data_completa: Dict) -> Optional[int]:
+    def versao_esquema(self) -> int:
+        """Retorna a versão do esquema do banco (0 = nenhuma migração registrada)"""
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'")
+        if not self.cursor.fetchone():
+            return 0
+        
+        self.cursor.execute("SELECT MAX(versao) FROM schema_version")
+        return self.cursor.fetchone()[0] or 0
+    
+    def aplicar_migracoes(self) -> List[int]:
+        """
+        Aplica, em ordem, as MIGRACOES ainda não registradas em schema_version
+        
+        Cada migração roda em uma transação junto com o seu registro: ou entra
+        inteira, ou o banco continua na versão anterior.
+        
+        Returns:
+            Lista das versões aplicadas nesta chamada
+        """
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                versao INTEGER PRIMARY KEY,
+                descricao TEXT NOT NULL,
+                aplicada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        self.conn.commit()
+        
+        atual = self.versao_esquema()
+        aplicadas = []
+        
+        for versao, descricao, passos in MIGRACOES:
+            if versao <= atual:
+                continue
+            
+            # DDL não abre transação sozinho no sqlite3
+            self.cursor.execute("BEGIN")
+            try:
+                for passo in passos:
+                    if isinstance(passo, tuple):
+                        self.garantir_coluna(*passo)
+                    else:
+                        self.cursor.execute(passo)
+                
+                self.cursor.execute("INSERT INTO schema_version (versao, descricao) VALUES (?, ?)",
+                                    (versao, descricao))
+                self.conn.commit()
+            except sqlite3.Error:
+                self.conn.rollback()
+                raise
+            
+            print(f"🔧 Migração {versao} aplicada: {descricao}")
+            aplicadas.append(versao)
+        
+        return aplicadas
+    
+    def colunas_tabela(self, tabela: str) -> List[str]:
+        """Retorna as colunas existentes na tabela (lista vazia se ela não existir)"""
+        self.cursor.execute(f"PRAGMA table_info({tabela})")
+        return [row[1] for row in self.cursor.fetchall()]
+    
+    def garantir_coluna(self, tabela: str, coluna: str, tipo: str):
+        """Adiciona a coluna à tabela se ela ainda não existir"""
+        if coluna not in self.colunas_tabela(tabela):
+            self.cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {tipo}")
+    
+    def linha_docente(self, sigla: str, pessoa: Dict, data_completa: Dict) -> tuple:
+        """
+        Monta os valores de um docente na ordem de SQL_UPSERT_DOCENTE
+        
+        Args:
+            sigla: Sigla da instituição (ex: IFB, IFSP)
+            pessoa: Dados básicos da pessoa
+            data_completa: JSON completo da API de detalhes
+        
+        Returns:
+            Tupla (sigla, slug, nome, campus, cargo, email, url, data_completa, carimbo_fonte, content_hash)
+        """
+        slug = pessoa.get('slug', '')
+        nome = pessoa.get('nome', '')
+        campus = pessoa.get('campusNome', '')
+        cargo = pessoa.get('cargo', '')
+        
+        # Extrai email se disponível
+        email = None
+        if 'dadosGerais' in data_completa and 'emails' in data_completa['dadosGerais']:
+            emails = data_completa['dadosGerais']['emails']
+            if emails and len(emails) > 0:
+                email = emails[0].get('email', '')
+        
+        url = f"{data_completa.get('baseUrl', '')}/api/portfolio/pessoa/s/{slug}"
+        carimbo = carimbo_atualizacao(pessoa)
+        
+        # Converte data_completa para JSON (compactado se COMPRESSAO_DATA_COMPLETA)
+        data_json = codificar_data_completa(data_completa)
+        
+        return (sigla, slug, nome, campus, cargo, email, url, data_json, carimbo,
+                hash_conteudo(data_completa))
+    
+    def insert_docente(self, sigla: str, pessoa: Dict, data_completa: Dict,
+                       commit: bool = True) -> Optional[int]:
         """
         Insere ou atualiza um docente no banco
         
+        Para gravar muitos docentes, prefira upsert_docentes.
+        
         Args:
             sigla: Sigla da instituição (ex: IFB, IFSP)
             pessoa: Dados básicos da pessoa
             data_completa: JSON completo da API de detalhes
+            commit: Se False, deixa o commit para quem chama (gravação em lote)
         
         Returns:
             ID do docente inserido/atualizado ou None em caso de erro
         """
         try:
-            slug = pessoa.get('slug', '')
-            nome = pessoa.get('nome', '')
-            campus = pessoa.get('campusNome', '')
-            cargo = pessoa.get('cargo', '')
-            
-            # Extrai email se disponível
-            email = None
-            if 'dadosGerais' in data_completa and 'emails' in data_completa['dadosGerais']:
-                emails = data_completa['dadosGerais']['emails']
-                if emails and len(emails) > 0:
-                    email = emails[0].get('email', '')
-            
-            url = f"{data_completa.get('baseUrl', '')}/api/portfolio/pessoa/s/{slug}"
-            
-            # Converte data_completa para JSON string
-            data_json = json.dumps(data_completa, ensure_ascii=False)
+            linha = self.linha_docente(sigla, pessoa, data_completa)
+            self.cursor.execute(SQL_UPSERT_DOCENTE + " RETURNING id", linha)
+            row = self.cursor.fetchone()
             
-            # Verifica se já existe
-            self.cursor.execute("SELECT id FROM docentes WHERE slug = ?", (slug,))
-            existing = self.cursor.fetchone()
+            if row is None:
+                # Conteúdo igual: o upsert não tocou na linha e não retornou nada
+                self.cursor.execute("SELECT id FROM docentes WHERE slug = ?", (linha[1],))
+                row = self.cursor.fetchone()
+            docente_id = row[0]
             
-            if existing:
-                # Atualiza
-                self.cursor.execute("""
-                    UPDATE docentes 
-                    SET sigla = ?, nome = ?, campus = ?, cargo = ?, 
-                        email = ?, url = ?, data_completa = ?, 
-                        atualizado_em = CURRENT_TIMESTAMP
-                    WHERE slug = ?
-                """, (sigla, nome, campus, cargo, email, url, data_json, slug))
-                docente_id = existing[0]
-            else:
-                # Insere novo
-                self.cursor.execute("""
-                    INSERT INTO docentes (sigla, slug, nome, campus, cargo, email, url, data_completa)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (sigla, slug, nome, campus, cargo, email, url, data_json))
-                docente_id = self.cursor.lastrowid
-            
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
             return docente_id
-            
+        
         except Exception as e:
             print(f"❌ Erro ao inserir docente {pessoa.get('nome', 'DESCONHECIDO')}: {e}")
             return None
     
+    def upsert_docentes(self, docentes: List[Tuple[str, Dict, Dict]],
+                        tamanho_lote: int = TAMANHO_LOTE_BANCO,
+                        commit: bool = True) -> Dict[str, int]:
+        """
+        Insere ou atualiza vários docentes de uma vez
+        
+        Cada lote vai em um único executemany com INSERT ... ON CONFLICT(slug)
+        DO UPDATE e, com commit=True, um único commit. Os IDs são lidos depois
+        com um SELECT por lote, porque o sqlite3 descarta as linhas do
+        RETURNING no executemany. Se um lote falhar, seus docentes são
+        regravados um a um para isolar o que tiver problema. Docentes cujo
+        conteúdo não mudou (mesmo content_hash) não são regravados.
+        
+        Args:
+            docentes: Lista de tuplas (sigla, dados_basicos, dados_completos)
+            tamanho_lote: Docentes por executemany/commit
+            commit: Se False, deixa o commit para quem chama (ex: junto com checkpoints)
+        
+        Returns:
+            Dicionário {slug: id} dos docentes gravados (quem falhou fica de fora)
+        """
+        ids = {}
+        
+        for i in range(0, len(docentes), tamanho_lote):
+            linhas = []
+            for sigla, pessoa, data_completa in docentes[i:i + tamanho_lote]:
+                try:
+                    linhas.append(self.linha_docente(sigla, pessoa, data_completa))
+                except Exception as e:
+                    print(f"❌ Erro ao preparar docente {pessoa.get('nome', 'DESCONHECIDO')}: {e}")
+            
+            try:
+                self.cursor.executemany(SQL_UPSERT_DOCENTE, linhas)
+                gravadas = linhas
+            except sqlite3.Error as e:
+                print(f"⚠️  Erro no lote ({e}), gravando docente a docente...")
+                gravadas = []
+                for linha in linhas:
+                    try:
+                        self.cursor.execute(SQL_UPSERT_DOCENTE, linha)
+                        gravadas.append(linha)
+                    except sqlite3.Error as e:
+                        print(f"❌ Erro ao inserir docente {linha[2]}: {e}")
+            
+            slugs = [linha[1] for linha in gravadas]
+            if slugs:
+                marcadores = ', '.join('?' * len(slugs))
+                self.cursor.execute(f"SELECT slug, id FROM docentes WHERE slug IN ({marcadores})", slugs)
+                ids.update({row[0]: row[1] for row in self.cursor.fetchall()})
+            
+            if commit:
+                self.conn.commit()
+        
+        return ids
+    
+    def salvar_checkpoint_paginacao(self, sigla: str, page_size: int, total: int):
+        """Registra o tamanho de página e o total da listagem (sem commit: vai junto com o lote)"""
+        self.cursor.execute("""
+            INSERT INTO checkpoint_instituicoes (sigla, page_size, total)
+            VALUES (?, ?, ?)
+            ON CONFLICT(sigla) DO UPDATE SET
+                page_size = excluded.page_size,
+                total = excluded.total,
+                atualizado_em = CURRENT_TIMESTAMP
+        """, (sigla, page_size, total))
+    
+    def salvar_checkpoint_pagina(self, sigla: str, inicio: int, pessoas: List[Dict]):
+        """Registra uma página da listagem já obtida (sem commit: vai junto com o lote)"""
+        self.cursor.execute("""
+            INSERT OR REPLACE INTO checkpoint_paginas (sigla, inicio, pessoas)
+            VALUES (?, ?, ?)
+        """, (sigla, inicio, dumps(pessoas)))
+    
+    def salvar_checkpoint_slug(self, sigla: str, slug: str):
+        """Registra um docente já gravado (sem commit: vai junto com o lote)"""
+        self.cursor.execute("""
+            INSERT OR IGNORE INTO checkpoint_slugs (sigla, slug)
+            VALUES (?, ?)
+        """, (sigla, slug))
+    
+    def concluir_checkpoint(self, sigla: str):
+        """
+        Marca a instituição como concluída (sem commit: vai junto com o lote)
+        
+        Páginas e slugs registrados deixam de ser necessários e são apagados.
+        """
+        self.cursor.execute("""
+            INSERT INTO checkpoint_instituicoes (sigla, concluida_em)
+            VALUES (?, CURRENT_TIMESTAMP)
+            ON CONFLICT(sigla) DO UPDATE SET
+                concluida_em = CURRENT_TIMESTAMP,
+                atualizado_em = CURRENT_TIMESTAMP
+        """, (sigla,))
+        self.cursor.execute("DELETE FROM checkpoint_paginas WHERE sigla = ?", (sigla,))
+        self.cursor.execute("DELETE FROM checkpoint_slugs WHERE sigla = ?", (sigla,))
+    
+    def get_checkpoint(self, sigla: str) -> Optional[Dict]:
+        """
+        Retorna o checkpoint de coleta de uma instituição
+        
+        Returns:
+            Dict com page_size, total, concluida, paginas ({inicio: pessoas}) e
+            slugs (set), ou None se não houver checkpoint
+        """
+        self.cursor.execute("""
+            SELECT page_size, total, concluida_em
+            FROM checkpoint_instituicoes
+            WHERE sigla = ?
+        """, (sigla,))
+        row = self.cursor.fetchone()
+        
+        if not row:
+            return None
+        
+        self.cursor.execute("SELECT inicio, pessoas FROM checkpoint_paginas WHERE sigla = ?", (sigla,))
+        paginas = {inicio: loads(pessoas) for inicio, pessoas in self.cursor.fetchall()}
+        
+        self.cursor.execute("SELECT slug FROM checkpoint_slugs WHERE sigla = ?", (sigla,))
+        slugs = {r[0] for r in self.cursor.fetchall()}
+        
+        return {
+            'page_size': row['page_size'],
+            'total': row['total'],
+            'concluida': row['concluida_em'] is not None,
+            'paginas': paginas,
+            'slugs': slugs,
+        }
+    
+    def limpar_checkpoints(self, siglas: List[str]):
+        """Apaga os checkpoints das instituições (uma coleta nova começa do zero)"""
+        for sigla in siglas:
+            self.cursor.execute("DELETE FROM checkpoint_instituicoes WHERE sigla = ?", (sigla,))
+            self.cursor.execute("DELETE FROM checkpoint_paginas WHERE sigla = ?", (sigla,))
+            self.cursor.execute("DELETE FROM checkpoint_slugs WHERE sigla = ?", (sigla,))
+        self.conn.commit()
+    
     def get_docentes_by_sigla(self, sigla: str) -> List[Dict]:
         """Retorna todos os docentes de uma instituição"""
         self.cursor.execute("""
@@ -228,6 +811,38 @@ class Database:
         rows = self.cursor.fetchall()
         return [dict(row) for row in rows]
     
+    def get_carimbos_by_sigla(self, sigla: str) -> Dict[str, Optional[str]]:
+        """
+        Retorna {slug: carimbo_fonte} dos docentes ativos de uma instituição
+        
+        Usado na coleta incremental para saber o que já está no banco e em que versão.
+        """
+        self.cursor.execute("""
+            SELECT slug, carimbo_fonte
+            FROM docentes
+            WHERE sigla = ? AND removido_em IS NULL
+        """, (sigla,))
+        return {row[0]: row[1] for row in self.cursor.fetchall()}
+    
+    def marcar_removidos(self, slugs: List[str]) -> int:
+        """
+        Marca docentes que sumiram da listagem (tombstone), sem apagar os dados
+        
+        Args:
+            slugs: Slugs a marcar
+        
+        Returns:
+            Quantidade de docentes marcados
+        """
+        self.cursor.executemany("""
+            UPDATE docentes
+            SET removido_em = CURRENT_TIMESTAMP
+            WHERE slug = ? AND removido_em IS NULL
+        """, [(slug,) for slug in slugs])
+        marcados = self.cursor.rowcount
+        self.conn.commit()
+        return marcados
+    
     def get_all_siglas(self) -> List[str]:
         """Retorna lista de todas as siglas únicas no banco"""
         self.cursor.execute("""
@@ -261,29 +876,140 @@ class Database:
         
         row = self.cursor.fetchone()
         if row:
-            return json.loads(row[0])
+            return decodificar_data_completa(row[0])
         return None
     
-    def get_all_docentes_for_normalization(self) -> List[tuple]:
-        """Retorna todos os docentes para normalização (id, data_completa)"""
+    def iter_docentes_for_normalization(self, somente_pendentes: bool = False,
+                                        tamanho_lote: int = LOTE_LEITURA_DOCENTES) -> Iterator[tuple]:
+        """
+        Percorre os docentes para normalização, lendo um lote de cada vez
+        
+        Args:
+            somente_pendentes: Se True, só os novos ou com conteúdo alterado
+                               desde a última normalização (normalizacao_pendente = 1)
+            tamanho_lote: Docentes lidos por consulta
+        
+        Yields:
+            Tuplas (id, data_completa como gravado, content_hash); o valor vai
+            ainda compactado para os processos de extração, que o decodificam
+            com decodificar_data_completa
+        """
+        filtro = "normalizacao_pendente = 1" if somente_pendentes else ""
+        for row in iterar_docentes(self.conn, "id, data_completa, content_hash", filtro, tamanho_lote=tamanho_lote):
+            yield (row[0], row[1], row[2])
+    
+    def count_docentes_pendentes_normalizacao(self) -> int:
+        """Conta docentes novos ou alterados desde a última normalização"""
+        self.cursor.execute("SELECT COUNT(*) FROM docentes WHERE normalizacao_pendente = 1")
+        return self.cursor.fetchone()[0]
+    
+    def marcar_normalizado(self, docente_id: int, content_hash: Optional[str]):
+        """
+        Registra a normalização de um docente (sem commit: vai junto com as tabelas normalizadas)
+        
+        Só limpa a pendência se o conteúdo ainda for o que foi normalizado: se
+        uma coleta regravou o docente nesse meio-tempo, ele continua pendente.
+        """
         self.cursor.execute("""
-            SELECT id, data_completa 
-            FROM docentes 
-            ORDER BY id
-        """)
-        return self.cursor.fetchall()
+            UPDATE docentes
+            SET normalizacao_pendente = CASE WHEN content_hash IS ? THEN 0 ELSE normalizacao_pendente END,
+                normalizado_em = CURRENT_TIMESTAMP
+            WHERE id = ?
+        """, (content_hash, docente_id))
+    
+    def clear_normalized_data(self, docente_id: int, commit: bool = True):
+        """
+        Remove dados normalizados de um docente (para re-normalizar)
+        
+        Args:
+            docente_id: ID do docente
+            commit: Se False, deixa o commit para quem chamou (gravação em lote)
+        """
+        self.clear_normalized_data_batch([docente_id], commit=commit)
     
-    def clear_normalized_data(self, docente_id: int):
-        """Remove dados normalizados de um docente (para re-normalizar)"""
-        tables = [
-            'dados_gerais', 'formacoes', 'atuacoes', 
-            'producao_bibliografica', 'orientacoes_concluidas', 
-            'premios_titulos', 'areas_atuacao'
-        ]
+    def clear_normalized_data_batch(self, docente_ids: List[int], commit: bool = True,
+                                    tabelas: Sequence[str] = TABELAS_NORMALIZADAS):
+        """
+        Remove dados normalizados de vários docentes: um DELETE por tabela
         
-        for table in tables:
-            self.cursor.execute(f"DELETE FROM {table} WHERE id_docente = ?", (docente_id,))
+        Args:
+            docente_ids: IDs dos docentes
+            commit: Se False, deixa o commit para quem chamou (o normalizador apaga
+                    e regrava o lote na mesma transação)
+            tabelas: Tabelas a limpar (o normalizador inclui as dos extratores extras)
+        """
+        for inicio in range(0, len(docente_ids), MAX_IDS_POR_COMANDO):
+            ids = docente_ids[inicio:inicio + MAX_IDS_POR_COMANDO]
+            marcadores = ', '.join('?' * len(ids))
+            for tabela in tabelas:
+                self.cursor.execute(f"DELETE FROM {tabela} WHERE id_docente IN ({marcadores})", ids)
+        
+        if commit:
+            self.conn.commit()
+    
+    def criar_indices_normalizados(self, commit: bool = True):
+        """Cria os índices de INDICES_NORMALIZADOS que ainda não existem"""
+        for nome, (tabela, colunas) in INDICES_NORMALIZADOS.items():
+            self.cursor.execute(f"CREATE INDEX IF NOT EXISTS {nome} ON {tabela}({colunas})")
+        
+        if commit:
+            self.conn.commit()
+    
+    def remover_indices_normalizados(self, commit: bool = True):
+        """Remove os índices de INDICES_NORMALIZADOS (antes de uma carga grande)"""
+        for nome in INDICES_NORMALIZADOS:
+            self.cursor.execute(f"DROP INDEX IF EXISTS {nome}")
         
+        if commit:
+            self.conn.commit()
+    
+    def recriar_tabelas_normalizadas(self, indices: bool = True,
+                                     tabelas: Sequence[str] = TABELAS_NORMALIZADAS):
+        """
+        Esvazia as tabelas normalizadas com DROP + CREATE (para a renormalização completa)
+        
+        Mais rápido que apagar linha a linha: o SQLite só libera as páginas. O
+        esquema atual de cada tabela e de seus índices (incluindo colunas criadas
+        pelas MIGRACOES) é lido de sqlite_master e recriado igual. Todos os
+        docentes ficam pendentes na mesma transação, então uma renormalização
+        interrompida pode ser completada com --incremental.
+        
+        Args:
+            indices: Se False, os INDICES_NORMALIZADOS não são recriados: a carga
+                     fica sem o custo de mantê-los e criar_indices_normalizados
+                     os constrói de uma vez no fim
+            tabelas: Tabelas a recriar (o normalizador inclui as dos extratores
+                     extras, que precisam já existir)
+        """
+        tabelas = tuple(tabelas)
+        marcadores = ', '.join('?' * len(tabelas))
+        self.cursor.execute(f"""
+            SELECT type, name, sql FROM sqlite_master
+            WHERE tbl_name IN ({marcadores}) AND sql IS NOT NULL
+        """, tabelas)
+        esquema = self.cursor.fetchall()
+        
+        criar_tabelas = [row['sql'] for row in esquema if row['type'] == 'table']
+        indices_existentes = [row['sql'] for row in esquema if row['type'] == 'index'
+                              and (indices or row['name'] not in INDICES_NORMALIZADOS)]
+        
+        existentes = {row['name'] for row in esquema if row['type'] == 'table'}
+        if set(tabelas) & set(TABELAS_NORMALIZADAS) - existentes:
+            # Alguma tabela ainda não existe: cria as que faltam antes de recriar
+            self.create_tables()
+            self.recriar_tabelas_normalizadas(indices, tabelas)
+            return
+        
+        # DDL não abre transação sozinho no sqlite3: abre aqui para o DROP/CREATE ser atômico
+        self.conn.commit()
+        self.cursor.execute("BEGIN")
+        
+        for tabela in tabelas:
+            self.cursor.execute(f"DROP TABLE {tabela}")
+        for sql in criar_tabelas + indices_existentes:
+            self.cursor.execute(sql)
+        
+        self.cursor.execute("UPDATE docentes SET normalizacao_pendente = 1")
         self.conn.commit()
     
     def get_statistics(self) -> Dict[str, Any]:
@@ -322,17 +1048,19 @@ class Database:
         """)
         stats['por_uf'] = dict(self.cursor.fetchall())
         
-        # Tabelas normalizadas
-        tables = [
-            'dados_gerais', 'formacoes', 'atuacoes', 
-            'producao_bibliografica', 'orientacoes_concluidas', 
-            'premios_titulos', 'areas_atuacao'
-        ]
+        # Tabelas normalizadas (um banco ainda não migrado, aberto somente leitura,
+        # pode não ter as mais novas: contam 0 e ficam em tabelas_ausentes)
+        self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        existentes = {row[0] for row in self.cursor.fetchall()}
         
         stats['tabelas_normalizadas'] = {}
-        for table in tables:
-            self.cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            stats['tabelas_normalizadas'][table] = self.cursor.fetchone()[0]
+        stats['tabelas_ausentes'] = [table for table in TABELAS_NORMALIZADAS if table not in existentes]
+        for table in TABELAS_NORMALIZADAS:
+            if table in existentes:
+                self.cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                stats['tabelas_normalizadas'][table] = self.cursor.fetchone()[0]
+            else:
+                stats['tabelas_normalizadas'][table] = 0
         
         return stats
 
@@ -3,9 +3,9 @@
 DEBUG COMPLETO - Mostra EXATAMENTE onde está falhando
 """
 
-import json
 import sqlite3
 from config import DB_NAME
+from database import decodificar_data_completa
 
 print("\n" + "="*80)
 print("🔍 DEBUG COMPLETO DE ORIENTAÇÕES")
@@ -39,7 +39,7 @@ if result:
     doc_id, nome, data_json = result
     print(f"📄 Testando: {nome} (ID: {doc_id})\n")
     
-    data = json.loads(data_json)
+    data = decodificar_data_completa(data_json)
     
     # PASSO 1: Verifica outraProducao
     print("PASSO 1: Verificando outraProducao")
@@ -76,7 +76,7 @@ if result:
         result = cursor.fetchone()
         doc_id, nome, data_json = result
         print(f"📄 Testando: {nome} (ID: {doc_id})\n")
-        data = json.loads(data_json)
+        data = decodificar_data_completa(data_json)
         outra = data.get('outraProducao', {})
         orient_list = outra.get('orientacoesConcluidas', [])
     
@@ -6,30 +6,33 @@ Mostra quantas pessoas existem, quantos docentes são filtrados e exemplos de ca
 
 import asyncio
 import aiohttp
-import ssl
-from typing import Dict, List
-from config import INSTITUICOES, HEADERS, TERMOS_DOCENTE, PAGE_SIZE
+from typing import Dict, List, Optional
+from codec import loads
+from config import INSTITUICOES, TERMOS_DOCENTE, PAGE_SIZE
+from scraper import criar_sessao
 
+# Timeout do diagnóstico (menor que o da coleta)
+TIMEOUT_DIAGNOSTICO = 30
 
-async def diagnosticar_instituicao(sigla: str, base_url: str) -> Dict:
+
+async def diagnosticar_instituicao(sigla: str, base_url: str,
+                                   session: Optional[aiohttp.ClientSession] = None) -> Dict:
     """
     Diagnostica uma instituição específica
     
     Args:
         sigla: Sigla da instituição
         base_url: URL base do Portal Integra
+        session: Sessão compartilhada (se None, cria uma só para esta chamada)
     
     Returns:
         Dicionário com resultados do diagnóstico
     """
-    # SSL context que aceita certificados inválidos
-    ssl_context = ssl.create_default_context()
-    ssl_context.check_hostname = False
-    ssl_context.verify_mode = ssl.CERT_NONE
+    if session is None:
+        async with criar_sessao(TIMEOUT_DIAGNOSTICO) as sessao_propria:
+            return await diagnosticar_instituicao(sigla, base_url, sessao_propria)
     
-    # Criar connector com SSL desabilitado
-    connector = aiohttp.TCPConnector(ssl=ssl_context)
-    timeout = aiohttp.ClientTimeout(total=30)
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT_DIAGNOSTICO)
     
     resultado = {
         'sigla': sigla,
@@ -42,39 +45,38 @@ async def diagnosticar_instituicao(sigla: str, base_url: str) -> Dict:
     }
     
     try:
-        async with aiohttp.ClientSession(headers=HEADERS, connector=connector, timeout=timeout) as session:
-            # Testa a API buscando primeira página
-            url = f"{base_url}/api/portfolio/pessoa/data?start=0&length={PAGE_SIZE}"
-            
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
+        # Testa a API buscando primeira página
+        url = f"{base_url}/api/portfolio/pessoa/data?start=0&length={PAGE_SIZE}"
+        
+        async with session.get(url, timeout=timeout) as response:
+            if response.status == 200:
+                data = await response.json(loads=loads)
+                
+                if data and isinstance(data, list) and len(data) >= 2:
+                    # Extrai metadata e pessoas
+                    metadata = data[0]
+                    pessoas = data[1]
+                    
+                    resultado['sucesso'] = True
+                    resultado['total_pessoas'] = metadata.get('total', 0)
                     
-                    if data and isinstance(data, list) and len(data) >= 2:
-                        # Extrai metadata e pessoas
-                        metadata = data[0]
-                        pessoas = data[1]
-                        
-                        resultado['sucesso'] = True
-                        resultado['total_pessoas'] = metadata.get('total', 0)
-                        
-                        # Analisa cargos
-                        for pessoa in pessoas:
-                            cargo = pessoa.get('cargo', '')
-                            if cargo:
-                                # Verifica se é docente
-                                cargo_lower = cargo.lower()
-                                is_docente = any(termo in cargo_lower for termo in TERMOS_DOCENTE)
-                                
-                                if is_docente:
-                                    resultado['cargos_docentes'].add(cargo)
-                                    resultado['docentes_filtrados'] += 1
-                                else:
-                                    resultado['cargos_ignorados'].add(cargo)
-                    else:
-                        resultado['erro'] = "Formato de resposta inesperado"
+                    # Analisa cargos
+                    for pessoa in pessoas:
+                        cargo = pessoa.get('cargo', '')
+                        if cargo:
+                            # Verifica se é docente
+                            cargo_lower = cargo.lower()
+                            is_docente = any(termo in cargo_lower for termo in TERMOS_DOCENTE)
+                            
+                            if is_docente:
+                                resultado['cargos_docentes'].add(cargo)
+                                resultado['docentes_filtrados'] += 1
+                            else:
+                                resultado['cargos_ignorados'].add(cargo)
                 else:
-                    resultado['erro'] = f"Status HTTP {response.status}"
+                    resultado['erro'] = "Formato de resposta inesperado"
+            else:
+                resultado['erro'] = f"Status HTTP {response.status}"
                     
     except asyncio.TimeoutError:
         resultado['erro'] = "Timeout"
@@ -94,15 +96,16 @@ async def diagnosticar_todas():
     
     print(f"📋 Total de instituições: {len(INSTITUICOES)}\n")
     
-    # Criar tarefas para todas as instituições
-    tasks = []
-    for sigla, info in INSTITUICOES.items():
-        tasks.append(diagnosticar_instituicao(sigla, info['url']))
-    
     print("⏳ Testando conexões (pode levar alguns minutos)...\n")
     
-    # Executar em paralelo
-    resultados = await asyncio.gather(*tasks)
+    async with criar_sessao(TIMEOUT_DIAGNOSTICO) as session:
+        # Criar tarefas para todas as instituições
+        tasks = []
+        for sigla, info in INSTITUICOES.items():
+            tasks.append(diagnosticar_instituicao(sigla, info['url'], session))
+        
+        # Executar em paralelo
+        resultados = await asyncio.gather(*tasks)
     
     # Análise dos resultados
     sucesso_count = sum(1 for r in resultados if r['sucesso'])
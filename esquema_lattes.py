@@ -0,0 +1,201 @@
+"""
+Esquema tipado das partes do currículo Lattes lidas pela normalização
+
+A normalização lê uma pequena parte de cada data_completa. Com msgspec
+instalado (opcional: `pip install msgspec`), o JSON é decodificado direto
+neste esquema, e as chaves que ele não declara são puladas sem criar nenhum
+objeto Python: dadosComplementares, producaoTecnica, as demais partes de
+outraProducao, autores de orientações etc.
+
+Os tipos são TypedDicts: o msgspec devolve dicts e listas comuns, então as
+especificações de extracao.py leem o resultado igual ao do json.loads. As
+variações de formato do Lattes estão no próprio esquema (lista_ou_item: lista
+ou item único; envelopes opcionais como [{artigoPublicado: [...]}] ou
+[[...]]). Os valores finais são Any: um tipo inesperado numa folha não
+invalida o currículo. Se mesmo assim o documento não couber no esquema, ele
+é decodificado inteiro (decodificar_curriculo nunca perde um docente).
+
+Ao ler uma chave nova em ESPECIFICACOES (normalizer_definitivo.py), declare-a
+aqui também: chaves fora do esquema chegam como ausentes.
+"""
+
+from typing import Any, Dict, List, Optional, TypedDict, Union
+
+from codec import loads
+from config import CAMPOS_DETALHES_PRODUCAO, DETALHES_PRODUCAO
+from database import descompactar
+
+try:
+    import msgspec
+except ImportError:  # Opcional: sem msgspec, a normalização decodifica o JSON inteiro
+    msgspec = None
+
+
+def lista_ou_item(tipo):
+    """Campo que o Lattes manda como lista, item único ou null"""
+    return Optional[Union[List[tipo], tipo]]
+
+
+def campos(nome: str, chaves, tipo=Any):
+    """TypedDict (total=False) com as chaves dadas, todas do mesmo tipo"""
+    return TypedDict(nome, {chave: tipo for chave in chaves}, total=False)
+
+
+# dadosGerais.formacaoAcademicaTitulacao.<nível>[*]
+Formacao = campos('Formacao', [
+    'nomeCurso', 'curso', 'nomeInstituicao', 'instituicao', 'anoDeInicio', 'anoInicio',
+    'anoDeConclusao', 'anoFim', 'tituloDaMonografia', 'tituloDaDissertacaoTese', 'nomeDoOrientador',
+])
+
+FormacaoAcademica = campos('FormacaoAcademica', [
+    'graduacoes', 'especializacoes', 'mestrados', 'mestradoProfissional',
+    'doutorado', 'posDoutorado', 'livreDocencia',
+], lista_ou_item(Formacao))
+
+# atuacaoProfissional > atividadesDeParticipacaoEmProjeto > participacaoEmProjeto > projetoDePesquisa
+Integrante = campos('Integrante', ['flagResponsavel'])
+
+EquipeDoProjeto = TypedDict('EquipeDoProjeto', {
+    'integrantesDoProjeto': lista_ou_item(Integrante),
+}, total=False)
+
+Projeto = TypedDict('Projeto', {
+    **{chave: Any for chave in (
+        'nomeDoProjeto', 'natureza', 'situacao', 'anoInicio', 'anoFim', 'descricaoDoProjeto',
+        'numeroGraduacao', 'numeroMestradoAcademico', 'numeroDoutorado',
+    )},
+    'equipeDoProjeto': Optional[EquipeDoProjeto],
+}, total=False)
+
+ParticipacaoEmProjeto = TypedDict('ParticipacaoEmProjeto', {
+    'nomeOrgao': Any,
+    'codigoOrgao': Any,
+    'projetoDePesquisa': lista_ou_item(Projeto),
+}, total=False)
+
+AtividadeEmProjeto = TypedDict('AtividadeEmProjeto', {
+    'participacaoEmProjeto': lista_ou_item(ParticipacaoEmProjeto),
+}, total=False)
+
+Atuacao = TypedDict('Atuacao', {
+    'nomeInstituicao': Any,
+    'atividades': Any,
+    'vinculo': Any,
+    'anoInicio': Any,
+    'anoFim': Any,
+    'atividadesDeParticipacaoEmProjeto': lista_ou_item(AtividadeEmProjeto),
+}, total=False)
+
+AtuacoesProfissionais = TypedDict('AtuacoesProfissionais', {
+    'atuacaoProfissional': lista_ou_item(Atuacao),
+}, total=False)
+
+Premio = campos('Premio', ['nomeDoPremioOuTitulo', 'ano', 'nomeEntidadePromotora'])
+
+PremiosTitulos = TypedDict('PremiosTitulos', {
+    'premioTitulo': lista_ou_item(Premio),
+}, total=False)
+
+Area = campos('Area', [
+    'nomeGrandeAreaDoConhecimento', 'nomeDaAreaDoConhecimento',
+    'nomeDaSubAreaDoConhecimento', 'nomeDaEspecialidade',
+])
+
+AreasDeAtuacao = TypedDict('AreasDeAtuacao', {
+    'areaDeAtuacao': lista_ou_item(Area),
+}, total=False)
+
+DadosGerais = TypedDict('DadosGerais', {
+    'nomeCompleto': Any,
+    'nomeEmCitacoesBibliograficas': Any,
+    'orcidId': Any,
+    'resumoCv': Any,
+    'formacaoAcademicaTitulacao': Optional[FormacaoAcademica],
+    'atuacoesProfissionais': Optional[AtuacoesProfissionais],
+    'premiosTitulos': Optional[PremiosTitulos],
+    'areasDeAtuacao': Optional[AreasDeAtuacao],
+}, total=False)
+
+# producaoBibliografica: as chaves lidas por colunas_producao + as da coluna detalhes
+# (DETALHES_PRODUCAO). Com "completo", o registro inteiro vai para detalhes e é
+# decodificado por completo
+Autor = campos('Autor', ['nomeCompletoDoAutor', 'nomeParaCitacao'])
+
+if DETALHES_PRODUCAO == 'completo':
+    Producao = Any
+else:
+    Producao = TypedDict('Producao', {
+        **{chave: Any for chave in (
+            'id', 'sequenciaProducao',
+            'tituloDoArtigo', 'anoDoArtigo', 'tituloDoPeriodicoOuRevista',
+            'tituloDoTrabalho', 'anoDoTrabalho', 'nomeDoEvento',
+            'tituloDoLivro', 'anoDoLivro', 'tituloDoCapituloDoLivro', 'anoDoCapitulo', 'nomeEditora',
+        )},
+        **({chave: Any for chave in CAMPOS_DETALHES_PRODUCAO} if DETALHES_PRODUCAO == 'resumido' else {}),
+        'autores': lista_ou_item(Autor),
+    }, total=False)
+
+# Lista de produções (percorrida com '*'); quando o Lattes manda um dict, as especificações o ignoram
+ListaDeProducoes = Optional[Union[List[Producao], Dict[str, Any]]]
+
+EnvelopeArtigos = campos('EnvelopeArtigos', ['artigoPublicado'], ListaDeProducoes)
+EnvelopeTrabalhos = campos('EnvelopeTrabalhos', ['trabalhoEmEventos'], ListaDeProducoes)
+LivrosECapitulos = campos('LivrosECapitulos', ['livrosPublicadosOuOrganizados', 'capitulosDeLivrosPublicados'], ListaDeProducoes)
+
+ProducaoBibliografica = TypedDict('ProducaoBibliografica', {
+    # Cada elemento vem com o envelope ({artigoPublicado: [...]}) ou como a própria lista
+    'artigosPublicados': Optional[List[Union[List[Producao], EnvelopeArtigos]]],
+    'trabalhosEmEventos': Optional[List[Union[List[Producao], EnvelopeTrabalhos]]],
+    'livrosECapitulos': Optional[List[LivrosECapitulos]],
+}, total=False)
+
+# outraProducao.orientacoesConcluidas[*].<tipo>[*]: cada tipo tem suas chaves detalhamento*/dadosBasicos*
+SUFIXOS_ORIENTACAO = (
+    'DaOrientacaoConcluidaDeMestrado', 'DaOrientacaoConcluidaDeDoutorado',
+    'DaOrientacaoConcluidaDePosDoutorado', 'DeOutrasOrientacoesConcluidas',
+)
+
+DetalhamentoOrientacao = campos('DetalhamentoOrientacao', ['nomeDoOrientado', 'nomeDoCurso', 'nomeDaInstituicao'])
+DadosBasicosOrientacao = campos('DadosBasicosOrientacao', ['titulo', 'ano', 'natureza'])
+
+Orientacao = TypedDict('Orientacao', {
+    **{'detalhamento' + sufixo: Optional[DetalhamentoOrientacao] for sufixo in SUFIXOS_ORIENTACAO},
+    **{'dadosBasicos' + sufixo: Optional[DadosBasicosOrientacao] for sufixo in SUFIXOS_ORIENTACAO},
+}, total=False)
+
+OrientacoesConcluidas = campos('OrientacoesConcluidas', [
+    'orientacoesConcluidasParaMestrado', 'orientacoesConcluidasParaDoutorado',
+    'orientacoesConcluidasParaPosDoutorado', 'outrasOrientacoesConcluidas',
+], lista_ou_item(Orientacao))
+
+OutraProducao = TypedDict('OutraProducao', {
+    'orientacoesConcluidas': lista_ou_item(OrientacoesConcluidas),
+}, total=False)
+
+Curriculo = TypedDict('Curriculo', {
+    'lattesUrl': Any,
+    'palavrasChave': Any,
+    'dadosGerais': Optional[DadosGerais],
+    'producaoBibliografica': Optional[ProducaoBibliografica],
+    'outraProducao': Optional[OutraProducao],
+}, total=False)
+
+DECODIFICADOR = msgspec.json.Decoder(Curriculo) if msgspec is not None else None
+
+
+def decodificar_curriculo(valor) -> Dict:
+    """
+    Decodifica data_completa (texto ou BLOB compactado) só com as partes do esquema
+    
+    Sem msgspec, ou se o documento não couber no esquema, decodifica o JSON
+    inteiro (o resultado extraído é o mesmo).
+    """
+    dados = valor if isinstance(valor, str) else descompactar(valor)
+    
+    if DECODIFICADOR is not None:
+        try:
+            return DECODIFICADOR.decode(dados)
+        except msgspec.ValidationError:
+            pass
+    
+    return loads(dados)
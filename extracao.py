@@ -0,0 +1,303 @@
+"""
+Motor de extração declarativa dos currículos (data_completa)
+
+Cada tabela derivada é declarada como uma EspecificacaoTabela: o caminho até os
+registros dentro do JSON e, para cada coluna, uma função que lê o valor do
+registro. As especificações são compiladas uma vez (compilar) em uma árvore de
+passos: caminhos com o mesmo prefixo (ex.: dadosGerais) são percorridos uma
+única vez, e cada registro encontrado gera as linhas de todas as tabelas que
+terminam ali.
+
+Passos de um caminho:
+    'chave'    desce na chave (só se o nó for um dict)
+    'chave?'   envelope opcional: se o nó já é uma lista, a chave foi omitida
+               (o Lattes manda tanto [{chave: [...]}] quanto [[...]])
+    '*'        cada elemento da lista
+    '*?'       cada elemento da lista, ou o próprio nó se ele for um dict
+               (item único fora da lista)
+    0, 1, ...  o elemento da lista naquela posição
+
+Os passos de iteração ('*', '*?' e índices) empilham seus itens; o parâmetro
+acima dos acessores conta níveis dessa pilha (acima=1 lê do item da iteração
+anterior, ex.: a participação que contém o projeto).
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from codec import dumps
+
+# Acessor de coluna: recebe o registro e a pilha de registros dos passos '*'
+# (o último é o próprio registro) e devolve o valor da coluna
+Acessor = Callable[[dict, list], object]
+
+
+def para_texto(valor) -> str:
+    """Converte para string (dict/list viram JSON)"""
+    if valor is None or valor == '':
+        return ''
+    if isinstance(valor, (dict, list)):
+        return dumps(valor)
+    return str(valor).strip()
+
+
+def para_inteiro(valor) -> Optional[int]:
+    """Converte para int com segurança"""
+    if valor is None:
+        return None
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def ler_chave(registro, chave: Union[str, Tuple[str, ...]]):
+    """Lê uma chave (ou um caminho de chaves, como tupla) de um dict; None se não houver"""
+    if isinstance(chave, str):
+        return registro.get(chave) if isinstance(registro, dict) else None
+    
+    for parte in chave:
+        if not isinstance(registro, dict):
+            return None
+        registro = registro.get(parte)
+    return registro
+
+
+def alternativas(chaves: Sequence, acima: int = 0) -> Acessor:
+    """Acessor do primeiro valor preenchido entre as chaves (como a.get(x) or a.get(y))"""
+    if acima:
+        def ler(registro, pilha):
+            origem = pilha[-1 - acima]
+            for chave in chaves:
+                valor = ler_chave(origem, chave)
+                if valor:
+                    return valor
+            return None
+        return ler
+    
+    if len(chaves) == 1 and isinstance(chaves[0], str):
+        chave = chaves[0]
+        return lambda registro, pilha: registro.get(chave)
+    
+    def ler(registro, pilha):
+        for chave in chaves:
+            valor = ler_chave(registro, chave)
+            if valor:
+                return valor
+        return None
+    return ler
+
+
+def texto(*chaves, acima: int = 0) -> Acessor:
+    """Coluna de texto: primeira chave preenchida, convertida por para_texto"""
+    ler = alternativas(chaves, acima)
+    return lambda registro, pilha: para_texto(ler(registro, pilha))
+
+
+def inteiro(*chaves, acima: int = 0) -> Acessor:
+    """Coluna inteira: primeira chave preenchida, convertida por para_inteiro"""
+    ler = alternativas(chaves, acima)
+    return lambda registro, pilha: para_inteiro(ler(registro, pilha))
+
+
+def bruto(chave, padrao=None, acima: int = 0) -> Acessor:
+    """
+    Coluna com o valor como está no JSON (padrao se a chave não existir)
+    
+    dict/list viram JSON (para_texto): o SQLite só grava valores escalares.
+    """
+    def ler(registro, pilha):
+        valor = ler_chave(pilha[-1 - acima] if acima else registro, chave)
+        if valor is None:
+            return padrao
+        if isinstance(valor, (dict, list)):
+            return para_texto(valor)
+        return valor
+    return ler
+
+
+def fixo(valor) -> Acessor:
+    """Coluna com um valor constante (ex.: o tipo da produção)"""
+    return lambda registro, pilha: valor
+
+
+class EspecificacaoTabela:
+    """Declaração de uma tabela extraída: caminho até os registros + colunas"""
+    
+    def __init__(self, tabela: str, caminho: Sequence[Union[str, int]],
+                 colunas: Sequence[Tuple[Union[str, Tuple[str, ...]], Acessor]],
+                 condicao: Optional[Tuple[Sequence[str], Callable[..., bool]]] = None):
+        """
+        Args:
+            tabela: Tabela de destino
+            caminho: Passos da raiz do JSON até cada registro (ver o topo do módulo)
+            colunas: Pares (coluna, acessor), na ordem do INSERT (sem id_docente).
+                     Uma tupla de colunas indica um acessor que devolve vários valores
+            condicao: (colunas, predicado): a linha só é gerada se predicado(*valores)
+        """
+        self.tabela = tabela
+        self.caminho = tuple(caminho)
+        self.colunas = tuple(colunas)
+        self.condicao = condicao
+    
+    def nomes_colunas(self) -> Tuple[str, ...]:
+        """Colunas da tabela na ordem das linhas geradas (id_docente primeiro)"""
+        nomes = ['id_docente']
+        for coluna, _ in self.colunas:
+            nomes.extend(coluna if isinstance(coluna, tuple) else (coluna,))
+        return tuple(nomes)
+    
+    def compilar_linha(self) -> Callable[[object, list, int], Optional[tuple]]:
+        """Monta a função que transforma um registro em linha (ou None)"""
+        acessores = []
+        for coluna, acessor in self.colunas:
+            acessores.append((acessor, isinstance(coluna, tuple)))
+        
+        teste = None
+        if self.condicao:
+            nomes = self.nomes_colunas()
+            colunas_condicao, predicado = self.condicao
+            indices = [nomes.index(coluna) for coluna in colunas_condicao]
+            teste = lambda linha: predicado(*[linha[i] for i in indices])
+        
+        def montar(registro, pilha, docente_id):
+            if not isinstance(registro, dict):
+                return None
+            
+            linha = [docente_id]
+            try:
+                for acessor, varios in acessores:
+                    if varios:
+                        linha.extend(acessor(registro, pilha))
+                    else:
+                        linha.append(acessor(registro, pilha))
+            except Exception:
+                # Registro com formato inesperado: perde-se a linha, não o docente
+                return None
+            
+            if teste is not None and not teste(linha):
+                return None
+            return tuple(linha)
+        
+        return montar
+
+
+def compilar_passo(passo: Union[str, int]) -> Tuple[Callable[[object], Sequence], bool]:
+    """
+    Converte um passo do caminho em função nó -> nós seguintes
+    
+    Returns:
+        (função, empilha): empilha indica um passo de iteração, cujos itens
+        entram na pilha passada aos acessores
+    """
+    if isinstance(passo, int):
+        def indice(no):
+            if isinstance(no, list) and len(no) > passo:
+                return (no[passo],)
+            return ()
+        return indice, True
+    
+    if passo == '*':
+        return (lambda no: no if isinstance(no, list) else ()), True
+    
+    if passo == '*?':
+        def itens(no):
+            if isinstance(no, list):
+                return no
+            if isinstance(no, dict):
+                return (no,)
+            return ()
+        return itens, True
+    
+    if passo.endswith('?'):
+        chave = passo[:-1]
+        
+        def envelope(no):
+            if isinstance(no, list):
+                return (no,)
+            if isinstance(no, dict):
+                valor = no.get(chave)
+                if valor is not None:
+                    return (valor,)
+            return ()
+        return envelope, False
+    
+    def descer(no):
+        if isinstance(no, dict):
+            valor = no.get(passo)
+            if valor is not None:
+                return (valor,)
+        return ()
+    return descer, False
+
+
+class NoExtracao:
+    """Nó da árvore compilada: linhas geradas neste ponto + passos seguintes"""
+    
+    def __init__(self):
+        self.saidas = []  # [(tabela, montar)]
+        self.filhos = {}  # {passo: NoExtracao}
+        self.passos = []  # [(função do passo, empilha, NoExtracao)], montado em finalizar
+    
+    def finalizar(self):
+        """Compila os passos dos filhos (depois que toda a árvore foi montada)"""
+        self.passos = []
+        for passo, filho in self.filhos.items():
+            funcao, empilha = compilar_passo(passo)
+            filho.finalizar()
+            self.passos.append((funcao, empilha, filho))
+
+
+class Extracao:
+    """Conjunto de especificações compilado, pronto para extrair docentes"""
+    
+    def __init__(self, especificacoes: Sequence[EspecificacaoTabela]):
+        """Compila as especificações (uma vez por processo)"""
+        self.colunas = {}
+        self.raiz = NoExtracao()
+        
+        for espec in especificacoes:
+            nomes = espec.nomes_colunas()
+            if self.colunas.setdefault(espec.tabela, nomes) != nomes:
+                raise ValueError(f"Especificações de {espec.tabela} com colunas diferentes")
+            
+            no = self.raiz
+            for passo in espec.caminho:
+                no = no.filhos.setdefault(passo, NoExtracao())
+            no.saidas.append((espec.tabela, espec.compilar_linha()))
+        
+        self.raiz.finalizar()
+    
+    def extrair(self, docente_id: int, data) -> Dict[str, List[tuple]]:
+        """
+        Percorre o JSON de um docente uma única vez
+        
+        Args:
+            docente_id: ID do docente (primeira coluna de cada linha)
+            data: data_completa já decodificado
+        
+        Returns:
+            Dict {tabela: [linhas na ordem de self.colunas[tabela]]}
+        """
+        linhas = {tabela: [] for tabela in self.colunas}
+        self.visitar(self.raiz, data, [data], docente_id, linhas)
+        return linhas
+    
+    def visitar(self, no: NoExtracao, valor, pilha: list, docente_id: int, linhas: Dict[str, List[tuple]]):
+        """Gera as linhas do nó e desce nos passos seguintes"""
+        for tabela, montar in no.saidas:
+            linha = montar(valor, pilha, docente_id)
+            if linha is not None:
+                linhas[tabela].append(linha)
+        
+        for funcao, empilha, filho in no.passos:
+            for proximo in funcao(valor):
+                if empilha:
+                    pilha.append(proximo)
+                    self.visitar(filho, proximo, pilha, docente_id, linhas)
+                    pilha.pop()
+                else:
+                    self.visitar(filho, proximo, pilha, docente_id, linhas)
+
+
+def compilar(especificacoes: Sequence[EspecificacaoTabela]) -> Extracao:
+    """Compila uma lista de especificações (atalho para Extracao(...))"""
+    return Extracao(especificacoes)
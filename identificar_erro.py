@@ -6,6 +6,7 @@ Identifica EXATAMENTE onde está o erro no normalizer
 import json
 import sqlite3
 from config import DB_NAME
+from database import decodificar_data_completa
 import traceback
 
 print("\n" + "="*80)
@@ -23,7 +24,7 @@ if result:
     doc_id, nome, data_json = result
     print(f"📄 Testando docente com erro: {nome} (ID: {doc_id})\n")
     
-    data = json.loads(data_json)
+    data = decodificar_data_completa(data_json)
     
     # Testa cada extração separadamente
     print("1️⃣  Testando extract_producao_bibliografica:")
@@ -5,7 +5,7 @@ Mostra como os dados realmente estão organizados
 """
 
 import json
-from database import Database
+from database import Database, decodificar_data_completa
 
 
 def investigar_estrutura():
@@ -38,7 +38,7 @@ def investigar_estrutura():
         print(f"{'='*70}\n")
         
         try:
-            data = json.loads(data_json)
+            data = decodificar_data_completa(data_json)
             
             # Mostra as chaves principais
             print("🔑 CHAVES PRINCIPAIS DO JSON:")
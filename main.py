@@ -5,15 +5,20 @@ Script principal para coleta de dados dos docentes da Rede Federal via Portal In
 Uso:
     python main.py                    # Coleta TODAS as 40 instituições
     python main.py IFB IFSP IFRJ      # Coleta apenas instituições específicas
+    python main.py --incremental      # Só baixa docentes novos ou atualizados desde a última coleta
+    python main.py --incremental --marcar-removidos IFB
+                                      # Idem, marcando no banco quem sumiu da listagem
+    python main.py --resume           # Retoma a última coleta interrompida de onde parou
 """
 
 import asyncio
 import sys
 import time
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
-from config import INSTITUICOES
+from cache_http import CacheHttp
+from config import DIAS_CACHE_HTTP, INSTITUICOES, TAMANHO_FILA_RESULTADOS, TAMANHO_LOTE_BANCO, USAR_CACHE_HTTP
 from database import Database, init_database
 from scraper import scrape_multiplas_instituicoes
 
@@ -28,15 +33,30 @@ def print_banner():
     print("="*70 + "\n")
 
 
-def parse_arguments() -> Optional[List[str]]:
+OPCOES_VALIDAS = {'--incremental', '--marcar-removidos', '--resume'}
+
+
+def parse_arguments() -> Tuple[Optional[List[str]], Set[str]]:
     """
     Processa argumentos da linha de comando
     
     Returns:
-        Lista de siglas para processar ou None para todas
+        Tupla (lista de siglas para processar ou None para todas, opções informadas)
     """
-    if len(sys.argv) > 1:
-        siglas = [s.upper() for s in sys.argv[1:]]
+    opcoes = {arg.lower() for arg in sys.argv[1:] if arg.startswith('--')}
+    
+    opcoes_invalidas = opcoes - OPCOES_VALIDAS
+    if opcoes_invalidas:
+        print(f"⚠️  Opções desconhecidas ignoradas: {', '.join(sorted(opcoes_invalidas))}")
+        opcoes &= OPCOES_VALIDAS
+    
+    if '--marcar-removidos' in opcoes and '--incremental' not in opcoes:
+        print("⚠️  --marcar-removidos só tem efeito junto com --incremental\n")
+    
+    argumentos = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    
+    if argumentos:
+        siglas = [s.upper() for s in argumentos]
         
         # Valida siglas
         siglas_validas = []
@@ -54,53 +74,183 @@ def parse_arguments() -> Optional[List[str]]:
         
         if not siglas_validas:
             print("❌ Nenhuma sigla válida fornecida!")
-            return None
+            return None, opcoes
         
-        return siglas_validas
+        return siglas_validas, opcoes
     
-    return None  # Processar todas
+    return None, opcoes  # Processar todas
 
 
-def salvar_resultados_no_banco(db: Database, todos_resultados: dict, todas_stats: dict):
+def gravar_lote(db: Database, lote: List[Tuple], resumo: Dict[str, Dict[str, int]]):
     """
-    Salva os resultados coletados no banco de dados
+    Grava um lote de eventos da fila em uma única transação
+    
+    Os docentes e os checkpoints que os acompanham são gravados juntos, então
+    um docente só conta como concluído para o --resume se ele mesmo foi salvo.
     
     Args:
         db: Instância do banco de dados
-        todos_resultados: Dicionário com resultados por instituição
-        todas_stats: Dicionário com estatísticas por instituição
+        lote: Eventos ('docente', sigla, dados_basicos, dados_completos),
+              ('paginacao', sigla, page_size, total), ('pagina', sigla, inicio, pessoas)
+              ou ('concluida', sigla)
+        resumo: Contadores de salvos/erros por instituição (atualizado in-place)
     """
-    print(f"\n{'='*70}")
-    print("💾 SALVANDO DADOS NO BANCO DE DADOS")
-    print(f"{'='*70}\n")
-    
-    total_salvos = 0
-    total_erros = 0
+    # Docentes primeiro, em um único upsert: 'concluida' sempre chega depois
+    # dos docentes da própria instituição, então a ordem relativa se mantém
+    docentes = [evento[1:] for evento in lote if evento[0] == 'docente']
+    ids = db.upsert_docentes(docentes, commit=False)
     
-    for sigla, docentes in todos_resultados.items():
-        print(f"💾 {sigla}: Salvando {len(docentes)} docentes...")
+    for sigla, pessoa_basica, _ in docentes:
+        contagem = resumo.setdefault(sigla, {'salvos': 0, 'erros': 0})
+        slug = pessoa_basica.get('slug', '')
         
-        salvos_instituicao = 0
-        erros_instituicao = 0
+        if slug in ids:
+            contagem['salvos'] += 1
+            db.salvar_checkpoint_slug(sigla, slug)
+        else:
+            contagem['erros'] += 1
+    
+    for evento in lote:
+        tipo, sigla = evento[0], evento[1]
         
-        for pessoa_basica, pessoa_completa in docentes:
-            docente_id = db.insert_docente(sigla, pessoa_basica, pessoa_completa)
+        if tipo == 'paginacao':
+            db.salvar_checkpoint_paginacao(sigla, evento[2], evento[3])
+        elif tipo == 'pagina':
+            db.salvar_checkpoint_pagina(sigla, evento[2], evento[3])
+        elif tipo == 'concluida':
+            db.concluir_checkpoint(sigla)
+    
+    db.conn.commit()
+
+
+def gravar_lote_com_tratamento(db: Database, lote: List[Tuple], resumo: Dict[str, Dict[str, int]]):
+    """
+    Grava um lote sem derrubar o gravador
+    
+    Se a transação falhar (ex.: "database is locked" com o normalizador
+    gravando), ela é desfeita e os docentes do lote contam como erro. O gravador
+    continua esvaziando a fila, então o scraper nunca fica bloqueado no put.
+    
+    Args:
+        db: Instância do banco de dados
+        lote: Eventos da fila (ver gravar_lote)
+        resumo: Contadores de salvos/erros por instituição (atualizado in-place)
+    """
+    # Contado à parte: só entra no resumo se a transação for confirmada
+    parcial = {}
+    try:
+        gravar_lote(db, lote, parcial)
+    except Exception as e:
+        db.conn.rollback()
+        docentes = [evento for evento in lote if evento[0] == 'docente']
+        for evento in docentes:
+            resumo.setdefault(evento[1], {'salvos': 0, 'erros': 0})['erros'] += 1
+        print(f"\n❌ Erro ao gravar lote de {len(docentes)} docentes no banco: {e}")
+        return
+    
+    for sigla, contagem in parcial.items():
+        total = resumo.setdefault(sigla, {'salvos': 0, 'erros': 0})
+        total['salvos'] += contagem['salvos']
+        total['erros'] += contagem['erros']
+
+
+async def gravar_fila_no_banco(db: Database, fila: asyncio.Queue,
+                               tamanho_lote: int = TAMANHO_LOTE_BANCO) -> Dict[str, Dict[str, int]]:
+    """
+    Consome a fila de detalhes coletados e grava no banco em lotes
+    
+    Encerra ao receber None. Se for cancelado (Ctrl-C), grava o lote pendente e
+    o que ainda estiver na fila antes de sair. Um lote que falhar é contado
+    como erro (gravar_lote_com_tratamento) e a fila continua sendo consumida.
+    
+    Args:
+        db: Instância do banco de dados
+        fila: Fila alimentada pelo scraper com eventos (ver gravar_lote)
+        tamanho_lote: Quantidade de docentes por transação
+    
+    Returns:
+        Dicionário {sigla: {'salvos': N, 'erros': M}}
+    """
+    resumo = {}
+    lote = []
+    
+    try:
+        while True:
+            item = await fila.get()
+            if item is None:
+                break
             
-            if docente_id:
-                salvos_instituicao += 1
-            else:
-                erros_instituicao += 1
+            lote.append(item)
+            if len(lote) >= tamanho_lote:
+                gravar_lote_com_tratamento(db, lote, resumo)
+                lote = []
+    finally:
+        # Não perde o que já foi coletado mas ainda não foi gravado
+        while not fila.empty():
+            item = fila.get_nowait()
+            if item is not None:
+                lote.append(item)
         
-        print(f"   ✅ {sigla}: {salvos_instituicao} salvos, {erros_instituicao} erros")
-        
-        total_salvos += salvos_instituicao
-        total_erros += erros_instituicao
+        if lote:
+            gravar_lote_com_tratamento(db, lote, resumo)
+    
+    return resumo
+
+
+def exibir_resumo_salvamento(resumo: Dict[str, Dict[str, int]]):
+    """
+    Exibe o resumo da gravação no banco
+    
+    Args:
+        resumo: Contadores de salvos/erros por instituição
+    """
+    print(f"\n{'='*70}")
+    print("💾 DADOS SALVOS NO BANCO DE DADOS")
+    print(f"{'='*70}\n")
+    
+    for sigla in sorted(resumo.keys()):
+        contagem = resumo[sigla]
+        print(f"   ✅ {sigla}: {contagem['salvos']} salvos, {contagem['erros']} erros")
+    
+    total_salvos = sum(c['salvos'] for c in resumo.values())
+    total_erros = sum(c['erros'] for c in resumo.values())
     
     print(f"\n📊 RESUMO DO SALVAMENTO:")
     print(f"   ✅ Total salvos: {total_salvos}")
     print(f"   ❌ Total com erro: {total_erros}")
 
 
+def tratar_removidos(todas_stats: dict, db: Database, marcar: bool):
+    """
+    Lista os docentes que estão no banco mas sumiram da listagem da API
+    
+    Args:
+        todas_stats: Estatísticas de coleta (com 'removidos' por instituição)
+        db: Instância do banco de dados
+        marcar: Se True, marca os removidos no banco (removido_em)
+    """
+    removidos = {sigla: stats['removidos'] for sigla, stats in todas_stats.items() if stats.get('removidos')}
+    
+    print(f"\n{'='*70}")
+    print("🗑️  DOCENTES QUE SUMIRAM DA LISTAGEM")
+    print(f"{'='*70}\n")
+    
+    if not removidos:
+        print("   ✅ Nenhum docente removido")
+        return
+    
+    for sigla in sorted(removidos.keys()):
+        slugs = removidos[sigla]
+        amostra = ', '.join(slugs[:5]) + (' ...' if len(slugs) > 5 else '')
+        print(f"   ⚠️  {sigla}: {len(slugs)} ({amostra})")
+    
+    if marcar:
+        total_marcados = sum(db.marcar_removidos(slugs) for slugs in removidos.values())
+        print(f"\n   🪦 {total_marcados} docentes marcados como removidos (dados mantidos no banco)")
+    else:
+        print("\n   💡 Use --marcar-removidos para marcá-los no banco")
+
+
 def exibir_estatisticas_finais(todas_stats: dict, db: Database):
     """
     Exibe estatísticas finais da coleta
@@ -118,17 +268,24 @@ def exibir_estatisticas_finais(todas_stats: dict, db: Database):
     total_pessoas = sum(s['total_pessoas'] for s in todas_stats.values())
     total_docentes_filtrados = sum(s['docentes_filtrados'] for s in todas_stats.values())
     total_detalhes = sum(s['detalhes_coletados'] for s in todas_stats.values())
+    total_inalterados = sum(s['inalterados'] for s in todas_stats.values())
     total_erros = sum(s['erros'] for s in todas_stats.values())
     
     print(f"🎯 Instituições processadas: {total_instituicoes}")
     print(f"👥 Total de pessoas na API: {total_pessoas:,}")
     print(f"👨‍🏫 Docentes identificados: {total_docentes_filtrados:,}")
     print(f"✅ Detalhes coletados: {total_detalhes:,}")
+    if total_inalterados:
+        print(f"🔁 Inalterados (não baixados): {total_inalterados:,}")
+    total_retomados = sum(s['retomados'] for s in todas_stats.values())
+    if total_retomados:
+        print(f"♻️  Já gravados antes da interrupção: {total_retomados:,}")
     print(f"❌ Erros durante coleta: {total_erros}")
     
-    # Taxa de sucesso
-    if total_docentes_filtrados > 0:
-        taxa_sucesso = (total_detalhes / total_docentes_filtrados) * 100
+    # Taxa de sucesso (sobre o que precisava ser baixado)
+    total_a_coletar = total_docentes_filtrados - total_inalterados - total_retomados
+    if total_a_coletar > 0:
+        taxa_sucesso = (total_detalhes / total_a_coletar) * 100
         print(f"📈 Taxa de sucesso: {taxa_sucesso:.1f}%")
     
     # Estatísticas do banco
@@ -168,8 +325,9 @@ def exibir_estatisticas_finais(todas_stats: dict, db: Database):
             problemas_encontrados = True
         
         # Taxa de coleta de detalhes muito baixa
-        if stats['docentes_filtrados'] > 0:
-            taxa = (stats['detalhes_coletados'] / stats['docentes_filtrados']) * 100
+        a_coletar = stats['docentes_filtrados'] - stats['inalterados'] - stats['retomados']
+        if a_coletar > 0:
+            taxa = (stats['detalhes_coletados'] / a_coletar) * 100
             if taxa < 90:
                 print(f"   ⚠️  {sigla}: Taxa de coleta {taxa:.1f}% - alguns detalhes não foram coletados")
                 problemas_encontrados = True
@@ -200,7 +358,9 @@ async def main():
     print(f"🕐 Início: {timestamp_inicio}\n")
     
     # Parse argumentos
-    siglas_selecionadas = parse_arguments()
+    siglas_selecionadas, opcoes = parse_arguments()
+    incremental = '--incremental' in opcoes
+    retomar = '--resume' in opcoes
     
     if siglas_selecionadas:
         print(f"🎯 Modo: Coleta SELETIVA")
@@ -209,21 +369,67 @@ async def main():
         print(f"🎯 Modo: Coleta COMPLETA")
         print(f"📋 Instituições: Todas as {len(INSTITUICOES)} da Rede Federal")
     
+    if incremental:
+        print(f"🔁 Incremental: só docentes novos ou atualizados desde a última coleta")
+    if retomar:
+        print(f"♻️  Retomando a coleta anterior a partir dos checkpoints")
+    
     print(f"\n⏳ Iniciando coleta...\n")
     
     # Inicializa banco de dados
     print("💾 Inicializando banco de dados...")
     init_database()
     
-    # Executa scraping
+    # Executa scraping gravando no banco à medida que os detalhes chegam
     try:
-        todos_resultados, todas_stats = await scrape_multiplas_instituicoes(siglas_selecionadas)
-        
-        # Salva no banco
         db = Database()
         db.connect()
         
-        salvar_resultados_no_banco(db, todos_resultados, todas_stats)
+        # Cache HTTP: currículos que não mudaram não são baixados de novo
+        cache = None
+        if USAR_CACHE_HTTP:
+            cache = CacheHttp()
+            cache.connect()
+        
+        siglas_coleta = siglas_selecionadas or list(INSTITUICOES.keys())
+        
+        # Coleta incremental: carimbos de atualização já gravados, por instituição
+        conhecidos_por_sigla = None
+        if incremental:
+            conhecidos_por_sigla = {sigla: db.get_carimbos_by_sigla(sigla) for sigla in siglas_coleta}
+        
+        # Checkpoints: retomados com --resume, descartados em uma coleta nova
+        checkpoints_por_sigla = None
+        if retomar:
+            checkpoints_por_sigla = {sigla: db.get_checkpoint(sigla) for sigla in siglas_coleta}
+        else:
+            db.limpar_checkpoints(siglas_coleta)
+        
+        fila = asyncio.Queue(maxsize=TAMANHO_FILA_RESULTADOS)
+        gravador = asyncio.create_task(gravar_fila_no_banco(db, fila))
+        
+        try:
+            _, todas_stats = await scrape_multiplas_instituicoes(
+                siglas_selecionadas, fila, cache, conhecidos_por_sigla, checkpoints_por_sigla
+            )
+            
+            if cache and DIAS_CACHE_HTTP is not None:
+                removidas = cache.podar(DIAS_CACHE_HTTP)
+                if removidas:
+                    print(f"🧹 Cache HTTP: {removidas:,} entradas sem uso há mais de {DIAS_CACHE_HTTP} dias removidas")
+        finally:
+            # Sinaliza o fim da coleta e espera o gravador esvaziar a fila
+            if not gravador.done():
+                await fila.put(None)
+            resumo_salvamento = await gravador
+            
+            if cache:
+                cache.close()
+        
+        exibir_resumo_salvamento(resumo_salvamento)
+        
+        if incremental:
+            tratar_removidos(todas_stats, db, '--marcar-removidos' in opcoes)
         
         # Exibe estatísticas finais
         exibir_estatisticas_finais(todas_stats, db)
@@ -248,10 +454,11 @@ async def main():
         print("   2. Execute 'python visualizar_banco.py' para ver estatísticas detalhadas")
         print("   3. Execute 'python comparar_totais.py' para validar a coleta")
         print("")
-        
-    except KeyboardInterrupt:
+    
+    except (KeyboardInterrupt, asyncio.CancelledError):
         print("\n\n⚠️  Coleta interrompida pelo usuário!")
-        print("💾 Dados já coletados foram salvos no banco.\n")
+        print("💾 Dados já coletados foram salvos no banco.")
+        print("💡 Para continuar de onde parou: python main.py --resume\n")
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ ERRO FATAL: {e}")
@@ -2,10 +2,410 @@
 """
 NORMALIZER DEFINITIVO - Versão Final
 Trata TODAS as variações e NUNCA quebra
+
+Uso:
+    python normalizer_definitivo.py                 # Renormaliza todos os docentes
+    python normalizer_definitivo.py --incremental   # Só docentes novos ou alterados
+    python normalizer_definitivo.py --processos 4   # Número de processos de extração
+
+O que é extraído de cada currículo está declarado em ESPECIFICACOES (ver
+extracao.py): todas as tabelas derivadas, incluindo orientações e projetos,
+saem de uma única decodificação do JSON por docente. Tabelas extras podem
+ser plugadas por EXTRATORES_NORMALIZACAO (config.py). A extração
+(descompactação + decodificação via codec.py + EXTRACAO.extrair) roda em um
+pool de processos, lote a lote; o processo principal recebe as linhas prontas
+e é o único que grava no banco.
+
+A coluna detalhes de producao_bibliografica segue DETALHES_PRODUCAO (config.py);
+resolver_detalhes devolve o registro da produção em qualquer um dos modos.
 """
 
-import json
-from database import Database
+import importlib
+import os
+import sqlite3
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from config import (
+    CAMPOS_DETALHES_PRODUCAO,
+    DECODIFICACAO_SELETIVA,
+    DETALHES_PRODUCAO,
+    EXTRATORES_NORMALIZACAO,
+    LOTE_NORMALIZACAO,
+    PROCESSOS_NORMALIZACAO,
+)
+from codec import ERROS_DECODIFICACAO, dumps, loads
+from database import INDICES_NORMALIZADOS, VERSAO_ESQUEMA, Database, decodificar_data_completa
+from esquema_lattes import decodificar_curriculo
+from extracao import (
+    Acessor,
+    EspecificacaoTabela,
+    bruto,
+    compilar,
+    fixo,
+    inteiro,
+    ler_chave,
+    para_texto,
+    texto,
+)
+
+
+def contar_coautores(registro: dict, pilha: list) -> tuple:
+    """Retorna (num, lista) dos autores da produção"""
+    autores = registro.get('autores', [])
+    if not isinstance(autores, list):
+        return (0, '')
+    nomes = []
+    for aut in autores:
+        if isinstance(aut, dict):
+            nome = aut.get('nomeCompletoDoAutor') or aut.get('nomeParaCitacao', '')
+            if nome:
+                nomes.append(str(nome))
+    return (len(nomes), '; '.join(nomes))
+
+
+def resumo_cv(registro: dict, pilha: list) -> str:
+    """Resumo do currículo (resumoCv pode vir como dict ou texto)"""
+    resumo = ler_chave(registro, ('dadosGerais', 'resumoCv'))
+    if resumo is None:
+        return ''
+    if isinstance(resumo, dict):
+        return para_texto(resumo.get('textoResumoCvRh', ''))
+    return para_texto(resumo)
+
+
+def palavras_chave(registro: dict, pilha: list) -> str:
+    """Palavras-chave: texto direto, lista ou dict palavraChave1..9"""
+    pk = registro.get('palavrasChave')
+    if isinstance(pk, str):
+        # STRING direta!
+        return pk.strip()
+    if isinstance(pk, list):
+        return ', '.join([str(p) for p in pk if p])
+    if isinstance(pk, dict):
+        plist = []
+        for i in range(1, 10):
+            p = pk.get(f'palavraChave{i}')
+            if p and str(p).strip():
+                plist.append(str(p).strip())
+        return ', '.join(plist)
+    return ''
+
+
+def titulo_ou_id(chave: str) -> Acessor:
+    """Título da produção, ou um marcador com o id quando vier vazio"""
+    def ler(registro, pilha):
+        titulo = para_texto(registro.get(chave))
+        return titulo or f"[Sem título - ID: {registro.get('id', 'N/A')}]"
+    return ler
+
+
+def detalhes_json(registro: dict, pilha: list) -> str:
+    """Registro completo da produção, em JSON"""
+    return dumps(registro)
+
+
+def sem_vazios(valor):
+    """Remove dos dicts (em qualquer nível) as chaves com None ou ''"""
+    if isinstance(valor, dict):
+        return {chave: sem_vazios(v) for chave, v in valor.items() if v is not None and v != ''}
+    if isinstance(valor, list):
+        return [sem_vazios(item) for item in valor]
+    return valor
+
+
+def detalhes_resumidos(registro: dict, pilha: list) -> str:
+    """Só as chaves de CAMPOS_DETALHES_PRODUCAO da produção, sem valores vazios, em JSON"""
+    return dumps(sem_vazios({chave: registro[chave] for chave in CAMPOS_DETALHES_PRODUCAO if chave in registro}))
+
+
+def referencia_producao(registro: dict, pilha: list) -> str:
+    """
+    Referência da produção dentro do data_completa do docente (ver resolver_detalhes)
+    
+    sequenciaProducao é única no currículo; sem ela, vale o id do registro (único
+    por tipo). Sem nenhum dos dois, o registro inteiro em JSON.
+    """
+    sequencia = registro.get('sequenciaProducao')
+    if sequencia is not None and sequencia != '':
+        return f"seq:{sequencia}"
+    if registro.get('id') is not None:
+        return f"id:{registro['id']}"
+    return dumps(registro)
+
+
+# {DETALHES_PRODUCAO: acessor da coluna detalhes}
+MODOS_DETALHES = {
+    'referencia': referencia_producao,
+    'resumido': detalhes_resumidos,
+    'completo': detalhes_json,
+}
+
+if DETALHES_PRODUCAO not in MODOS_DETALHES:
+    raise ValueError(f"DETALHES_PRODUCAO desconhecido: {DETALHES_PRODUCAO} (use {', '.join(MODOS_DETALHES)})")
+
+
+def tipo_outras_orientacoes(registro: dict, pilha: list) -> str:
+    """Tipo das 'outras orientações', pela natureza"""
+    nat = str(ler_chave(registro, ('dadosBasicosDeOutrasOrientacoesConcluidas', 'natureza')) or '').lower()
+    if 'iniciacao' in nat:
+        return 'Iniciação Científica'
+    if 'tcc' in nat or 'graduacao' in nat:
+        return 'TCC/Graduação'
+    return 'Outros'
+
+
+def integrantes_do_projeto(projeto: dict) -> list:
+    """Integrantes da equipe do projeto (item único vira lista)"""
+    integrantes = ler_chave(projeto, ('equipeDoProjeto', 'integrantesDoProjeto')) or []
+    if not isinstance(integrantes, list):
+        integrantes = [integrantes]
+    return integrantes
+
+
+def coordenador_do_projeto(registro: dict, pilha: list) -> str:
+    """SIM se algum integrante for o responsável pelo projeto"""
+    for integrante in integrantes_do_projeto(registro):
+        if integrante.get('flagResponsavel') == 'SIM':
+            return 'SIM'
+    return 'NAO'
+
+
+def contagem(chave: str) -> Acessor:
+    """Contagem do registro (0 se ausente)"""
+    return lambda registro, pilha: int(registro.get(chave, 0) or 0)
+
+
+def colunas_producao(tipo: str, titulo: str, ano: str, veiculo: str) -> list:
+    """Colunas de producao_bibliografica (as produções só mudam os nomes das chaves)"""
+    return [
+        ('tipo', fixo(tipo)),
+        ('titulo', titulo_ou_id(titulo)),
+        ('ano', inteiro(ano)),
+        ('revista_evento_editora', texto(veiculo)),
+        (('num_coautores', 'lista_coautores'), contar_coautores),
+        ('detalhes', MODOS_DETALHES[DETALHES_PRODUCAO]),
+    ]
+
+
+def colunas_orientacao(sufixo: str, tipo: Acessor) -> list:
+    """Colunas de orientacoes_concluidas (cada tipo tem suas chaves detalhamento*/dadosBasicos*)"""
+    detalhamento = 'detalhamento' + sufixo
+    dados_basicos = 'dadosBasicos' + sufixo
+    return [
+        ('nome_orientado', texto((detalhamento, 'nomeDoOrientado'))),
+        ('tipo_orientacao', tipo),
+        ('curso', texto((detalhamento, 'nomeDoCurso'))),
+        ('instituicao', texto((detalhamento, 'nomeDaInstituicao'))),
+        ('titulo', texto((dados_basicos, 'titulo'))),
+        ('ano', inteiro((dados_basicos, 'ano'))),
+    ]
+
+
+NIVEIS_FORMACAO = {
+    'graduacoes': 'Graduação',
+    'especializacoes': 'Especialização',
+    'mestrados': 'Mestrado',
+    'mestradoProfissional': 'Mestrado Profissional',
+    'doutorado': 'Doutorado',
+    'posDoutorado': 'Pós-Doutorado',
+    'livreDocencia': 'Livre-Docência',
+}
+
+# {lista: (sufixo das chaves, tipo)}
+TIPOS_ORIENTACAO = {
+    'orientacoesConcluidasParaMestrado': ('DaOrientacaoConcluidaDeMestrado', fixo('Mestrado')),
+    'orientacoesConcluidasParaDoutorado': ('DaOrientacaoConcluidaDeDoutorado', fixo('Doutorado')),
+    'orientacoesConcluidasParaPosDoutorado': ('DaOrientacaoConcluidaDePosDoutorado', fixo('Pós-Doutorado')),
+    'outrasOrientacoesConcluidas': ('DeOutrasOrientacoesConcluidas', tipo_outras_orientacoes),
+}
+
+# O que é extraído de cada currículo: caminho até os registros + colunas de cada tabela
+ESPECIFICACOES = [
+    EspecificacaoTabela('dados_gerais', (), [
+        ('nome_completo', texto(('dadosGerais', 'nomeCompleto'))),
+        ('nome_citacao', texto(('dadosGerais', 'nomeEmCitacoesBibliograficas'))),
+        ('orcid', texto(('dadosGerais', 'orcidId'))),
+        ('resumo_cv', resumo_cv),
+        ('lattes_url', texto('lattesUrl')),
+        ('palavras_chave', palavras_chave),
+    ], condicao=(('nome_completo', 'nome_citacao'), lambda nome, citacao: bool(nome or citacao))),
+    
+    *[EspecificacaoTabela('formacoes', ('dadosGerais', 'formacaoAcademicaTitulacao', campo, '*'), [
+        ('nivel', fixo(nivel)),
+        ('curso', texto('nomeCurso', 'curso')),
+        ('instituicao', texto('nomeInstituicao', 'instituicao')),
+        ('ano_inicio', inteiro('anoDeInicio', 'anoInicio')),
+        ('ano_fim', inteiro('anoDeConclusao', 'anoFim')),
+        ('titulo', texto('tituloDaMonografia', 'tituloDaDissertacaoTese')),
+        ('orientador', texto('nomeDoOrientador')),
+    ]) for campo, nivel in NIVEIS_FORMACAO.items()],
+    
+    EspecificacaoTabela('atuacoes', ('dadosGerais', 'atuacoesProfissionais', 'atuacaoProfissional', '*'), [
+        ('instituicao', texto('nomeInstituicao')),
+        ('funcao', texto('atividades')),
+        ('tipo_vinculo', texto('vinculo')),
+        ('ano_inicio', inteiro('anoInicio')),
+        ('ano_fim', inteiro('anoFim')),
+    ]),
+    
+    # Artigos e trabalhos vêm como [{artigoPublicado: [...]}] ou [[...]]
+    EspecificacaoTabela('producao_bibliografica',
+                        ('producaoBibliografica', 'artigosPublicados', '*', 'artigoPublicado?', '*'),
+                        colunas_producao('Artigo', 'tituloDoArtigo', 'anoDoArtigo', 'tituloDoPeriodicoOuRevista')),
+    EspecificacaoTabela('producao_bibliografica',
+                        ('producaoBibliografica', 'trabalhosEmEventos', '*', 'trabalhoEmEventos?', '*'),
+                        colunas_producao('Trabalho em Evento', 'tituloDoTrabalho', 'anoDoTrabalho', 'nomeDoEvento')),
+    EspecificacaoTabela('producao_bibliografica',
+                        ('producaoBibliografica', 'livrosECapitulos', '*', 'livrosPublicadosOuOrganizados', '*'),
+                        colunas_producao('Livro', 'tituloDoLivro', 'anoDoLivro', 'nomeEditora')),
+    EspecificacaoTabela('producao_bibliografica',
+                        ('producaoBibliografica', 'livrosECapitulos', '*', 'capitulosDeLivrosPublicados', '*'),
+                        colunas_producao('Capítulo de Livro', 'tituloDoCapituloDoLivro', 'anoDoCapitulo', 'nomeEditora')),
+    
+    *[EspecificacaoTabela('orientacoes_concluidas', ('outraProducao', 'orientacoesConcluidas', '*', campo, '*'),
+                          colunas_orientacao(sufixo, tipo))
+      for campo, (sufixo, tipo) in TIPOS_ORIENTACAO.items()],
+    
+    EspecificacaoTabela('premios_titulos', ('dadosGerais', 'premiosTitulos', 'premioTitulo', '*'), [
+        ('nome', texto('nomeDoPremioOuTitulo')),
+        ('ano', inteiro('ano')),
+        ('instituicao', texto('nomeEntidadePromotora')),
+    ], condicao=(('nome',), bool)),
+    
+    EspecificacaoTabela('areas_atuacao', ('dadosGerais', 'areasDeAtuacao', 'areaDeAtuacao', '*'), [
+        ('grande_area', texto('nomeGrandeAreaDoConhecimento')),
+        ('area', texto('nomeDaAreaDoConhecimento')),
+        ('subarea', texto('nomeDaSubAreaDoConhecimento')),
+        ('especialidade', texto('nomeDaEspecialidade')),
+    ]),
+    
+    # Projetos ficam em atuações > atividades > participações; em cada nível
+    # o Lattes manda uma lista ou um item único
+    EspecificacaoTabela('projetos', (
+        'dadosGerais', 'atuacoesProfissionais', 'atuacaoProfissional', '*?',
+        'atividadesDeParticipacaoEmProjeto', '*?', 'participacaoEmProjeto', '*?',
+        'projetoDePesquisa', '*?',
+    ), [
+        ('nome', bruto('nomeDoProjeto', '')),
+        ('natureza', bruto('natureza', '')),
+        ('situacao', bruto('situacao', '')),
+        ('ano_inicio', bruto('anoInicio', '')),
+        ('ano_fim', bruto('anoFim', '')),
+        ('descricao', bruto('descricaoDoProjeto', '')),
+        ('instituicao', bruto('nomeOrgao', '', acima=1)),
+        ('orgao', bruto('codigoOrgao', '', acima=1)),
+        ('flag_coordenador', coordenador_do_projeto),
+        ('num_integrantes', lambda registro, pilha: len(integrantes_do_projeto(registro))),
+        ('num_alunos_graduacao', contagem('numeroGraduacao')),
+        ('num_alunos_mestrado', contagem('numeroMestradoAcademico')),
+        ('num_alunos_doutorado', contagem('numeroDoutorado')),
+    ]),
+]
+
+
+def carregar_extratores(modulos: Iterable[str]) -> Tuple[List[EspecificacaoTabela], List[str]]:
+    """
+    Importa os extratores extras (plugins) listados em EXTRATORES_NORMALIZACAO
+    
+    Cada módulo define ESPECIFICACOES (lista de EspecificacaoTabela, com tabelas
+    próprias ou já existentes) e, se criar tabelas, ESQUEMA (comandos
+    CREATE TABLE/INDEX IF NOT EXISTS). As tabelas precisam de uma coluna id_docente.
+    
+    Returns:
+        (especificações, comandos de esquema) de todos os módulos
+    """
+    especificacoes = []
+    esquema = []
+    for nome in modulos:
+        modulo = importlib.import_module(nome)
+        especificacoes.extend(modulo.ESPECIFICACOES)
+        esquema.extend(getattr(modulo, 'ESQUEMA', []))
+    return especificacoes, esquema
+
+
+# Os plugins vêm do config (e não de um registro em tempo de execução) para que
+# os processos do pool, que importam este módulo de novo, vejam as mesmas tabelas
+ESPECIFICACOES_EXTRAS, ESQUEMA_EXTRAS = carregar_extratores(EXTRATORES_NORMALIZACAO)
+ESPECIFICACOES.extend(ESPECIFICACOES_EXTRAS)
+
+# Compilada uma vez por processo (no import)
+EXTRACAO = compilar(ESPECIFICACOES)
+
+# Colunas de cada tabela normalizada, na ordem das linhas geradas
+COLUNAS_NORMALIZADAS = EXTRACAO.colunas
+
+# Tabelas limpas e recriadas pela normalização (as de database.py + as dos plugins)
+TABELAS_EXTRAIDAS = tuple(COLUNAS_NORMALIZADAS)
+
+# Mesmos caminhos das produções, mas devolvendo (tipo, registro): resolve as
+# referências da coluna detalhes (a coluna tipo é sempre a primeira, ver colunas_producao)
+EXTRACAO_REGISTROS_PRODUCAO = compilar([
+    EspecificacaoTabela('registros', espec.caminho, [espec.colunas[0], ('registro', lambda registro, pilha: registro)])
+    for espec in ESPECIFICACOES if espec.tabela == 'producao_bibliografica'
+])
+
+
+def registros_de_producao(data: dict) -> List[Tuple[str, dict]]:
+    """(tipo, registro) de cada produção do currículo, na ordem das linhas de producao_bibliografica"""
+    return [(tipo, registro) for _, tipo, registro in EXTRACAO_REGISTROS_PRODUCAO.extrair(0, data)['registros']]
+
+
+def resolver_detalhes(db: Database, id_docente: int, tipo: str, detalhes: Optional[str]) -> Optional[dict]:
+    """
+    Registro de uma produção a partir da coluna detalhes, em qualquer DETALHES_PRODUCAO
+    
+    JSON (modos "completo" e "resumido") é só decodificado; uma referência é
+    buscada no data_completa do docente, decodificado apenas aqui, sob demanda.
+    
+    Args:
+        db: Banco conectado
+        id_docente, tipo, detalhes: Colunas da linha de producao_bibliografica
+    
+    Returns:
+        O registro, ou None se a produção não estiver mais no currículo gravado
+    """
+    if not detalhes:
+        return None
+    if not detalhes.startswith(('seq:', 'id:')):
+        return loads(detalhes)
+    
+    data = db.get_docente_data_completa(id_docente)
+    if data is None:
+        return None
+    
+    for tipo_registro, registro in registros_de_producao(data):
+        if tipo_registro == tipo and referencia_producao(registro, []) == detalhes:
+            return registro
+    return None
+
+
+# Decodificação usada na extração: só as partes de esquema_lattes.py, exceto com
+# extratores extras, que podem ler chaves fora do esquema
+if DECODIFICACAO_SELETIVA and not ESPECIFICACOES_EXTRAS:
+    decodificar_para_extracao = decodificar_curriculo
+else:
+    decodificar_para_extracao = decodificar_data_completa
+
+# Um INSERT por tabela: o esquema é garantido pelas migrações (ver garantir_esquema)
+SQL_INSERCAO = {
+    tabela: f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES ({', '.join('?' * len(colunas))})"
+    for tabela, colunas in COLUNAS_NORMALIZADAS.items()
+}
+
+# Contador de self.stats incrementado para cada docente com linhas na tabela
+ESTATISTICA_POR_TABELA = {
+    'dados_gerais': 'com_dados_gerais',
+    'formacoes': 'com_formacoes',
+    'atuacoes': 'com_atuacoes',
+    'producao_bibliografica': 'com_producoes',
+    'orientacoes_concluidas': 'com_orientacoes',
+    'premios_titulos': 'com_premios',
+    'areas_atuacao': 'com_areas',
+    'projetos': 'com_projetos',
+}
 
 
 class NormalizerDefinitivo:
@@ -22,614 +422,178 @@ class NormalizerDefinitivo:
             'com_orientacoes': 0,
             'com_premios': 0,
             'com_areas': 0,
+            'com_projetos': 0,
             'erros_json': 0,
+            'linhas_com_erro': 0,
         }
         
-        self.siglas_ifs = {
-            # 'IFAC', 'IFAL', 'IFAP', 'IFAM', 'IFBA', 'IFBAIANO', 'IFB', 'IFCE', 'IFES',
-            # 'IFG', 'IFGOIANO', 'IFMA', 'IFMG', 'IFNMG', 'IFSUDESTEMG', 'IFSULDEMINAS',
-            # 'IFTM', 'IFMT', 'IFMS', 'IFPA', 'IFPB', 'IFPE', 'IFSERTAOPE', 'IFPI',
-            # 'IFPR', 'IFRJ', 'IFFLUMINENSE', 'IFRN', 'IFRO', 'IFRR', 'IFRS',
-            # 'IFFARROUPILHA', 'IFSUL', 'IFSC', 'IFC', 'IFSP', 'IFS', 'IFTO',
-            # 'CEFET-RJ', 'CEFET-MG', 'CEFET RJ', 'CEFET MG', 'CEFET'
-            'Instituto Federal de Brasília'
-        }
+        self.esquema_verificado = False
     
-    def safe_get(self, data, *keys, default=None):
-        """Acessa chaves com máxima segurança"""
-        if not isinstance(data, dict):
-            return default
+    def extrair_docente(self, docente_id: int, data: dict) -> Dict[str, List[tuple]]:
+        """
+        Extrai as linhas de todas as tabelas de um docente, sem tocar no banco
         
-        result = data
-        for key in keys:
-            if not isinstance(result, dict):
-                return default
-            result = result.get(key, default)
-            if result is None:
-                return default
-        return result
-    
-    def to_str(self, value):
-        """Converte para string"""
-        if value is None or value == '':
-            return ''
-        if isinstance(value, (dict, list)):
-            return json.dumps(value, ensure_ascii=False)
-        return str(value).strip()
-    
-    def safe_int(self, value):
-        """Converte para int com segurança"""
-        if value is None:
-            return None
-        try:
-            return int(value)
-        except:
-            return None
-    
-    def get_list_safe(self, data, *keys):
-        """Retorna lista garantida"""
-        result = self.safe_get(data, *keys, default=[])
-        if not isinstance(result, list):
-            return []
-        return result
-    
-    def is_if(self, instituicao: str) -> bool:
-        """Verifica IF/CEFET"""
-        if not instituicao:
-            return False
-        inst_upper = str(instituicao).upper()
-        return any(sigla in inst_upper for sigla in self.siglas_ifs) or \
-               'Instituto Federal' in inst_upper or 'CENTRO FEDERAL' in inst_upper
-    
-    def extract_dados_gerais(self, docente_id: int, data: dict):
-        """Extrai dados gerais"""
-        try:
-            dg = self.safe_get(data, 'dadosGerais', default={})
-            if not dg:
-                return
-            
-            nome = self.to_str(self.safe_get(dg, 'nomeCompleto'))
-            citacao = self.to_str(self.safe_get(dg, 'nomeEmCitacoesBibliograficas'))
-            orcid = self.to_str(self.safe_get(dg, 'orcidId'))
-            
-            resumo_dict = self.safe_get(dg, 'resumoCv', default={})
-            if isinstance(resumo_dict, dict):
-                resumo = self.to_str(resumo_dict.get('textoResumoCvRh', ''))
-            else:
-                resumo = self.to_str(resumo_dict)
-            
-            lattes = self.to_str(self.safe_get(data, 'lattesUrl'))
-            
-            palavras = ''
-            try:
-                pk = data.get('palavrasChave')
-                if isinstance(pk, str):
-                    # STRING direta!
-                    palavras = pk.strip()
-                elif isinstance(pk, list):
-                    palavras = ', '.join([str(p) for p in pk if p])
-                elif isinstance(pk, dict):
-                    plist = []
-                    for i in range(1, 10):
-                        p = pk.get(f'palavraChave{i}')
-                        if p and str(p).strip():
-                            plist.append(str(p).strip())
-                    palavras = ', '.join(plist)
-            except:
-                pass
-            
-            if nome or citacao:
-                try:
-                    self.db.cursor.execute("""
-                        INSERT INTO dados_gerais 
-                        (id_docente, nome_completo, nome_citacao, orcid, resumo_cv, lattes_url, palavras_chave)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (docente_id, nome, citacao, orcid, resumo, lattes, palavras))
-                except:
-                    try:
-                        self.db.cursor.execute("""
-                            INSERT INTO dados_gerais 
-                            (id_docente, nome_completo, nome_citacao, orcid, resumo_cv)
-                            VALUES (?, ?, ?, ?, ?)
-                        """, (docente_id, nome, citacao, orcid, resumo))
-                    except:
-                        pass
-                
-                self.stats['com_dados_gerais'] += 1
-        except:
-            pass
-    
-    def extract_formacoes(self, docente_id: int, data: dict):
-        """Extrai formações"""
-        try:
-            form_dict = self.safe_get(data, 'dadosGerais', 'formacaoAcademicaTitulacao', default={})
-            if not isinstance(form_dict, dict):
-                return
-            
-            count = 0
-            tipos = {
-                'graduacoes': 'Graduação',
-                'especializacoes': 'Especialização',
-                'mestrados': 'Mestrado',
-                'mestradoProfissional': 'Mestrado Profissional',
-                'doutorado': 'Doutorado',
-                'posDoutorado': 'Pós-Doutorado',
-                'livreDocencia': 'Livre-Docência',
-            }
-            
-            for campo, nivel in tipos.items():
-                formacoes = self.get_list_safe(form_dict, campo)
-                
-                for form in formacoes:
-                    if not isinstance(form, dict):
-                        continue
-                    
-                    curso = self.to_str(form.get('nomeCurso') or form.get('curso'))
-                    inst = self.to_str(form.get('nomeInstituicao') or form.get('instituicao'))
-                    ano_i = self.safe_int(form.get('anoDeInicio') or form.get('anoInicio'))
-                    ano_f = self.safe_int(form.get('anoDeConclusao') or form.get('anoFim'))
-                    tit = self.to_str(form.get('tituloDaMonografia') or form.get('tituloDaDissertacaoTese'))
-                    ori = self.to_str(form.get('nomeDoOrientador'))
-                    
-                    try:
-                        self.db.cursor.execute("""
-                            INSERT INTO formacoes 
-                            (id_docente, nivel, curso, instituicao, ano_inicio, ano_fim, titulo, orientador)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (docente_id, nivel, curso, inst, ano_i, ano_f, tit, ori))
-                        count += 1
-                    except:
-                        pass
-            
-            if count > 0:
-                self.stats['com_formacoes'] += 1
-        except:
-            pass
+        Args:
+            docente_id: ID do docente
+            data: data_completa já decodificado
+        
+        Returns:
+            Dict {tabela: [tuplas na ordem de COLUNAS_NORMALIZADAS[tabela]]}
+        """
+        return EXTRACAO.extrair(docente_id, data)
     
-    def contar_coautores(self, autores) -> tuple:
-        """Retorna (num, lista)"""
-        try:
-            if not isinstance(autores, list):
-                return (0, '')
-            nomes = []
-            for aut in autores:
-                if isinstance(aut, dict):
-                    nome = aut.get('nomeCompletoDoAutor') or aut.get('nomeParaCitacao', '')
-                    if nome:
-                        nomes.append(str(nome))
-            return (len(nomes), '; '.join(nomes))
-        except:
-            return (0, '')
-    
-    def extract_producoes(self, docente_id: int, data: dict):
-        """Extrai produções - TODAS as variações"""
-        try:
-            prod = self.safe_get(data, 'producaoBibliografica', default={})
-            if not isinstance(prod, dict):
-                return
-            
-            count = 0
-            
-            # ARTIGOS
-            try:
-                artigos_list = self.get_list_safe(prod, 'artigosPublicados')
-                
-                # Pode ser: [{}] ou [[]] ou []
-                for item in artigos_list:
-                    if isinstance(item, dict):
-                        # Estrutura: [{artigoPublicado: [...]}]
-                        arts = self.get_list_safe(item, 'artigoPublicado')
-                        for art in arts:
-                            if not isinstance(art, dict):
-                                continue
-                            
-                            tit = self.to_str(art.get('tituloDoArtigo'))
-                            if not tit:
-                                tit = f"[Sem título - ID: {art.get('id', 'N/A')}]"
-                            
-                            ano = self.safe_int(art.get('anoDoArtigo'))
-                            rev = self.to_str(art.get('tituloDoPeriodicoOuRevista'))
-                            num, lista = self.contar_coautores(art.get('autores', []))
-                            
-                            try:
-                                self.db.cursor.execute("""
-                                    INSERT INTO producao_bibliografica 
-                                    (id_docente, tipo, titulo, ano, revista_evento_editora, num_coautores, lista_coautores, detalhes)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                                """, (docente_id, 'Artigo', tit, ano, rev, num, lista, json.dumps(art, ensure_ascii=False)))
-                                count += 1
-                            except:
-                                try:
-                                    self.db.cursor.execute("""
-                                        INSERT INTO producao_bibliografica 
-                                        (id_docente, tipo, titulo, ano, detalhes)
-                                        VALUES (?, ?, ?, ?, ?)
-                                    """, (docente_id, 'Artigo', tit, ano, json.dumps(art, ensure_ascii=False)))
-                                    count += 1
-                                except:
-                                    pass
-                    
-                    elif isinstance(item, list):
-                        # Estrutura: [[{...}]] - lista dentro de lista!
-                        for art in item:
-                            if not isinstance(art, dict):
-                                continue
-                            
-                            tit = self.to_str(art.get('tituloDoArtigo'))
-                            if not tit:
-                                tit = f"[Sem título - ID: {art.get('id', 'N/A')}]"
-                            
-                            ano = self.safe_int(art.get('anoDoArtigo'))
-                            rev = self.to_str(art.get('tituloDoPeriodicoOuRevista'))
-                            num, lista = self.contar_coautores(art.get('autores', []))
-                            
-                            try:
-                                self.db.cursor.execute("""
-                                    INSERT INTO producao_bibliografica 
-                                    (id_docente, tipo, titulo, ano, revista_evento_editora, num_coautores, lista_coautores, detalhes)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                                """, (docente_id, 'Artigo', tit, ano, rev, num, lista, json.dumps(art, ensure_ascii=False)))
-                                count += 1
-                            except:
-                                try:
-                                    self.db.cursor.execute("""
-                                        INSERT INTO producao_bibliografica 
-                                        (id_docente, tipo, titulo, ano, detalhes)
-                                        VALUES (?, ?, ?, ?, ?)
-                                    """, (docente_id, 'Artigo', tit, ano, json.dumps(art, ensure_ascii=False)))
-                                    count += 1
-                                except:
-                                    pass
-            except:
-                pass
-            
-            # TRABALHOS EM EVENTOS (mesmo padrão)
-            try:
-                trab_list = self.get_list_safe(prod, 'trabalhosEmEventos')
-                
-                for item in trab_list:
-                    if isinstance(item, dict):
-                        trabs = self.get_list_safe(item, 'trabalhoEmEventos')
-                        for trab in trabs:
-                            if not isinstance(trab, dict):
-                                continue
-                            
-                            tit = self.to_str(trab.get('tituloDoTrabalho'))
-                            if not tit:
-                                tit = f"[Sem título - ID: {trab.get('id', 'N/A')}]"
-                            
-                            ano = self.safe_int(trab.get('anoDoTrabalho'))
-                            evt = self.to_str(trab.get('nomeDoEvento'))
-                            num, lista = self.contar_coautores(trab.get('autores', []))
-                            
-                            try:
-                                self.db.cursor.execute("""
-                                    INSERT INTO producao_bibliografica 
-                                    (id_docente, tipo, titulo, ano, revista_evento_editora, num_coautores, lista_coautores, detalhes)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                                """, (docente_id, 'Trabalho em Evento', tit, ano, evt, num, lista, json.dumps(trab, ensure_ascii=False)))
-                                count += 1
-                            except:
-                                try:
-                                    self.db.cursor.execute("""
-                                        INSERT INTO producao_bibliografica 
-                                        (id_docente, tipo, titulo, ano, detalhes)
-                                        VALUES (?, ?, ?, ?, ?)
-                                    """, (docente_id, 'Trabalho em Evento', tit, ano, json.dumps(trab, ensure_ascii=False)))
-                                    count += 1
-                                except:
-                                    pass
-                    
-                    elif isinstance(item, list):
-                        for trab in item:
-                            if not isinstance(trab, dict):
-                                continue
-                            
-                            tit = self.to_str(trab.get('tituloDoTrabalho'))
-                            if not tit:
-                                tit = f"[Sem título - ID: {trab.get('id', 'N/A')}]"
-                            
-                            ano = self.safe_int(trab.get('anoDoTrabalho'))
-                            evt = self.to_str(trab.get('nomeDoEvento'))
-                            num, lista = self.contar_coautores(trab.get('autores', []))
-                            
-                            try:
-                                self.db.cursor.execute("""
-                                    INSERT INTO producao_bibliografica 
-                                    (id_docente, tipo, titulo, ano, revista_evento_editora, num_coautores, lista_coautores, detalhes)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                                """, (docente_id, 'Trabalho em Evento', tit, ano, evt, num, lista, json.dumps(trab, ensure_ascii=False)))
-                                count += 1
-                            except:
-                                try:
-                                    self.db.cursor.execute("""
-                                        INSERT INTO producao_bibliografica 
-                                        (id_docente, tipo, titulo, ano, detalhes)
-                                        VALUES (?, ?, ?, ?, ?)
-                                    """, (docente_id, 'Trabalho em Evento', tit, ano, json.dumps(trab, ensure_ascii=False)))
-                                    count += 1
-                                except:
-                                    pass
-            except:
-                pass
-            
-            # LIVROS E CAPÍTULOS
-            try:
-                livros_list = self.get_list_safe(prod, 'livrosECapitulos')
-                
-                for item in livros_list:
-                    if isinstance(item, dict):
-                        # Livros
-                        livros = self.get_list_safe(item, 'livrosPublicadosOuOrganizados')
-                        for liv in livros:
-                            if not isinstance(liv, dict):
-                                continue
-                            
-                            tit = self.to_str(liv.get('tituloDoLivro'))
-                            if not tit:
-                                tit = f"[Sem título - ID: {liv.get('id', 'N/A')}]"
-                            
-                            ano = self.safe_int(liv.get('anoDoLivro'))
-                            edit = self.to_str(liv.get('nomeEditora'))
-                            num, lista = self.contar_coautores(liv.get('autores', []))
-                            
-                            try:
-                                self.db.cursor.execute("""
-                                    INSERT INTO producao_bibliografica 
-                                    (id_docente, tipo, titulo, ano, revista_evento_editora, num_coautores, lista_coautores, detalhes)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                                """, (docente_id, 'Livro', tit, ano, edit, num, lista, json.dumps(liv, ensure_ascii=False)))
-                                count += 1
-                            except:
-                                try:
-                                    self.db.cursor.execute("""
-                                        INSERT INTO producao_bibliografica 
-                                        (id_docente, tipo, titulo, ano, detalhes)
-                                        VALUES (?, ?, ?, ?, ?)
-                                    """, (docente_id, 'Livro', tit, ano, json.dumps(liv, ensure_ascii=False)))
-                                    count += 1
-                                except:
-                                    pass
-                        
-                        # Capítulos
-                        caps = self.get_list_safe(item, 'capitulosDeLivrosPublicados')
-                        for cap in caps:
-                            if not isinstance(cap, dict):
-                                continue
-                            
-                            tit = self.to_str(cap.get('tituloDoCapituloDoLivro'))
-                            if not tit:
-                                tit = f"[Sem título - ID: {cap.get('id', 'N/A')}]"
-                            
-                            ano = self.safe_int(cap.get('anoDoCapitulo'))
-                            edit = self.to_str(cap.get('nomeEditora'))
-                            num, lista = self.contar_coautores(cap.get('autores', []))
-                            
-                            try:
-                                self.db.cursor.execute("""
-                                    INSERT INTO producao_bibliografica 
-                                    (id_docente, tipo, titulo, ano, revista_evento_editora, num_coautores, lista_coautores, detalhes)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                                """, (docente_id, 'Capítulo de Livro', tit, ano, edit, num, lista, json.dumps(cap, ensure_ascii=False)))
-                                count += 1
-                            except:
-                                try:
-                                    self.db.cursor.execute("""
-                                        INSERT INTO producao_bibliografica 
-                                        (id_docente, tipo, titulo, ano, detalhes)
-                                        VALUES (?, ?, ?, ?, ?)
-                                    """, (docente_id, 'Capítulo de Livro', tit, ano, json.dumps(cap, ensure_ascii=False)))
-                                    count += 1
-                                except:
-                                    pass
-            except:
-                pass
-            
-            if count > 0:
-                self.stats['com_producoes'] += 1
-        except:
-            pass
+    def garantir_esquema(self):
+        """
+        Garante, uma vez, que o banco está na VERSAO_ESQUEMA (aplicando as migrações)
+        
+        Com o esquema conhecido, cada tabela é gravada sempre pelo mesmo INSERT
+        de SQL_INSERCAO, sem tentativas e fallbacks por linha.
+        """
+        if self.db.versao_esquema() < VERSAO_ESQUEMA:
+            print("🔧 Banco em uma versão anterior do esquema: aplicando migrações...")
+            self.db.create_tables()
+        
+        # Tabelas dos extratores extras (idempotente: CREATE ... IF NOT EXISTS)
+        for sql in ESQUEMA_EXTRAS:
+            self.db.cursor.execute(sql)
+        self.db.conn.commit()
+        
+        self.esquema_verificado = True
     
-    def extract_atuacoes(self, docente_id: int, data: dict):
-        """Extrai atuações"""
+    def inserir_linhas(self, tabela: str, registros: List[tuple]):
+        """
+        Insere as linhas de uma tabela de uma vez (executemany)
+        
+        O esquema é garantido, mas um valor inválido (ex.: vindo de um extrator
+        extra) ainda pode ser recusado pelo SQLite. Nesse caso o executemany é
+        desfeito (savepoint) e a tabela é gravada linha a linha: perde-se só a
+        linha com erro, não o lote nem a normalização.
+        """
+        if not registros:
+            return
+        
+        cursor = self.db.cursor
+        if not self.db.conn.in_transaction:
+            # Sem transação aberta, o RELEASE do savepoint faria commit no meio do lote
+            cursor.execute("BEGIN")
+        
+        cursor.execute("SAVEPOINT inserir_linhas")
         try:
-            dg = self.safe_get(data, 'dadosGerais', default={})
-            atu_dict = self.safe_get(dg, 'atuacoesProfissionais', default={})
-            atuacoes = self.get_list_safe(atu_dict, 'atuacaoProfissional')
-            
-            count = 0
-            for atu in atuacoes:
-                if not isinstance(atu, dict):
-                    continue
-                
-                inst = self.to_str(self.safe_get(atu, 'nomeInstituicao'))
-                func = self.to_str(self.safe_get(atu, 'atividades'))
-                vinc = self.to_str(self.safe_get(atu, 'vinculo'))
-                ano_i = self.safe_int(atu.get('anoInicio'))
-                ano_f = self.safe_int(atu.get('anoFim'))
-                
-                try:
-                    self.db.cursor.execute("""
-                        INSERT INTO atuacoes 
-                        (id_docente, instituicao, funcao, tipo_vinculo, ano_inicio, ano_fim)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (docente_id, inst, func, vinc, ano_i, ano_f))
-                    count += 1
-                except:
-                    pass
-            
-            if count > 0:
-                self.stats['com_atuacoes'] += 1
-        except:
-            pass
+            cursor.executemany(SQL_INSERCAO[tabela], registros)
+        except sqlite3.Error:
+            cursor.execute("ROLLBACK TO inserir_linhas")
+            self.inserir_linha_a_linha(tabela, registros)
+        cursor.execute("RELEASE inserir_linhas")
     
-    def extract_orientacoes(self, docente_id: int, data: dict):
-        """Extrai orientações - APENAS IFs"""
-        try:
-            op = self.safe_get(data, 'outraProducao', default={})
-            orient_list = self.get_list_safe(op, 'orientacoesConcluidas')
-            
-            count = 0
-            
-            for item in orient_list:
-                if not isinstance(item, dict):
-                    continue
-                
-                tipos = {
-                    'orientacoesConcluidasParaMestrado': 'Mestrado',
-                    'orientacoesConcluidasParaDoutorado': 'Doutorado',
-                    'orientacoesConcluidasParaPosDoutorado': 'Pós-Doutorado',
-                    'outrasOrientacoesConcluidas': 'Outros',
-                }
-                
-                for campo, tipo_ori in tipos.items():
-                    orients = self.get_list_safe(item, campo)
-                    
-                    for ori in orients:
-                        if not isinstance(ori, dict):
-                            continue
-                        
-                        nome_ori = self.to_str(ori.get('nomeDoOrientado'))
-                        curso = self.to_str(ori.get('curso') or ori.get('tipoDeCurso'))
-                        inst = self.to_str(ori.get('nomeDoInstituicao') or ori.get('instituicao'))
-                        
-                        # FILTRO: Apenas IFs
-                        if not self.is_if(inst):
-                            continue
-                        
-                        tit = self.to_str(ori.get('titulo'))
-                        ano = self.safe_int(ori.get('ano'))
-                        
-                        tipo_final = tipo_ori
-                        if tipo_ori == 'Outros':
-                            nat = str(ori.get('natureza', '')).lower()
-                            if 'iniciacao' in nat:
-                                tipo_final = 'Iniciação Científica'
-                            elif 'tcc' in nat or 'graduacao' in nat:
-                                tipo_final = 'TCC/Graduação'
-                        
-                        try:
-                            self.db.cursor.execute("""
-                                INSERT INTO orientacoes_concluidas 
-                                (id_docente, nome_orientado, tipo_orientacao, curso, instituicao, titulo, ano)
-                                VALUES (?, ?, ?, ?, ?, ?, ?)
-                            """, (docente_id, nome_ori, tipo_final, curso, inst, tit, ano))
-                            count += 1
-                        except:
-                            try:
-                                self.db.cursor.execute("""
-                                    INSERT INTO orientacoes_concluidas 
-                                    (id_docente, nome_orientado, curso, instituicao, titulo, ano)
-                                    VALUES (?, ?, ?, ?, ?, ?)
-                                """, (docente_id, nome_ori, curso, inst, tit, ano))
-                                count += 1
-                            except:
-                                pass
-            
-            if count > 0:
-                self.stats['com_orientacoes'] += 1
-        except:
-            pass
+    def inserir_linha_a_linha(self, tabela: str, registros: List[tuple]):
+        """Insere as linhas uma a uma, pulando (e contando) as recusadas pelo SQLite"""
+        for registro in registros:
+            try:
+                self.db.cursor.execute(SQL_INSERCAO[tabela], registro)
+            except sqlite3.Error as e:
+                self.stats['linhas_com_erro'] += 1
+                print(f"   ⚠️  {tabela}: linha do docente {registro[0]} ignorada ({e})")
     
-    def extract_premios(self, docente_id: int, data: dict):
-        """Extrai prêmios"""
-        try:
-            dg = self.safe_get(data, 'dadosGerais', default={})
-            prem_dict = self.safe_get(dg, 'premiosTitulos', default={})
-            premios = self.get_list_safe(prem_dict, 'premioTitulo')
+    def gravar_lote(self, resultados: List[Tuple[int, Optional[str], Optional[Dict[str, List[tuple]]]]],
+                    limpar: bool = True):
+        """
+        Grava um lote já extraído em uma única transação, com um executemany por tabela
+        
+        Args:
+            resultados: Lista de (id, content_hash, linhas) devolvida por extrair_lote;
+                        linhas é None quando o JSON do docente é inválido
+            limpar: Se False, não apaga as linhas antigas (tabelas recém-recriadas)
+        """
+        if not self.esquema_verificado:
+            self.garantir_esquema()
+        
+        por_tabela = {tabela: [] for tabela in COLUNAS_NORMALIZADAS}
+        normalizados = []
+        
+        for docente_id, content_hash, linhas in resultados:
+            if linhas is None:
+                self.stats['erros_json'] += 1
+                continue
             
-            count = 0
-            for prem in premios:
-                if not isinstance(prem, dict):
-                    continue
-                
-                nome = self.to_str(prem.get('nomeDoPremioOuTitulo'))
-                ano = self.safe_int(prem.get('ano'))
-                inst = self.to_str(prem.get('nomeEntidadePromotora'))
-                
-                if nome:
-                    try:
-                        self.db.cursor.execute("""
-                            INSERT INTO premios_titulos (id_docente, nome, ano, instituicao)
-                            VALUES (?, ?, ?, ?)
-                        """, (docente_id, nome, ano, inst))
-                        count += 1
-                    except:
-                        pass
+            for tabela, registros in linhas.items():
+                if registros:
+                    por_tabela[tabela].extend(registros)
+                    chave = ESTATISTICA_POR_TABELA.get(tabela, f'com_{tabela}')
+                    self.stats[chave] = self.stats.get(chave, 0) + 1
             
-            if count > 0:
-                self.stats['com_premios'] += 1
-        except:
-            pass
+            normalizados.append((docente_id, content_hash))
+        
+        if limpar:
+            self.db.clear_normalized_data_batch([docente_id for docente_id, _ in normalizados],
+                                               commit=False, tabelas=TABELAS_EXTRAIDAS)
+        
+        for tabela, registros in por_tabela.items():
+            self.inserir_linhas(tabela, registros)
+        
+        for docente_id, content_hash in normalizados:
+            self.db.marcar_normalizado(docente_id, content_hash)
+        
+        self.stats['processados'] += len(normalizados)
+        self.db.conn.commit()
     
-    def extract_areas(self, docente_id: int, data: dict):
-        """Extrai áreas"""
-        try:
-            dg = self.safe_get(data, 'dadosGerais', default={})
-            areas_dict = self.safe_get(dg, 'areasDeAtuacao', default={})
-            areas = self.get_list_safe(areas_dict, 'areaDeAtuacao')
-            
-            count = 0
-            for area in areas:
-                if not isinstance(area, dict):
-                    continue
-                
-                grande = self.to_str(area.get('nomeGrandeAreaDoConhecimento'))
-                nome_area = self.to_str(area.get('nomeDaAreaDoConhecimento'))
-                sub = self.to_str(area.get('nomeDaSubAreaDoConhecimento'))
-                esp = self.to_str(area.get('nomeDaEspecialidade'))
-                
-                try:
-                    self.db.cursor.execute("""
-                        INSERT INTO areas_atuacao (id_docente, grande_area, area, subarea, especialidade)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (docente_id, grande, nome_area, sub, esp))
-                    count += 1
-                except:
-                    pass
-            
-            if count > 0:
-                self.stats['com_areas'] += 1
-        except:
-            pass
+    def normalize_docente(self, docente_id: int, data_json: str, content_hash: str = None):
+        """Normaliza 1 docente (content_hash: hash do conteúdo lido, para limpar a pendência)"""
+        self.gravar_lote(extrair_lote([(docente_id, data_json, content_hash)]))
     
-    def normalize_docente(self, docente_id: int, data_json: str):
-        """Normaliza 1 docente"""
-        try:
-            data = json.loads(data_json)
-            self.db.clear_normalized_data(docente_id)
-            
-            self.extract_dados_gerais(docente_id, data)
-            self.extract_formacoes(docente_id, data)
-            self.extract_atuacoes(docente_id, data)
-            self.extract_producoes(docente_id, data)
-            self.extract_orientacoes(docente_id, data)
-            self.extract_premios(docente_id, data)
-            self.extract_areas(docente_id, data)
-            
-            self.db.conn.commit()
-            self.stats['processados'] += 1
-        except json.JSONDecodeError:
-            self.stats['erros_json'] += 1
-        except Exception:
-            self.stats['erros_json'] += 1
-    
-    def normalize_all(self):
-        """Normaliza todos"""
+    def normalize_all(self, incremental: bool = False, processos: Optional[int] = PROCESSOS_NORMALIZACAO):
+        """
+        Normaliza todos
+        
+        Args:
+            incremental: Se True, só os docentes novos ou cujo conteúdo mudou
+                         desde a última normalização (normalizacao_pendente)
+            processos: Processos de extração (None = um por núcleo; 1 = sem pool)
+        """
         print("\n" + "="*70)
         print("🔄 NORMALIZER DEFINITIVO - Versão Final")
         print("="*70 + "\n")
         
-        docentes = self.db.get_all_docentes_for_normalization()
-        total = len(docentes)
+        self.garantir_esquema()
         
-        print(f"📊 Total: {total:,} docentes\n")
+        if incremental:
+            total = self.db.count_docentes_pendentes_normalizacao()
+        else:
+            total = self.db.count_all_docentes()
         
-        for i, (doc_id, data_json) in enumerate(docentes, 1):
-            self.normalize_docente(doc_id, data_json)
+        # Lidos sob demanda: só os lotes em andamento ficam em memória
+        docentes = self.db.iter_docentes_for_normalization(somente_pendentes=incremental)
+        
+        if incremental:
+            print(f"🔁 Modo incremental: {total:,} de {self.db.count_all_docentes():,} docentes pendentes\n")
+            if total == 0:
+                print("✅ Nada a normalizar: nenhum docente mudou desde a última normalização")
+                return
+            
+            # O DELETE por id_docente de cada lote depende deles (e uma renormalização
+            # completa interrompida termina sem eles)
+            self.db.criar_indices_normalizados()
+        else:
+            print(f"📊 Total: {total:,} docentes\n")
             
-            if i % 100 == 0 or i == total:
-                print(f"⏳ {i:,}/{total:,} ({(i/total)*100:.1f}%)")
+            # Renormalização completa: recriar as tabelas sai mais barato que apagar docente a docente,
+            # e os índices são construídos uma vez no fim em vez de atualizados a cada lote
+            print("🧹 Recriando as tabelas normalizadas (índices serão criados após a carga)...\n")
+            self.db.recriar_tabelas_normalizadas(indices=False, tabelas=TABELAS_EXTRAIDAS)
+        
+        processos = processos or os.cpu_count() or 1
+        print(f"⚙️  {processos} processo(s) de extração, lotes de {LOTE_NORMALIZACAO} docentes\n")
+        
+        feitos = 0
+        for resultados in extrair_lotes(dividir_em_lotes(docentes, LOTE_NORMALIZACAO), processos):
+            self.gravar_lote(resultados, limpar=incremental)
+            feitos += len(resultados)
+            print(f"⏳ {feitos:,}/{total:,} ({(feitos/total)*100:.1f}%)")
+        
+        if not incremental:
+            print("\n🗂️  Criando índices das tabelas normalizadas...")
+            inicio = time.time()
+            self.db.criar_indices_normalizados()
+            print(f"   ✅ {len(INDICES_NORMALIZADOS)} índices em {time.time() - inicio:.1f}s")
         
         print(f"\n{'='*70}")
         print("✅ NORMALIZAÇÃO CONCLUÍDA")
@@ -638,25 +602,110 @@ class NormalizerDefinitivo:
         print("📊 ESTATÍSTICAS:")
         print(f"   Processados: {self.stats['processados']:,}")
         print(f"   Erros JSON: {self.stats['erros_json']:,}")
+        print(f"   Linhas ignoradas (erro ao gravar): {self.stats['linhas_com_erro']:,}")
         print(f"\n   Com dados:")
         print(f"      - Dados gerais: {self.stats['com_dados_gerais']:,}")
         print(f"      - Formações: {self.stats['com_formacoes']:,}")
         print(f"      - Atuações: {self.stats['com_atuacoes']:,}")
         print(f"      - Produções: {self.stats['com_producoes']:,}")
-        print(f"      - Orientações (IFs): {self.stats['com_orientacoes']:,}")
+        print(f"      - Orientações: {self.stats['com_orientacoes']:,}")
         print(f"      - Prêmios: {self.stats['com_premios']:,}")
         print(f"      - Áreas: {self.stats['com_areas']:,}")
+        print(f"      - Projetos: {self.stats['com_projetos']:,}")
+        for tabela in TABELAS_EXTRAIDAS:
+            if tabela not in ESTATISTICA_POR_TABELA:
+                print(f"      - {tabela}: {self.stats.get(f'com_{tabela}', 0):,}")
+
+
+def dividir_em_lotes(itens: Iterable, tamanho: int) -> Iterator[list]:
+    """Agrupa os itens em listas de até `tamanho` elementos"""
+    lote = []
+    for item in itens:
+        lote.append(item)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def extrair_lote(lote: List[Tuple[int, str, Optional[str]]]) -> List[Tuple[int, Optional[str], Optional[Dict[str, List[tuple]]]]]:
+    """
+    Decodifica e extrai um lote de docentes (executado nos processos do pool)
+    
+    Args:
+        lote: Lista de (id, data_completa como gravado no banco, content_hash)
+    
+    Returns:
+        Lista de (id, content_hash, linhas); linhas é None se o JSON for inválido
+    """
+    resultados = []
+    
+    for docente_id, data_json, content_hash in lote:
+        try:
+            data = decodificar_para_extracao(data_json)
+        except ERROS_DECODIFICACAO:
+            resultados.append((docente_id, content_hash, None))
+            continue
+        
+        resultados.append((docente_id, content_hash, EXTRACAO.extrair(docente_id, data)))
+    
+    return resultados
+
+
+def extrair_lotes(lotes: Iterable[list], processos: int) -> Iterator[list]:
+    """
+    Extrai os lotes em ordem, com até 2 lotes por processo em andamento
+    
+    Args:
+        lotes: Lotes de (id, data_completa, content_hash)
+        processos: Número de processos (1 = extrai no próprio processo)
+    
+    Yields:
+        Resultado de extrair_lote para cada lote
+    """
+    if processos <= 1:
+        for lote in lotes:
+            yield extrair_lote(lote)
+        return
+    
+    with ProcessPoolExecutor(max_workers=processos) as pool:
+        # Janela limitada: não envia o banco inteiro para os processos de uma vez
+        pendentes = deque()
+        for lote in lotes:
+            pendentes.append(pool.submit(extrair_lote, lote))
+            if len(pendentes) >= 2 * processos:
+                yield pendentes.popleft().result()
+        
+        while pendentes:
+            yield pendentes.popleft().result()
+
+
+def parse_processos(argumentos: List[str]) -> Optional[int]:
+    """Lê --processos N da linha de comando (padrão: PROCESSOS_NORMALIZACAO)"""
+    if '--processos' not in argumentos:
+        return PROCESSOS_NORMALIZACAO
+    
+    indice = argumentos.index('--processos')
+    try:
+        return max(1, int(argumentos[indice + 1]))
+    except (IndexError, ValueError):
+        print("❌ Uso: --processos N (N = número de processos de extração)")
+        sys.exit(1)
 
 
 def main():
     print("\n🚀 NORMALIZER DEFINITIVO\n")
     
+    argumentos = sys.argv[1:]
+    processos = parse_processos(argumentos)
+    
     db = Database()
     db.connect()
     
     try:
         normalizer = NormalizerDefinitivo(db)
-        normalizer.normalize_all()
+        normalizer.normalize_all(incremental='--incremental' in argumentos, processos=processos)
     except KeyboardInterrupt:
         print("\n⚠️  Interrompido!")
     finally:
@@ -666,4 +715,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
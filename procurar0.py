@@ -6,6 +6,7 @@ Procura projetos em vários docentes até achar
 import json
 import sqlite3
 from config import DB_NAME
+from database import decodificar_data_completa
 
 print("\n" + "="*80)
 print("🔍 PROCURANDO PROJETOS EM MÚLTIPLOS DOCENTES")
@@ -22,7 +23,7 @@ encontrou_projeto = False
 
 for doc_id, nome, data_json in docentes:
     try:
-        data = json.loads(data_json)
+        data = decodificar_data_completa(data_json)
         
         # Procura em todas as chaves possíveis
         def procurar_recursivo(obj, caminho="", nivel=0):
@@ -67,7 +68,7 @@ if not encontrou_projeto:
     # Pega primeiro docente e mostra dadosComplementares
     cursor.execute("SELECT data_completa FROM docentes LIMIT 1")
     data_json = cursor.fetchone()[0]
-    data = json.loads(data_json)
+    data = decodificar_data_completa(data_json)
     
     dados_compl = data.get('dadosComplementares', {})
     if dados_compl:
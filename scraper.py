@@ -4,83 +4,216 @@ Módulo de scraping do Portal Integra com retry automático e paralelização
 
 import asyncio
 import aiohttp
+import json
+import os
 import ssl
 import time
+from contextlib import asynccontextmanager
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from cache_http import CacheHttp
+from codec import loads
+from database import carimbo_atualizacao
 from config import (
-    INSTITUICOES, PAGE_SIZE, MAX_CONCURRENT_DETAILS, 
+    INSTITUICOES, PAGE_SIZE, PAGE_SIZE_CANDIDATOS, ARQUIVO_PAGE_SIZES,
+    MAX_CONCURRENT_DETAILS, MAX_CONCURRENT_PAGES,
+    MAX_CONCURRENT_REQUESTS, MAX_REQUESTS_PER_HOST, DNS_CACHE_TTL, KEEPALIVE_TIMEOUT,
     TIMEOUT, MAX_RETRIES, RETRY_DELAY, HEADERS, TERMOS_DOCENTE
 )
 
 
+def criar_sessao(timeout: int = TIMEOUT) -> aiohttp.ClientSession:
+    """
+    Cria a sessão aiohttp compartilhada por todas as instituições
+    
+    Um único pool de conexões atende as fases de listagem, detalhes e diagnóstico:
+    conexões e handshakes TLS são reaproveitados (keep-alive) e a resolução DNS
+    de cada um dos hosts fica em cache.
+    
+    Args:
+        timeout: Timeout total de cada requisição (segundos)
+    
+    Returns:
+        Sessão aiohttp (deve ser fechada por quem a criou)
+    """
+    # SSL context que aceita certificados inválidos
+    ssl_context = ssl.create_default_context()
+    ssl_context.check_hostname = False
+    ssl_context.verify_mode = ssl.CERT_NONE
+    
+    connector = aiohttp.TCPConnector(
+        ssl=ssl_context,
+        limit=MAX_CONCURRENT_REQUESTS,
+        limit_per_host=MAX_REQUESTS_PER_HOST,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    
+    return aiohttp.ClientSession(
+        headers=HEADERS,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        connector=connector
+    )
+
+
+def carregar_page_sizes() -> Dict[str, int]:
+    """Lê o cache de tamanhos de página por instituição ({} se não existir)"""
+    try:
+        with open(ARQUIVO_PAGE_SIZES, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def salvar_page_size(sigla: str, tamanho: int):
+    """Grava no cache o tamanho de página aceito por uma instituição"""
+    page_sizes = carregar_page_sizes()
+    page_sizes[sigla] = tamanho
+    
+    # Escreve em arquivo temporário e substitui, para nunca deixar o cache pela metade
+    temporario = f"{ARQUIVO_PAGE_SIZES}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(page_sizes, f, indent=2, sort_keys=True)
+    os.replace(temporario, ARQUIVO_PAGE_SIZES)
+
+
+class AgendadorRequisicoes:
+    """
+    Controla quantas requisições podem estar em andamento ao mesmo tempo
+    
+    Combina um orçamento global (compartilhado por todas as instituições) com um
+    teto por host. Assim que uma requisição termina, a vaga vai para qualquer
+    instituição que tenha trabalho pendente.
+    """
+    
+    def __init__(self, max_global: int = MAX_CONCURRENT_REQUESTS,
+                 max_por_host: int = MAX_REQUESTS_PER_HOST):
+        """
+        Args:
+            max_global: Máximo de requisições simultâneas no total
+            max_por_host: Máximo de requisições simultâneas por host
+        """
+        self.max_por_host = max_por_host
+        self.semaforo_global = asyncio.Semaphore(max_global)
+        self.semaforos_host = {}
+    
+    @asynccontextmanager
+    async def vaga(self, url: str):
+        """Aguarda uma vaga para requisitar a URL e a libera ao sair do bloco"""
+        host = urlsplit(url).netloc
+        semaforo_host = self.semaforos_host.get(host)
+        if semaforo_host is None:
+            semaforo_host = asyncio.Semaphore(self.max_por_host)
+            self.semaforos_host[host] = semaforo_host
+        
+        # Primeiro o teto do host: quem espera pelo próprio host não ocupa vaga global
+        async with semaforo_host:
+            async with self.semaforo_global:
+                yield
+
+
 class IntegraScraper:
     """Scraper assíncrono para o Portal Integra"""
     
-    def __init__(self, sigla: str, base_url: str):
+    def __init__(self, sigla: str, base_url: str,
+                 agendador: Optional[AgendadorRequisicoes] = None,
+                 session: Optional[aiohttp.ClientSession] = None,
+                 cache: Optional[CacheHttp] = None,
+                 conhecidos: Optional[Dict[str, Optional[str]]] = None,
+                 checkpoint: Optional[Dict] = None):
         """
         Inicializa o scraper para uma instituição
         
         Args:
             sigla: Sigla da instituição (ex: IFB, IFSP)
             base_url: URL base do Portal Integra
+            agendador: Agendador compartilhado entre instituições (cria um próprio se None)
+            session: Sessão compartilhada (se None, o scraper cria e fecha a sua)
+            cache: Cache HTTP das respostas de detalhes (opcional)
+            conhecidos: {slug: carimbo} já gravados no banco - ativa a coleta incremental
+            checkpoint: Checkpoint de uma coleta interrompida (ver Database.get_checkpoint)
         """
         self.sigla = sigla
         self.base_url = base_url
-        self.session = None
+        self.session = session
+        self.cache = cache
+        self.conhecidos = conhecidos
+        self.checkpoint = checkpoint
+        self.fila = None
+        self.sessao_propria = session is None
+        self.agendador = agendador or AgendadorRequisicoes()
+        self.page_size = PAGE_SIZE
         
         # Estatísticas
         self.stats = {
             'total_pessoas': 0,
             'docentes_filtrados': 0,
             'detalhes_coletados': 0,
+            'detalhes_do_cache': 0,
+            'detalhes_revalidados': 0,
             'erros': 0,
+            'paginas_com_erro': 0,
+            'inalterados': 0,
+            'removidos': [],
+            'paginas_retomadas': 0,
+            'retomados': 0,
             'cargos_encontrados': set(),
             'cargos_ignorados': set(),
         }
     
     async def create_session(self):
-        """Cria sessão aiohttp com configurações apropriadas"""
-        # SSL context que aceita certificados inválidos
-        ssl_context = ssl.create_default_context()
-        ssl_context.check_hostname = False
-        ssl_context.verify_mode = ssl.CERT_NONE
-        
-        # Timeout personalizado
-        timeout = aiohttp.ClientTimeout(total=TIMEOUT)
-        
-        # Criar connector com SSL desabilitado
-        connector = aiohttp.TCPConnector(ssl=ssl_context, limit=100)
-        
-        self.session = aiohttp.ClientSession(
-            headers=HEADERS,
-            timeout=timeout,
-            connector=connector
-        )
+        """Cria a sessão, caso nenhuma sessão compartilhada tenha sido informada"""
+        if self.session is None:
+            self.session = criar_sessao()
     
     async def close_session(self):
-        """Fecha a sessão"""
-        if self.session:
+        """Fecha a sessão (somente se foi criada por este scraper)"""
+        if self.session and self.sessao_propria:
             await self.session.close()
+            self.session = None
     
-    async def fetch_with_retry(self, url: str, max_retries: int = MAX_RETRIES) -> Optional[Dict]:
+    async def fetch_resposta_with_retry(self, url: str, headers: Optional[Dict[str, str]] = None,
+                                        max_retries: int = MAX_RETRIES,
+                                        registrar_erro: bool = True) -> Optional[Dict]:
         """
-        Faz requisição HTTP com retry automático
+        Faz requisição HTTP com retry automático, preservando o corpo bruto
+        
+        Aceita 200 e 304 (resposta a uma requisição condicional).
         
         Args:
             url: URL para fazer a requisição
+            headers: Cabeçalhos extras (ex.: If-None-Match)
             max_retries: Número máximo de tentativas
+            registrar_erro: Se False, a falha não entra nas estatísticas (ex.: sondagens)
         
         Returns:
-            JSON da resposta ou None em caso de falha
+            Dict com status, corpo (bytes), dados (JSON, None se 304), etag e
+            last_modified; ou None em caso de falha
         """
         for attempt in range(max_retries):
             try:
-                async with self.session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
-                    else:
-                        print(f"⚠️  {self.sigla}: Status {response.status} - tentativa {attempt + 1}/{max_retries}")
-                        
+                async with self.agendador.vaga(url):
+                    async with self.session.get(url, headers=headers) as response:
+                        if response.status == 200:
+                            corpo = await response.read()
+                            return {
+                                'status': 200,
+                                'corpo': corpo,
+                                'dados': loads(corpo),
+                                'etag': response.headers.get('ETag'),
+                                'last_modified': response.headers.get('Last-Modified'),
+                            }
+                        elif response.status == 304 and headers:
+                            return {
+                                'status': 304,
+                                'corpo': b'',
+                                'dados': None,
+                                'etag': response.headers.get('ETag'),
+                                'last_modified': response.headers.get('Last-Modified'),
+                            }
+                        else:
+                            print(f"⚠️  {self.sigla}: Status {response.status} - tentativa {attempt + 1}/{max_retries}")
+            
             except asyncio.TimeoutError:
                 print(f"⏱️  {self.sigla}: Timeout - tentativa {attempt + 1}/{max_retries}")
             except aiohttp.ClientError as e:
@@ -92,9 +225,27 @@ class IntegraScraper:
             if attempt < max_retries - 1:
                 await asyncio.sleep(RETRY_DELAY * (attempt + 1))  # Backoff exponencial
         
-        self.stats['erros'] += 1
+        if registrar_erro:
+            self.stats['erros'] += 1
         return None
     
+    async def fetch_with_retry(self, url: str, max_retries: int = MAX_RETRIES,
+                               registrar_erro: bool = True) -> Optional[Dict]:
+        """
+        Faz requisição HTTP com retry automático
+        
+        Args:
+            url: URL para fazer a requisição
+            max_retries: Número máximo de tentativas
+            registrar_erro: Se False, a falha não entra nas estatísticas (ex.: sondagens)
+        
+        Returns:
+            JSON da resposta ou None em caso de falha
+        """
+        resposta = await self.fetch_resposta_with_retry(url, max_retries=max_retries,
+                                                        registrar_erro=registrar_erro)
+        return resposta['dados'] if resposta else None
+    
     def is_docente(self, cargo: str) -> bool:
         """
         Verifica se o cargo é de docente usando filtro ABRANGENTE
@@ -120,18 +271,26 @@ class IntegraScraper:
         self.stats['cargos_ignorados'].add(cargo)
         return False
     
-    async def fetch_pessoas_page(self, start: int) -> Optional[List[Dict]]:
+    async def fetch_pessoas_page(self, start: int, length: Optional[int] = None,
+                                 sondagem: bool = False) -> Optional[List[Dict]]:
         """
         Busca uma página de pessoas
         
         Args:
             start: Índice inicial
+            length: Tamanho da página (padrão: self.page_size)
+            sondagem: Se True, tenta uma única vez e não contabiliza falha como erro
         
         Returns:
             Lista de pessoas ou None em caso de erro
         """
-        url = f"{self.base_url}/api/portfolio/pessoa/data?start={start}&length={PAGE_SIZE}"
-        data = await self.fetch_with_retry(url)
+        length = length or self.page_size
+        url = f"{self.base_url}/api/portfolio/pessoa/data?start={start}&length={length}"
+        
+        if sondagem:
+            data = await self.fetch_with_retry(url, max_retries=1, registrar_erro=False)
+        else:
+            data = await self.fetch_with_retry(url)
         
         if data and isinstance(data, list) and len(data) >= 2:
             # Formato: [{"total": N, "length": M}, [...pessoas...]]
@@ -146,59 +305,254 @@ class IntegraScraper:
         
         return None
     
+    def pagina_completa(self, pessoas: List[Dict], length: int) -> bool:
+        """Verifica se a API devolveu a quantidade pedida (ou todas as pessoas, se forem menos)"""
+        total = self.stats['total_pessoas']
+        esperado = min(length, total) if total else length
+        return len(pessoas) == esperado
+    
+    async def negociar_page_size(self) -> Optional[List[Dict]]:
+        """
+        Descobre o maior tamanho de página que o portal respeita
+        
+        Usa o valor em cache (ARQUIVO_PAGE_SIZES) quando existir e ainda for
+        respeitado. Caso contrário, pede a primeira página com PAGE_SIZE e depois
+        com cada valor de PAGE_SIZE_CANDIDATOS, parando no primeiro que o servidor
+        não atender por completo. O resultado vai para o cache.
+        
+        Returns:
+            Primeira página (start=0) buscada com o tamanho escolhido, ou None em caso de erro
+        """
+        em_cache = carregar_page_sizes().get(self.sigla)
+        
+        if em_cache:
+            pagina = await self.fetch_pessoas_page(0, em_cache)
+            if pagina is not None and self.pagina_completa(pagina, em_cache):
+                self.page_size = em_cache
+                return pagina
+            print(f"⚠️  {self.sigla}: Tamanho de página em cache ({em_cache}) não foi respeitado, renegociando...")
+        
+        pagina = await self.fetch_pessoas_page(0, PAGE_SIZE)
+        if pagina is None:
+            return None
+        self.page_size = PAGE_SIZE
+        
+        # Se tudo coube na página padrão, não há como (nem por que) testar tamanhos maiores
+        if len(pagina) < PAGE_SIZE or self.stats['total_pessoas'] <= PAGE_SIZE:
+            return pagina
+        
+        for tamanho in PAGE_SIZE_CANDIDATOS:
+            if tamanho <= self.page_size:
+                continue
+            
+            tentativa = await self.fetch_pessoas_page(0, tamanho, sondagem=True)
+            if tentativa is None or not self.pagina_completa(tentativa, tamanho):
+                break
+            
+            pagina = tentativa
+            self.page_size = tamanho
+            
+            # A página já trouxe todas as pessoas
+            if tamanho >= self.stats['total_pessoas']:
+                break
+        
+        salvar_page_size(self.sigla, self.page_size)
+        print(f"📏 {self.sigla}: Tamanho de página = {self.page_size}")
+        return pagina
+    
+    async def registrar_checkpoint(self, *evento):
+        """
+        Envia um evento de checkpoint ao gravador pela mesma fila dos detalhes
+        
+        Como a fila é FIFO, o gravador persiste o evento na mesma transação (ou
+        depois) dos docentes entregues antes dele. Sem fila, não há checkpoint.
+        """
+        if self.fila is not None:
+            await self.fila.put(evento)
+    
+    async def obter_pagina(self, start: int) -> Optional[List[Dict]]:
+        """
+        Devolve a página da listagem: do checkpoint, se já foi obtida antes, ou da API
+        
+        Args:
+            start: Índice inicial
+        
+        Returns:
+            Lista de pessoas ou None em caso de erro
+        """
+        if self.checkpoint and start in self.checkpoint['paginas']:
+            self.stats['paginas_retomadas'] += 1
+            return self.checkpoint['paginas'][start]
+        
+        pagina = await self.fetch_pessoas_page(start)
+        if pagina is not None:
+            await self.registrar_checkpoint('pagina', self.sigla, start, pagina)
+        return pagina
+    
     async def fetch_all_pessoas(self) -> List[Dict]:
         """
         Busca TODAS as pessoas da instituição (paginado)
         
+        O tamanho da página é negociado com o portal (negociar_page_size). A
+        primeira página informa o total de pessoas; com ele, os offsets das
+        demais páginas são calculados e buscados em paralelo (no máximo
+        MAX_CONCURRENT_PAGES por vez). Sem total confiável, pagina em sequência.
+        
+        Ao retomar uma coleta, o tamanho de página e o total vêm do checkpoint e
+        só as páginas que ainda não tinham sido obtidas são pedidas à API.
+        
         Returns:
             Lista completa de todas as pessoas
         """
         print(f"🔍 {self.sigla}: Buscando lista de pessoas...")
         
-        todas_pessoas = []
-        start = 0
+        if self.checkpoint and self.checkpoint['page_size']:
+            self.page_size = self.checkpoint['page_size']
+            self.stats['total_pessoas'] = self.checkpoint['total'] or 0
+            primeira = await self.obter_pagina(0)
+        else:
+            primeira = await self.negociar_page_size()
+            if primeira is not None:
+                await self.registrar_checkpoint('paginacao', self.sigla, self.page_size,
+                                                self.stats['total_pessoas'])
+                await self.registrar_checkpoint('pagina', self.sigla, 0, primeira)
+        
+        if not primeira:
+            # Se falhou e ainda não pegou ninguém, é erro crítico
+            print(f"❌ {self.sigla}: Falha ao buscar primeira página!")
+            return []
+        
+        todas_pessoas = list(primeira)
+        total = self.stats['total_pessoas']
+        
+        if len(primeira) >= self.page_size:
+            if total > self.page_size:
+                offsets = list(range(self.page_size, total, self.page_size))
+                paginas = await self.fetch_paginas_paralelas(offsets)
+                
+                for start, pagina in zip(offsets, paginas):
+                    if pagina is None:
+                        # Página perdida mesmo após retries: segue com as demais
+                        self.stats['paginas_com_erro'] += 1
+                        print(f"⚠️  {self.sigla}: Falha ao buscar página start={start}")
+                        continue
+                    todas_pessoas.extend(pagina)
+                
+                # Última página cheia: o total cresceu desde a primeira página
+                ultima = paginas[-1]
+                if ultima is not None and len(ultima) >= self.page_size:
+                    todas_pessoas.extend(await self.fetch_paginas_sequenciais(offsets[-1] + self.page_size))
+            else:
+                # Total ausente ou inconsistente: segue página a página
+                todas_pessoas.extend(await self.fetch_paginas_sequenciais(self.page_size))
+        
+        print(f"📋 {self.sigla}: {len(todas_pessoas)} pessoas encontradas")
+        return todas_pessoas
+    
+    async def fetch_paginas_paralelas(self, offsets: List[int]) -> List[Optional[List[Dict]]]:
+        """
+        Busca várias páginas de pessoas em paralelo (no máximo MAX_CONCURRENT_PAGES por vez)
+        
+        Args:
+            offsets: Índices iniciais das páginas
+        
+        Returns:
+            Uma entrada por offset, na mesma ordem (None para página que falhou)
+        """
+        semaforo = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+        
+        async def buscar(start: int) -> Optional[List[Dict]]:
+            async with semaforo:
+                return await self.obter_pagina(start)
+        
+        return await asyncio.gather(*(buscar(start) for start in offsets))
+    
+    async def fetch_paginas_sequenciais(self, start: int) -> List[Dict]:
+        """
+        Busca páginas em sequência a partir de `start` até a primeira página incompleta
+        
+        Args:
+            start: Offset inicial
+        
+        Returns:
+            Pessoas encontradas
+        """
+        pessoas = []
         
         while True:
-            pessoas = await self.fetch_pessoas_page(start)
+            pagina = await self.obter_pagina(start)
             
-            if not pessoas:
-                # Se falhou e ainda não pegou ninguém, é erro crítico
-                if start == 0:
-                    print(f"❌ {self.sigla}: Falha ao buscar primeira página!")
-                    return []
+            if pagina is None:
                 # Se já pegou algumas, para por aqui
+                self.stats['paginas_com_erro'] += 1
                 break
             
-            if len(pessoas) == 0:
+            if len(pagina) == 0:
                 # Fim da paginação
                 break
             
-            todas_pessoas.extend(pessoas)
+            pessoas.extend(pagina)
             
-            # Se pegou menos que PAGE_SIZE, provavelmente é a última página
-            if len(pessoas) < PAGE_SIZE:
+            # Se pegou menos que o tamanho da página, provavelmente é a última página
+            if len(pagina) < self.page_size:
                 break
             
-            start += PAGE_SIZE
+            start += self.page_size
             
             # Pequeno delay para não sobrecarregar
             await asyncio.sleep(0.1)
         
-        print(f"📋 {self.sigla}: {len(todas_pessoas)} pessoas encontradas")
-        return todas_pessoas
+        return pessoas
     
-    async def fetch_pessoa_detalhes(self, slug: str) -> Optional[Dict]:
+    async def fetch_pessoa_detalhes(self, slug: str, carimbo: Optional[str] = None) -> Optional[Dict]:
         """
         Busca detalhes completos de uma pessoa
         
+        Com cache: se o carimbo da listagem for igual ao guardado, usa a cópia
+        local sem ir à rede; senão faz uma requisição condicional (ETag /
+        Last-Modified) e reaproveita a cópia local se o servidor responder 304.
+        
         Args:
             slug: Identificador único da pessoa
+            carimbo: Carimbo de atualização da listagem (ver carimbo_atualizacao)
         
         Returns:
             JSON completo dos detalhes ou None em caso de erro
         """
         url = f"{self.base_url}/api/portfolio/pessoa/s/{slug}"
-        data = await self.fetch_with_retry(url)
+        # Só os metadados: o corpo é lido (e descompactado) apenas se for usado
+        entrada = await self.cache.obter_metadados(self.sigla, slug) if self.cache else None
+        corpo_em_cache = None
+        
+        if entrada and carimbo and entrada['carimbo'] == carimbo:
+            corpo_em_cache = await self.cache.obter_corpo(self.sigla, slug)
+        
+        if corpo_em_cache is not None:
+            # Listagem diz que nada mudou: nem vai à rede
+            data = loads(corpo_em_cache)
+            self.cache.atualizar_carimbo(self.sigla, slug, carimbo)  # Conta como uso (ver CacheHttp.podar)
+            self.stats['detalhes_do_cache'] += 1
+        else:
+            headers = {}
+            if entrada and entrada['etag']:
+                headers['If-None-Match'] = entrada['etag']
+            if entrada and entrada['last_modified']:
+                headers['If-Modified-Since'] = entrada['last_modified']
+            
+            resposta = await self.fetch_resposta_with_retry(url, headers=headers or None)
+            
+            if resposta is None:
+                data = None
+            elif resposta['status'] == 304:
+                corpo_em_cache = await self.cache.obter_corpo(self.sigla, slug)
+                data = loads(corpo_em_cache) if corpo_em_cache is not None else None
+                self.cache.atualizar_carimbo(self.sigla, slug, carimbo)
+                self.stats['detalhes_revalidados'] += 1
+            else:
+                data = resposta['dados']
+                if self.cache and data:
+                    self.cache.put(self.sigla, slug, resposta['corpo'], resposta['etag'],
+                                   resposta['last_modified'], carimbo)
         
         if data:
             # Adiciona a URL base nos dados para referência
@@ -207,63 +561,118 @@ class IntegraScraper:
         
         return data
     
-    async def fetch_docentes_detalhes(self, docentes: List[Dict]) -> List[Tuple[Dict, Dict]]:
+    async def fetch_docentes_detalhes(self, docentes: List[Dict],
+                                      fila: Optional[asyncio.Queue] = None) -> List[Tuple[Dict, Dict]]:
         """
         Busca detalhes de múltiplos docentes em paralelo (limitado)
         
+        Usa uma janela deslizante: MAX_CONCURRENT_DETAILS workers consomem a lista
+        e cada um inicia a próxima requisição assim que a sua termina, mantendo
+        sempre N requisições em andamento (um slug lento não segura os demais).
+        
         Args:
             docentes: Lista de docentes básicos
+            fila: Fila onde cada resultado é entregue como ('docente', sigla, dados_basicos,
+                  dados_completos). Se None, os resultados são acumulados e retornados.
         
         Returns:
-            Lista de tuplas (dados_basicos, dados_completos)
+            Lista de tuplas (dados_basicos, dados_completos) - vazia quando há fila
         """
-        print(f"📥 {self.sigla}: Coletando detalhes de {len(docentes)} docentes...")
+        total = len(docentes)
+        print(f"📥 {self.sigla}: Coletando detalhes de {total} docentes...")
         
         resultados = []
+        coletados = 0
+        processados = 0
         
-        # Divide em lotes para não sobrecarregar
-        batch_size = MAX_CONCURRENT_DETAILS
+        # Iterador compartilhado: cada docente é retirado por um único worker
+        pendentes = iter(docentes)
         
-        for i in range(0, len(docentes), batch_size):
-            batch = docentes[i:i + batch_size]
+        async def worker():
+            nonlocal coletados, processados
             
-            # Criar tarefas para o lote
-            tasks = []
-            for pessoa in batch:
+            for pessoa in pendentes:
                 slug = pessoa.get('slug', '')
-                if slug:
-                    tasks.append(self.fetch_pessoa_detalhes(slug))
-            
-            # Executar em paralelo
-            detalhes_batch = await asyncio.gather(*tasks)
-            
-            # Combinar com dados básicos
-            for pessoa, detalhes in zip(batch, detalhes_batch):
+                detalhes = await self.fetch_pessoa_detalhes(slug, carimbo_atualizacao(pessoa)) if slug else None
+                
                 if detalhes:
-                    resultados.append((pessoa, detalhes))
-            
-            # Progresso
-            progress = min(i + batch_size, len(docentes))
-            print(f"  ⏳ {self.sigla}: {progress}/{len(docentes)} docentes processados...")
-            
-            # Pequeno delay entre lotes
-            if i + batch_size < len(docentes):
-                await asyncio.sleep(0.5)
+                    coletados += 1
+                    if fila is not None:
+                        # Bloqueia enquanto a fila estiver cheia (backpressure)
+                        await fila.put(('docente', self.sigla, pessoa, detalhes))
+                    else:
+                        resultados.append((pessoa, detalhes))
+                
+                # Progresso
+                processados += 1
+                if processados % MAX_CONCURRENT_DETAILS == 0 or processados == total:
+                    print(f"  ⏳ {self.sigla}: {processados}/{total} docentes processados...")
+        
+        num_workers = min(MAX_CONCURRENT_DETAILS, total)
+        await asyncio.gather(*(worker() for _ in range(num_workers)))
         
-        print(f"✅ {self.sigla}: {len(resultados)} detalhes coletados com sucesso!")
+        print(f"✅ {self.sigla}: {coletados} detalhes coletados com sucesso!")
         return resultados
     
-    async def scrape(self) -> List[Tuple[Dict, Dict]]:
+    def filtrar_alterados(self, docentes: List[Dict]) -> List[Dict]:
+        """
+        Mantém só os docentes novos ou com carimbo de atualização diferente do banco
+        
+        Também registra em stats['removidos'] os slugs que estão no banco mas
+        sumiram da listagem - só quando a listagem veio completa, para que uma
+        página com erro não faça docentes parecerem removidos.
+        
+        Args:
+            docentes: Docentes filtrados da listagem
+        
+        Returns:
+            Docentes que precisam ter os detalhes baixados
+        """
+        alterados = []
+        for pessoa in docentes:
+            slug = pessoa.get('slug')
+            carimbo = carimbo_atualizacao(pessoa)
+            
+            # Sem carimbo na listagem não há como saber se mudou: baixa de novo
+            if slug in self.conhecidos and carimbo is not None and self.conhecidos[slug] == carimbo:
+                self.stats['inalterados'] += 1
+            else:
+                alterados.append(pessoa)
+        
+        if self.stats['paginas_com_erro'] == 0:
+            slugs_listagem = {pessoa.get('slug') for pessoa in docentes}
+            self.stats['removidos'] = sorted(set(self.conhecidos) - slugs_listagem)
+        else:
+            print(f"⚠️  {self.sigla}: Listagem incompleta, detecção de removidos ignorada")
+        
+        print(f"🔁 {self.sigla}: {len(alterados)} novos/alterados, "
+              f"{self.stats['inalterados']} inalterados, {len(self.stats['removidos'])} removidos")
+        
+        return alterados
+    
+    async def scrape(self, fila: Optional[asyncio.Queue] = None) -> List[Tuple[Dict, Dict]]:
         """
         Executa o scraping completo da instituição
         
+        Com fila, além dos detalhes, a fila recebe os eventos de checkpoint
+        ('paginacao', 'pagina' e 'concluida') que permitem retomar a coleta.
+        
+        Args:
+            fila: Fila para entregar os detalhes à medida que são coletados (opcional)
+        
         Returns:
-            Lista de tuplas (dados_basicos, dados_completos) dos docentes
+            Lista de tuplas (dados_basicos, dados_completos) dos docentes - vazia quando há fila
         """
         print(f"\n{'='*60}")
         print(f"🎯 Iniciando coleta: {self.sigla}")
         print(f"{'='*60}")
         
+        if self.checkpoint and self.checkpoint['concluida']:
+            print(f"⏭️  {self.sigla}: Já concluída na execução anterior, pulando")
+            return []
+        
+        self.fila = fila
+        
         start_time = time.time()
         
         try:
@@ -292,11 +701,24 @@ class IntegraScraper:
                 print(f"⚠️  {self.sigla}: ATENÇÃO - Nenhum docente foi filtrado! Verifique os cargos.")
                 return []
             
+            # 2.1 Coleta incremental: descarta quem não mudou desde a última coleta
+            if self.conhecidos is not None:
+                docentes = self.filtrar_alterados(docentes)
+            
+            # 2.2 Retomada: descarta quem já foi gravado na execução interrompida
+            if self.checkpoint and self.checkpoint['slugs']:
+                pendentes = [p for p in docentes if p.get('slug') not in self.checkpoint['slugs']]
+                self.stats['retomados'] = len(docentes) - len(pendentes)
+                docentes = pendentes
+                print(f"♻️  {self.sigla}: {self.stats['retomados']} docentes já gravados, "
+                      f"{len(docentes)} pendentes")
+            
             # 3. Buscar detalhes de todos os docentes
-            resultados = await self.fetch_docentes_detalhes(docentes)
+            resultados = await self.fetch_docentes_detalhes(docentes, fila)
             
-            # Fecha sessão
-            await self.close_session()
+            # Sem falhas, não há o que retomar nesta instituição
+            if self.stats['erros'] == 0 and self.stats['paginas_com_erro'] == 0:
+                await self.registrar_checkpoint('concluida', self.sigla)
             
             elapsed = time.time() - start_time
             print(f"\n✅ {self.sigla}: Coleta concluída em {elapsed:.1f}s")
@@ -304,16 +726,28 @@ class IntegraScraper:
             print(f"      - Total de pessoas: {self.stats['total_pessoas']}")
             print(f"      - Docentes filtrados: {self.stats['docentes_filtrados']}")
             print(f"      - Detalhes coletados: {self.stats['detalhes_coletados']}")
+            if self.checkpoint:
+                print(f"      - Páginas retomadas: {self.stats['paginas_retomadas']}")
+                print(f"      - Docentes retomados: {self.stats['retomados']}")
+            if self.conhecidos is not None:
+                print(f"      - Inalterados (pulados): {self.stats['inalterados']}")
+                print(f"      - Removidos da listagem: {len(self.stats['removidos'])}")
+            if self.cache:
+                print(f"      - Do cache (sem download): {self.stats['detalhes_do_cache']}")
+                print(f"      - Revalidados (304): {self.stats['detalhes_revalidados']}")
             print(f"      - Erros: {self.stats['erros']}")
             print(f"      - Cargos de docente encontrados: {len(self.stats['cargos_encontrados'])}")
             print(f"      - Cargos ignorados: {len(self.stats['cargos_ignorados'])}")
             
             return resultados
-            
+        
         except Exception as e:
             print(f"❌ {self.sigla}: Erro fatal durante coleta: {e}")
-            await self.close_session()
             return []
+        
+        finally:
+            # Fecha sessão
+            await self.close_session()
     
     def get_stats(self) -> Dict:
         """Retorna estatísticas da coleta"""
@@ -322,39 +756,71 @@ class IntegraScraper:
             'total_pessoas': self.stats['total_pessoas'],
             'docentes_filtrados': self.stats['docentes_filtrados'],
             'detalhes_coletados': self.stats['detalhes_coletados'],
+            'detalhes_do_cache': self.stats['detalhes_do_cache'],
+            'detalhes_revalidados': self.stats['detalhes_revalidados'],
+            'inalterados': self.stats['inalterados'],
+            'removidos': self.stats['removidos'],
+            'retomados': self.stats['retomados'],
             'erros': self.stats['erros'],
             'cargos_encontrados': sorted(list(self.stats['cargos_encontrados'])),
             'cargos_ignorados': sorted(list(self.stats['cargos_ignorados'])),
         }
 
 
-async def scrape_instituicao(sigla: str, base_url: str) -> Tuple[str, List[Tuple[Dict, Dict]], Dict]:
+async def scrape_instituicao(sigla: str, base_url: str,
+                             fila: Optional[asyncio.Queue] = None,
+                             agendador: Optional[AgendadorRequisicoes] = None,
+                             session: Optional[aiohttp.ClientSession] = None,
+                             cache: Optional[CacheHttp] = None,
+                             conhecidos: Optional[Dict[str, Optional[str]]] = None,
+                             checkpoint: Optional[Dict] = None) -> Tuple[str, List[Tuple[Dict, Dict]], Dict]:
     """
     Faz scraping de uma instituição específica
     
     Args:
         sigla: Sigla da instituição
         base_url: URL base do Portal Integra
+        fila: Fila para entregar os detalhes à medida que são coletados (opcional)
+        agendador: Agendador de requisições compartilhado (opcional)
+        session: Sessão aiohttp compartilhada (opcional)
+        cache: Cache HTTP das respostas de detalhes (opcional)
+        conhecidos: {slug: carimbo} já gravados no banco, para coleta incremental (opcional)
+        checkpoint: Checkpoint de uma coleta interrompida, para retomá-la (opcional)
     
     Returns:
-        Tupla (sigla, lista_de_docentes, estatísticas)
+        Tupla (sigla, lista_de_docentes, estatísticas) - lista vazia quando há fila
     """
-    scraper = IntegraScraper(sigla, base_url)
-    resultados = await scraper.scrape()
+    scraper = IntegraScraper(sigla, base_url, agendador, session, cache, conhecidos, checkpoint)
+    resultados = await scraper.scrape(fila)
     stats = scraper.get_stats()
     
     return sigla, resultados, stats
 
 
-async def scrape_multiplas_instituicoes(siglas_selecionadas: Optional[List[str]] = None):
+async def scrape_multiplas_instituicoes(siglas_selecionadas: Optional[List[str]] = None,
+                                       fila: Optional[asyncio.Queue] = None,
+                                       cache: Optional[CacheHttp] = None,
+                                       conhecidos_por_sigla: Optional[Dict[str, Dict[str, Optional[str]]]] = None,
+                                       checkpoints_por_sigla: Optional[Dict[str, Optional[Dict]]] = None):
     """
     Faz scraping de múltiplas instituições em paralelo (limitado)
     
+    Todas as instituições rodam ao mesmo tempo sob um único AgendadorRequisicoes:
+    o limite é de requisições (global e por host), não de instituições, então
+    instituições pequenas não ficam esperando a mais lenta de um lote. Todas
+    também compartilham a mesma sessão (pool de conexões).
+    
     Args:
         siglas_selecionadas: Lista de siglas específicas ou None para todas
+        fila: Fila para entregar os detalhes à medida que são coletados. Com fila,
+              nada é acumulado em memória e os resultados por instituição vêm vazios.
+        cache: Cache HTTP das respostas de detalhes (opcional)
+        conhecidos_por_sigla: {sigla: {slug: carimbo}} do banco. Se informado, a coleta
+              é incremental: só baixa detalhes de docentes novos ou alterados.
+        checkpoints_por_sigla: {sigla: checkpoint} de uma coleta interrompida (--resume)
     
     Returns:
-        Dict com resultados por instituição
+        Tupla (resultados por instituição, estatísticas por instituição)
     """
     # Determina quais instituições processar
     if siglas_selecionadas:
@@ -373,38 +839,37 @@ async def scrape_multiplas_instituicoes(siglas_selecionadas: Optional[List[str]]
     
     print(f"\n🚀 Iniciando coleta de {len(instituicoes_processar)} instituições")
     print(f"   Instituições: {', '.join(instituicoes_processar.keys())}")
+    print(f"   Limites: {MAX_CONCURRENT_REQUESTS} requisições simultâneas no total, "
+          f"{MAX_REQUESTS_PER_HOST} por host")
     
     todos_resultados = {}
     todas_stats = {}
     
-    # Processar em lotes para não sobrecarregar
-    from config import MAX_CONCURRENT_INSTITUTIONS
-    
-    siglas_lista = list(instituicoes_processar.keys())
+    agendador = AgendadorRequisicoes()
     
-    for i in range(0, len(siglas_lista), MAX_CONCURRENT_INSTITUTIONS):
-        batch_siglas = siglas_lista[i:i + MAX_CONCURRENT_INSTITUTIONS]
-        
-        print(f"\n📦 Processando lote {i//MAX_CONCURRENT_INSTITUTIONS + 1}: {', '.join(batch_siglas)}")
-        
-        # Criar tarefas para o lote
+    async with criar_sessao() as session:
+        # Criar tarefas para todas as instituições
         tasks = []
-        for sigla in batch_siglas:
-            info = instituicoes_processar[sigla]
-            tasks.append(scrape_instituicao(sigla, info['url']))
+        for sigla, info in instituicoes_processar.items():
+            conhecidos = None
+            if conhecidos_por_sigla is not None:
+                conhecidos = conhecidos_por_sigla.get(sigla, {})
+            checkpoint = (checkpoints_por_sigla or {}).get(sigla)
+            tasks.append(scrape_instituicao(sigla, info['url'], fila, agendador, session,
+                                            cache, conhecidos, checkpoint))
         
         # Executar em paralelo
-        resultados_batch = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Processar resultados
-        for resultado in resultados_batch:
-            if isinstance(resultado, Exception):
-                print(f"❌ Erro em uma instituição: {resultado}")
-                continue
-            
-            sigla, docentes, stats = resultado
-            todos_resultados[sigla] = docentes
-            todas_stats[sigla] = stats
+        resultados = await asyncio.gather(*tasks, return_exceptions=True)
+    
+    # Processar resultados
+    for resultado in resultados:
+        if isinstance(resultado, Exception):
+            print(f"❌ Erro em uma instituição: {resultado}")
+            continue
+        
+        sigla, docentes, stats = resultado
+        todos_resultados[sigla] = docentes
+        todas_stats[sigla] = stats
     
     return todos_resultados, todas_stats
 
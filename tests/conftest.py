@@ -0,0 +1,29 @@
+"""Os módulos do projeto ficam na raiz do repositório (sem pacote)"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+PASTA_TESTES = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(PASTA_TESTES))
+
+
+@pytest.fixture
+def banco_original(tmp_path) -> str:
+    """Arquivo de banco com o esquema anterior às migrações e um docente"""
+    arquivo = str(tmp_path / 'original.db')
+    with open(os.path.join(PASTA_TESTES, 'esquema_original.sql'), encoding='utf-8') as f:
+        esquema = f.read()
+    
+    conn = sqlite3.connect(arquivo)
+    conn.executescript(esquema)
+    conn.execute("""
+        INSERT INTO docentes (sigla, slug, nome, data_completa)
+        VALUES ('TESTE', 'docente-antigo', 'Docente Antigo', '{"dadosGerais": {"nomeCompleto": "Docente Antigo"}}')
+    """)
+    conn.execute("INSERT INTO dados_gerais (id_docente, nome_completo) VALUES (1, 'Docente Antigo')")
+    conn.commit()
+    conn.close()
+    return arquivo
@@ -0,0 +1,91 @@
+-- Esquema de um banco criado antes das migrações (schema_version ausente)
+
+CREATE TABLE docentes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sigla TEXT NOT NULL,
+    slug TEXT NOT NULL UNIQUE,
+    nome TEXT NOT NULL,
+    campus TEXT,
+    cargo TEXT,
+    email TEXT,
+    url TEXT,
+    data_completa TEXT NOT NULL,
+    atualizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_docentes_sigla ON docentes(sigla);
+CREATE INDEX idx_docentes_slug ON docentes(slug);
+
+CREATE TABLE dados_gerais (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_docente INTEGER NOT NULL,
+    nome_completo TEXT,
+    nome_citacao TEXT,
+    orcid TEXT,
+    resumo_cv TEXT,
+    FOREIGN KEY (id_docente) REFERENCES docentes(id) ON DELETE CASCADE
+);
+
+CREATE TABLE formacoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_docente INTEGER NOT NULL,
+    nivel TEXT,
+    curso TEXT,
+    instituicao TEXT,
+    ano_inicio INTEGER,
+    ano_fim INTEGER,
+    titulo TEXT,
+    orientador TEXT,
+    FOREIGN KEY (id_docente) REFERENCES docentes(id) ON DELETE CASCADE
+);
+
+CREATE TABLE atuacoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_docente INTEGER NOT NULL,
+    instituicao TEXT,
+    funcao TEXT,
+    tipo_vinculo TEXT,
+    ano_inicio INTEGER,
+    ano_fim INTEGER,
+    FOREIGN KEY (id_docente) REFERENCES docentes(id) ON DELETE CASCADE
+);
+
+CREATE TABLE producao_bibliografica (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_docente INTEGER NOT NULL,
+    tipo TEXT,
+    titulo TEXT,
+    ano INTEGER,
+    detalhes TEXT,
+    FOREIGN KEY (id_docente) REFERENCES docentes(id) ON DELETE CASCADE
+);
+
+CREATE TABLE orientacoes_concluidas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_docente INTEGER NOT NULL,
+    nome_orientado TEXT,
+    curso TEXT,
+    instituicao TEXT,
+    titulo TEXT,
+    ano INTEGER,
+    FOREIGN KEY (id_docente) REFERENCES docentes(id) ON DELETE CASCADE
+);
+
+CREATE TABLE premios_titulos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_docente INTEGER NOT NULL,
+    nome TEXT,
+    ano INTEGER,
+    instituicao TEXT,
+    FOREIGN KEY (id_docente) REFERENCES docentes(id) ON DELETE CASCADE
+);
+
+CREATE TABLE areas_atuacao (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_docente INTEGER NOT NULL,
+    grande_area TEXT,
+    area TEXT,
+    subarea TEXT,
+    especialidade TEXT,
+    FOREIGN KEY (id_docente) REFERENCES docentes(id) ON DELETE CASCADE
+);
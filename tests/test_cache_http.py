@@ -0,0 +1,66 @@
+"""
+Testes do cache HTTP em disco (cache_http.py)
+"""
+
+import asyncio
+import sqlite3
+
+from cache_http import CacheHttp
+
+
+def test_gravacoes_em_lote_e_poda(tmp_path):
+    """Respostas pendentes são lidas antes da gravação, persistem ao fechar e as antigas são podadas"""
+    arquivo = str(tmp_path / 'cache.db')
+    cache = CacheHttp(arquivo, tamanho_lote=3)
+    cache.connect()
+    
+    cache.put('TESTE', 'a', b'{"nome": "A"}', etag='"1"', carimbo='2024-01-01')
+    cache.put('TESTE', 'b', b'{"nome": "B"}')
+    cache.atualizar_carimbo('TESTE', 'a', '2024-02-01')
+    
+    # Ainda no lote pendente (2 entradas < 3)
+    assert cache.get('TESTE', 'a') == {
+        'corpo': b'{"nome": "A"}', 'etag': '"1"', 'last_modified': None, 'carimbo': '2024-02-01',
+    }
+    
+    cache.put('TESTE', 'c', b'{"nome": "C"}')  # Completa o lote
+    cache.close()
+    
+    conn = sqlite3.connect(arquivo)
+    assert conn.execute("SELECT COUNT(*) FROM respostas").fetchone()[0] == 3
+    conn.execute("UPDATE respostas SET atualizado_em = datetime('now', '-100 days') WHERE slug != 'a'")
+    conn.commit()
+    conn.close()
+    
+    cache = CacheHttp(arquivo)
+    cache.connect()
+    assert cache.get('TESTE', 'a')['carimbo'] == '2024-02-01'
+    assert cache.podar(90) == 2
+    assert cache.get('TESTE', 'b') is None
+    assert cache.get('TESTE', 'a')['corpo'] == b'{"nome": "A"}'
+    cache.close()
+
+
+def test_leituras_assincronas(tmp_path):
+    """obter_metadados não traz o corpo; obter_corpo lê do lote pendente ou do disco"""
+    cache = CacheHttp(str(tmp_path / 'cache.db'), tamanho_lote=2)
+    cache.connect()
+    
+    async def ler(slug):
+        return await cache.obter_metadados('TESTE', slug), await cache.obter_corpo('TESTE', slug)
+    
+    cache.put('TESTE', 'a', b'{"nome": "A"}', etag='"1"', carimbo='2024-01-01')
+    assert asyncio.run(ler('a')) == (
+        {'etag': '"1"', 'last_modified': None, 'carimbo': '2024-01-01'}, b'{"nome": "A"}',
+    )
+    
+    cache.put('TESTE', 'b', b'{"nome": "B"}')  # Completa o lote: vai para a thread de gravação
+    cache.atualizar_carimbo('TESTE', 'a', '2024-02-01')
+    cache.close()
+    
+    cache.connect()
+    metadados, corpo = asyncio.run(ler('a'))
+    assert metadados['carimbo'] == '2024-02-01'
+    assert corpo == b'{"nome": "A"}'
+    assert asyncio.run(ler('c')) == (None, None)
+    cache.close()
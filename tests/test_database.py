@@ -0,0 +1,113 @@
+"""
+Testes do banco (database.py): esquema, migrações e upsert de docentes
+"""
+
+import pytest
+
+from database import MIGRACOES, TABELAS_NORMALIZADAS, VERSAO_ESQUEMA, Database, hash_conteudo
+
+
+@pytest.fixture
+def db(tmp_path):
+    banco = Database(str(tmp_path / 'teste.db'))
+    banco.connect()
+    banco.create_tables()
+    yield banco
+    banco.close()
+
+
+def ler_docente(db: Database, slug: str) -> tuple:
+    """(id, atualizado_em, normalizacao_pendente, content_hash) do docente"""
+    db.cursor.execute("""
+        SELECT id, atualizado_em, normalizacao_pendente, content_hash
+        FROM docentes WHERE slug = ?
+    """, (slug,))
+    return tuple(db.cursor.fetchone())
+
+
+def colunas(db: Database, tabela: str) -> set:
+    """Nomes das colunas de uma tabela"""
+    db.cursor.execute(f"PRAGMA table_info({tabela})")
+    return {row['name'] for row in db.cursor.fetchall()}
+
+
+def esquema(db: Database) -> list:
+    """SQL de todas as tabelas e índices, para comparar antes e depois"""
+    db.cursor.execute("SELECT type, name, sql FROM sqlite_master ORDER BY type, name")
+    return [tuple(row) for row in db.cursor.fetchall()]
+
+
+def test_estatisticas_de_banco_nao_migrado_somente_leitura(banco_original):
+    """Relatórios (somente leitura) não quebram num banco sem as tabelas mais novas"""
+    db = Database(banco_original, somente_leitura=True)
+    db.connect()
+    stats = db.get_statistics()
+    db.close()
+    
+    assert stats['total_docentes'] == 1
+    assert stats['tabelas_ausentes'] == ['projetos']
+    assert stats['tabelas_normalizadas']['projetos'] == 0
+    assert stats['tabelas_normalizadas']['dados_gerais'] == 1
+    assert set(stats['tabelas_normalizadas']) == set(TABELAS_NORMALIZADAS)
+
+
+def test_upsert_sem_mudanca_de_conteudo_nao_toca_no_docente(db):
+    """Só baseUrl ou a ordem das chaves mudou: mesmo hash, sem renormalização"""
+    pessoa = {'slug': 'docente-a', 'nome': 'Docente A', 'cargo': 'Professor'}
+    dados = {'baseUrl': 'https://integra.a', 'dadosGerais': {'nomeCompleto': 'Docente A', 'orcidId': '1'}}
+    ids = db.upsert_docentes([('TESTE', pessoa, dados)])
+    
+    # Como se a coleta tivesse sido há tempos e o docente já estivesse normalizado
+    docente_id = ids['docente-a']
+    db.cursor.execute("UPDATE docentes SET atualizado_em = '2020-01-01 00:00:00' WHERE id = ?", (docente_id,))
+    db.marcar_normalizado(docente_id, hash_conteudo(dados))
+    db.conn.commit()
+    antes = ler_docente(db, 'docente-a')
+    assert antes[1:3] == ('2020-01-01 00:00:00', 0)
+    
+    mesmo_conteudo = {'dadosGerais': {'orcidId': '1', 'nomeCompleto': 'Docente A'}, 'baseUrl': 'https://outro'}
+    assert hash_conteudo(mesmo_conteudo) == hash_conteudo(dados)
+    assert db.upsert_docentes([('TESTE', pessoa, mesmo_conteudo)]) == {'docente-a': docente_id}
+    assert ler_docente(db, 'docente-a') == antes
+    
+    alterado = {'baseUrl': 'https://integra.a', 'dadosGerais': {'nomeCompleto': 'Docente A', 'orcidId': '2'}}
+    assert db.upsert_docentes([('TESTE', pessoa, alterado)]) == {'docente-a': docente_id}
+    depois = ler_docente(db, 'docente-a')
+    assert depois[0] == docente_id
+    assert depois[1] != '2020-01-01 00:00:00'
+    assert depois[2] == 1
+    assert depois[3] == hash_conteudo(alterado) != antes[3]
+
+
+def test_migracoes_de_banco_original(banco_original):
+    """create_tables leva o esquema original até VERSAO_ESQUEMA; rodar de novo não muda nada"""
+    db = Database(banco_original)
+    db.connect()
+    assert db.versao_esquema() == 0
+    
+    db.create_tables()
+    
+    assert VERSAO_ESQUEMA == 3
+    assert db.versao_esquema() == VERSAO_ESQUEMA
+    for _, _, passos in MIGRACOES:
+        for passo in passos:
+            if isinstance(passo, tuple):
+                tabela, coluna, _ = passo
+                assert coluna in colunas(db, tabela), f"{tabela}.{coluna}"
+    assert 'projetos' in {row[1] for row in esquema(db)}
+    
+    # Docente antigo preservado e pendente de normalização (migração 3)
+    db.cursor.execute("SELECT slug, normalizacao_pendente FROM docentes")
+    assert [tuple(row) for row in db.cursor.fetchall()] == [('docente-antigo', 1)]
+    
+    db.cursor.execute("SELECT versao FROM schema_version ORDER BY versao")
+    registradas = [row[0] for row in db.cursor.fetchall()]
+    assert registradas == [versao for versao, _, _ in MIGRACOES]
+    
+    antes = esquema(db)
+    db.create_tables()
+    assert db.aplicar_migracoes() == []
+    assert esquema(db) == antes
+    db.cursor.execute("SELECT versao FROM schema_version ORDER BY versao")
+    assert [row[0] for row in db.cursor.fetchall()] == registradas
+    db.close()
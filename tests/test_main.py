@@ -0,0 +1,119 @@
+"""
+Testes do gravador da coleta (main.gravar_fila_no_banco) e da retomada por checkpoints
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+
+import main
+from database import Database
+from scraper import IntegraScraper
+
+
+@pytest.fixture
+def db(tmp_path):
+    banco = Database(str(tmp_path / 'teste.db'))
+    banco.connect()
+    banco.create_tables()
+    yield banco
+    banco.close()
+
+
+def evento_docente(i: int) -> tuple:
+    """Evento de docente como o scraper coloca na fila"""
+    pessoa = {'slug': f'docente-{i}', 'nome': f'Docente {i}', 'cargo': 'Professor'}
+    return ('docente', 'TESTE', pessoa, {'dadosGerais': {'nomeCompleto': f'Docente {i}'}})
+
+
+def test_gravador_continua_quando_um_lote_falha(db, monkeypatch):
+    """Um lote que falha vira erro no resumo; o scraper não fica bloqueado na fila"""
+    gravar_lote_original = main.gravar_lote
+    chamadas = []
+    
+    def gravar_lote_falhando(db, lote, resumo):
+        chamadas.append(len(lote))
+        if len(chamadas) == 1:
+            raise sqlite3.OperationalError('database is locked')
+        gravar_lote_original(db, lote, resumo)
+    
+    monkeypatch.setattr(main, 'gravar_lote', gravar_lote_falhando)
+    
+    async def coletar():
+        fila = asyncio.Queue(maxsize=2)
+        gravador = asyncio.create_task(main.gravar_fila_no_banco(db, fila, tamanho_lote=2))
+        
+        # Com o gravador morto, o put ficaria bloqueado para sempre na fila cheia
+        for i in range(10):
+            await asyncio.wait_for(fila.put(evento_docente(i)), timeout=5)
+        await fila.put(None)
+        
+        return await asyncio.wait_for(gravador, timeout=5)
+    
+    resumo = asyncio.run(coletar())
+    
+    assert resumo == {'TESTE': {'salvos': 8, 'erros': 2}}
+    assert db.count_all_docentes() == 8
+    assert len(chamadas) == 5
+
+
+def test_retomada_reaproveita_checkpoints(db, monkeypatch):
+    """Páginas e slugs gravados pelo gravador são reaproveitados; 'concluida' os apaga"""
+    pessoas = [{'slug': f'docente-{i}', 'nome': f'Docente {i}', 'cargo': 'Professor'} for i in range(3)]
+    
+    # Coleta interrompida: as duas páginas da listagem obtidas, só os dois primeiros docentes gravados
+    resumo = {}
+    main.gravar_lote(db, [
+        ('paginacao', 'TESTE', 2, 3),
+        ('pagina', 'TESTE', 0, pessoas[:2]),
+        ('pagina', 'TESTE', 2, pessoas[2:]),
+        evento_docente(0),
+        evento_docente(1),
+    ], resumo)
+    
+    checkpoint = db.get_checkpoint('TESTE')
+    assert checkpoint['page_size'] == 2
+    assert checkpoint['total'] == 3
+    assert not checkpoint['concluida']
+    assert checkpoint['paginas'] == {0: pessoas[:2], 2: pessoas[2:]}
+    assert checkpoint['slugs'] == {'docente-0', 'docente-1'}
+    
+    paginas_pedidas = []
+    detalhes_pedidos = []
+    
+    async def fetch_pessoas_page(self, start, length=None):
+        paginas_pedidas.append(start)
+        return None
+    
+    async def fetch_pessoa_detalhes(self, slug, carimbo=None):
+        detalhes_pedidos.append(slug)
+        return {'dadosGerais': {'nomeCompleto': slug}}
+    
+    monkeypatch.setattr(IntegraScraper, 'fetch_pessoas_page', fetch_pessoas_page)
+    monkeypatch.setattr(IntegraScraper, 'fetch_pessoa_detalhes', fetch_pessoa_detalhes)
+    
+    async def retomar():
+        fila = asyncio.Queue()
+        gravador = asyncio.create_task(main.gravar_fila_no_banco(db, fila, tamanho_lote=10))
+        
+        # Sessão compartilhada fictícia: nada vai à rede
+        scraper = IntegraScraper('TESTE', 'http://teste', session=object(), checkpoint=checkpoint)
+        await scraper.scrape(fila)
+        await fila.put(None)
+        
+        return scraper, await gravador
+    
+    scraper, resumo = asyncio.run(retomar())
+    
+    assert paginas_pedidas == []
+    assert scraper.stats['paginas_retomadas'] == 2
+    assert scraper.stats['retomados'] == 2
+    assert detalhes_pedidos == ['docente-2']
+    assert resumo == {'TESTE': {'salvos': 1, 'erros': 0}}
+    assert db.count_all_docentes() == 3
+    
+    checkpoint = db.get_checkpoint('TESTE')
+    assert checkpoint['concluida']
+    assert checkpoint['paginas'] == {}
+    assert checkpoint['slugs'] == set()
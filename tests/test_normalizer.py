@@ -0,0 +1,106 @@
+"""
+Testes da normalização (normalizer_definitivo.py) com um banco temporário
+"""
+
+import json
+
+import pytest
+
+from database import Database
+from normalizer_definitivo import NormalizerDefinitivo
+
+
+def curriculo_com_projeto(projeto: dict) -> dict:
+    """data_completa mínimo com um único projeto de pesquisa"""
+    return {
+        'dadosGerais': {
+            'nomeCompleto': 'Docente Teste',
+            'atuacoesProfissionais': {
+                'atuacaoProfissional': [{
+                    'nomeInstituicao': 'Instituto Federal Teste',
+                    'atividadesDeParticipacaoEmProjeto': [{
+                        'participacaoEmProjeto': [{
+                            'nomeOrgao': {'nome': 'Campus Teste'},
+                            'codigoOrgao': ['01', '02'],
+                            'projetoDePesquisa': [projeto],
+                        }],
+                    }],
+                }],
+            },
+        },
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    banco = Database(str(tmp_path / 'teste.db'))
+    banco.connect()
+    banco.create_tables()
+    yield banco
+    banco.close()
+
+
+def inserir_docente(db: Database, slug: str, data_completa: dict) -> int:
+    """Insere um docente com o JSON dado e devolve o id"""
+    db.cursor.execute(
+        "INSERT INTO docentes (sigla, slug, nome, data_completa) VALUES ('TESTE', ?, 'Docente', ?)",
+        (slug, json.dumps(data_completa, ensure_ascii=False)),
+    )
+    db.conn.commit()
+    return db.cursor.lastrowid
+
+
+def test_projeto_com_campos_nao_escalares(db):
+    """dict/list nos campos do projeto viram texto, sem derrubar a normalização"""
+    docente_id = inserir_docente(db, 'docente-teste', curriculo_com_projeto({
+        'nomeDoProjeto': {'texto': 'Projeto com nome em dict'},
+        'natureza': ['PESQUISA'],
+        'situacao': 'EM_ANDAMENTO',
+        'anoInicio': 2020,
+        'descricaoDoProjeto': {'pt': 'Descrição'},
+    }))
+    
+    normalizer = NormalizerDefinitivo(db)
+    normalizer.normalize_all(processos=1)
+    
+    db.cursor.execute("""
+        SELECT nome, natureza, situacao, ano_inicio, descricao, instituicao, orgao
+        FROM projetos WHERE id_docente = ?
+    """, (docente_id,))
+    nome, natureza, situacao, ano_inicio, descricao, instituicao, orgao = db.cursor.fetchone()
+    
+    assert json.loads(nome) == {'texto': 'Projeto com nome em dict'}
+    assert json.loads(natureza) == ['PESQUISA']
+    assert situacao == 'EM_ANDAMENTO'
+    assert ano_inicio == 2020
+    assert json.loads(descricao) == {'pt': 'Descrição'}
+    assert json.loads(instituicao) == {'nome': 'Campus Teste'}
+    assert json.loads(orgao) == ['01', '02']
+    
+    assert normalizer.stats['processados'] == 1
+    assert db.count_docentes_pendentes_normalizacao() == 0
+
+
+def test_linha_recusada_pelo_sqlite_nao_derruba_o_lote(db):
+    """Uma linha com valor inválido é pulada; as demais do lote são gravadas"""
+    docente_id = inserir_docente(db, 'docente-premios', {'dadosGerais': {'nomeCompleto': 'Docente'}})
+    
+    normalizer = NormalizerDefinitivo(db)
+    normalizer.gravar_lote([(docente_id, None, {
+        'premios_titulos': [
+            (docente_id, 'Prêmio A', 2020, 'Entidade A'),
+            (docente_id, {'nome': 'inválido'}, 2021, 'Entidade B'),
+            (docente_id, 'Prêmio C', 2022, 'Entidade C'),
+        ],
+        'areas_atuacao': [(docente_id, 'Ciências Exatas', 'Física', '', '')],
+    })])
+    
+    db.cursor.execute("SELECT nome FROM premios_titulos WHERE id_docente = ? ORDER BY ano", (docente_id,))
+    assert [linha[0] for linha in db.cursor.fetchall()] == ['Prêmio A', 'Prêmio C']
+    
+    db.cursor.execute("SELECT COUNT(*) FROM areas_atuacao WHERE id_docente = ?", (docente_id,))
+    assert db.cursor.fetchone()[0] == 1
+    
+    assert normalizer.stats['linhas_com_erro'] == 1
+    assert normalizer.stats['processados'] == 1
+    assert not db.conn.in_transaction
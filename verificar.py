@@ -6,6 +6,7 @@ Verifica palavras-chave e orientações
 import json
 import sqlite3
 from config import DB_NAME
+from database import decodificar_data_completa
 
 print("\n" + "="*80)
 print("🔍 VERIFICANDO PALAVRAS-CHAVE E ORIENTAÇÕES")
@@ -33,7 +34,7 @@ else:
     docs = cursor.fetchall()
     
     for doc_id, nome, data_json in docs:
-        data = json.loads(data_json)
+        data = decodificar_data_completa(data_json)
         
         print(f"📄 {nome}:")
         
@@ -83,7 +84,7 @@ if count_orient == 0:
     
     for doc_id, nome, data_json in docs:
         try:
-            data = json.loads(data_json)
+            data = decodificar_data_completa(data_json)
             
             outra = data.get('outraProducao', {})
             if not isinstance(outra, dict):
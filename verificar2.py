@@ -3,9 +3,9 @@
 Verifica EXATAMENTE quais instituições aparecem nas orientações
 """
 
-import json
 import sqlite3
 from config import DB_NAME
+from database import decodificar_data_completa
 
 print("\n" + "="*80)
 print("🔍 VERIFICANDO INSTITUIÇÕES DAS ORIENTAÇÕES")
@@ -24,7 +24,7 @@ total_sem_instituicao = 0
 
 for doc_id, nome, data_json in docs:
     try:
-        data = json.loads(data_json)
+        data = decodificar_data_completa(data_json)
         
         outra = data.get('outraProducao', {})
         if not isinstance(outra, dict):
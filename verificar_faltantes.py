@@ -13,7 +13,7 @@ def main():
     print("🔍 VERIFICANDO INSTITUIÇÕES FALTANTES NO BANCO")
     print("="*70 + "\n")
     
-    db = Database()
+    db = Database(somente_leitura=True)
     db.connect()
     
     # Busca instituições no banco
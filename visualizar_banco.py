@@ -13,7 +13,7 @@ def main():
     print("📊 ESTATÍSTICAS DO BANCO DE DADOS - PORTAL INTEGRA")
     print("="*80 + "\n")
     
-    db = Database()
+    db = Database(somente_leitura=True)
     db.connect()
     
     # Estatísticas gerais
@@ -92,6 +92,10 @@ def main():
     print("-" * 80)
     print(f"{'TOTAL':<30} {total_registros_normalizados:<15,} {'':<15}\n")
     
+    if stats['tabelas_ausentes']:
+        print(f"⚠️  Tabelas ainda não criadas neste banco: {', '.join(stats['tabelas_ausentes'])}")
+        print("💡 Execute: python atualizar_banco.py (aplica as migrações)\n")
+    
     # Análise de cobertura dos dados normalizados
     print("="*80)
     print("📈 COBERTURA DOS DADOS NORMALIZADOS")